@@ -0,0 +1,101 @@
+"""Agenda: filtros por máscara + sort_values en cada render vs. rangos del índice por fecha.
+
+Recorre cada año (entregados / programados), cada mes y un día por mes, y
+verifica que ambas variantes devuelven las mismas filas en el mismo orden.
+Uso: python benchmarks/bench_agenda.py [--filas 100000]
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.agenda import IndiceAgenda  # noqa: E402
+from tablero.ingesta import procesar_hoja  # noqa: E402
+from tablero.vista import Vista  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+ORDEN = ["FECHA_ENTREGA_DT", "HS DE ENTREGA AL CLIENTE"]
+COLS = ORDEN + ["CLIENTE", "VIN"]
+HOY = datetime.date(2024, 6, 12)
+
+
+def tabla(vista, ordenar=False):
+    sub = vista.materializar(COLS)
+    return sub.sort_values(ORDEN) if ordenar else sub
+
+
+def cantidad(vista, ordenar=False):
+    return len(vista)
+
+
+def con_mascaras(df, tomar=tabla):
+    # Lo que hacía la página en cada render
+    salida = []
+    for año in sorted(df["AÑO_ENTREGA"].dropna().unique().astype(int)):
+        df_año = Vista(df).filtrar_global(df["AÑO_ENTREGA"] == año)
+        fechas_año = df_año.columna("FECHA_ENTREGA_DT").dt.date
+        for parte in (df_año.filtrar(fechas_año < HOY), df_año.filtrar(fechas_año >= HOY)):
+            salida.append(tomar(parte, True))
+        mapa = dict(zip(df_año.columna("MES_ENTREGA").unique(), df_año.columna("N_MES_ENTREGA").unique()))
+        for mes in sorted(mapa, key=lambda m: mapa[m]):
+            df_mes = df_año.filtrar(df_año.columna("MES_ENTREGA") == mes)
+            fechas_mes = df_mes.columna("FECHA_ENTREGA_DT")
+            salida.append(tomar(df_mes, True))
+            dia = fechas_mes.min().date()
+            salida.append(tomar(df_mes.filtrar(fechas_mes.dt.date == dia), True))
+    return salida
+
+
+def con_indice(agenda, tomar=tabla):
+    salida = []
+    hoy = np.datetime64(HOY)
+    for año in agenda.años():
+        salida.append(tomar(agenda.año(año, hasta=hoy)))
+        salida.append(tomar(agenda.año(año, desde=hoy)))
+        for _, mes in agenda.meses(año):
+            df_mes = agenda.mes(año, mes)
+            salida.append(tomar(df_mes))
+            salida.append(tomar(agenda.dia(agenda.extremos(df_mes)[0])))
+    return salida
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=100_000)
+    args = parser.parse_args()
+    df = procesar_hoja(generar_hoja(args.filas))
+
+    t0 = time.perf_counter()
+    antes = con_mascaras(df)
+    t_antes = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    agenda = IndiceAgenda(df)
+    t_indice = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    despues = con_indice(agenda)
+    t_despues = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    con_mascaras(df, cantidad)
+    t_sel_antes = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    con_indice(agenda, cantidad)
+    t_sel_despues = time.perf_counter() - t0
+
+    assert len(antes) == len(despues)
+    for a, b in zip(antes, despues):
+        pd.testing.assert_frame_equal(a, b)
+    print(f"filas: {args.filas}  selecciones: {len(antes)} (mismo resultado y orden)")
+    print(f"máscaras + sort_values   {t_antes * 1000:9.1f} ms  ({t_antes / len(antes) * 1000:.2f} ms por selección)")
+    print(f"índice (una vez)         {t_indice * 1000:9.1f} ms")
+    print(f"rangos del índice        {t_despues * 1000:9.1f} ms  ({t_despues / len(despues) * 1000:.2f} ms por selección)")
+    print(f"sólo selección (sin materializar la tabla): {t_sel_antes * 1000:.1f} ms -> {t_sel_despues * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Costo fijo de la app: primera pintada en un proceso nuevo y rerun de páginas livianas.
+
+La primera pintada se mide en un intérprete nuevo por corrida (imports incluidos)
+con la caché en disco ya caliente, así que lo que queda es el costo del script y
+no la descarga. El rerun se mide en un mismo proceso sobre páginas que casi no
+tocan datos, para ver lo que cuesta cada interacción antes de la página en sí.
+Con --app se puede apuntar a otra copia (p. ej. un `git worktree` de una versión anterior).
+Uso: python benchmarks/bench_arranque.py [--filas 20000] [--procesos 5] [--reruns 30] [--app ruta/app.py]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+# Corre en un proceso aparte: imports y módulos de la app arrancan en frío
+MEDICION = r"""
+import json, statistics, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t_streamlit = time.perf_counter() - t0
+app, paginas, reruns = sys.argv[1], sys.argv[2].split("|"), int(sys.argv[3])
+at = AppTest.from_file(app, default_timeout=600)
+t0 = time.perf_counter()
+at.run()
+primera = time.perf_counter() - t0
+modulos = len(sys.modules)
+rerun = {}
+for pagina in paginas:
+    at.sidebar.radio[0].set_value(pagina)
+    at.run()
+    tiempos = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        tiempos.append(time.perf_counter() - t0)
+    rerun[pagina] = statistics.median(tiempos)
+print(json.dumps({"streamlit": t_streamlit, "primera": primera, "modulos": modulos, "rerun": rerun,
+                  "plotly": "plotly.express" in sys.modules, "calendario": "streamlit_calendar" in sys.modules,
+                  "errores": [str(e.value) for e in at.exception]}))
+"""
+PAGINAS = ("🗺️ Plano del Salón", "📅 Planificación Entregas")
+
+
+def medir(app, entorno, reruns):
+    salida = subprocess.run([sys.executable, "-c", MEDICION, app, "|".join(PAGINAS), str(reruns)],
+                            env=entorno, cwd=os.path.dirname(app), capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=20_000)
+    parser.add_argument("--procesos", type=int, default=5)
+    parser.add_argument("--reruns", type=int, default=30)
+    parser.add_argument("--app", default=os.path.join(RAIZ, "app.py"))
+    args = parser.parse_args()
+    app = os.path.abspath(args.app)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "hoja.csv")
+        generar_hoja(args.filas).to_csv(ruta, index=False)
+        entorno = dict(os.environ, TABLERO_URL_CSV=ruta, TABLERO_DIR_CACHE=os.path.join(tmp, "cache"))
+        entorno.pop("TABLERO_FUENTES", None)
+        medir(app, entorno, 1)  # deja la caché en disco lista
+        corridas = [medir(app, entorno, args.reruns) for _ in range(args.procesos)]
+
+    errores = [e for c in corridas for e in c["errores"]]
+    print(f"app: {app}  filas: {args.filas}  procesos: {args.procesos}")
+    print(f"import streamlit                 {statistics.median(c['streamlit'] for c in corridas) * 1000:8.1f} ms")
+    print(f"primera pintada (proceso nuevo)  {statistics.median(c['primera'] for c in corridas) * 1000:8.1f} ms   "
+          f"módulos cargados: {corridas[0]['modulos']}  plotly.express: {corridas[0]['plotly']}  streamlit-calendar: {corridas[0]['calendario']}")
+    for pagina in PAGINAS:
+        print(f"rerun {pagina:<26} {statistics.median(c['rerun'][pagina] for c in corridas) * 1000:8.1f} ms")
+    if errores: print(f"⚠ {errores[0][:120]}")
+
+
+if __name__ == "__main__":
+    main()
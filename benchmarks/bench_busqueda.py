@@ -0,0 +1,51 @@
+"""Buscador de Documentación: índice de trigramas vs. el escaneo con apply original.
+
+Uso: python benchmarks/bench_busqueda.py [--filas 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.busqueda import IndiceBusqueda  # noqa: E402
+from tablero.ingesta import procesar_hoja  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+CONSULTAS = ["VF30000000001234", "ORTIZ", "GESTOR", "PLAYA", "C3", "cliente123@"]
+
+
+def escaneo_apply(df, search):
+    # Lo que hacía la página en cada rerun
+    return df.apply(lambda row: row.astype(str).str.contains(search.upper(), case=False).any(), axis=1).to_numpy()
+
+
+def medir(funcion, repeticiones):
+    t0 = time.perf_counter()
+    for _ in range(repeticiones): resultado = funcion()
+    return (time.perf_counter() - t0) / repeticiones, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=20_000)
+    args = parser.parse_args()
+
+    df = procesar_hoja(generar_hoja(args.filas))
+    t0 = time.perf_counter()
+    indice = IndiceBusqueda(df)
+    print(f"filas: {args.filas}  construcción del índice: {time.perf_counter() - t0:.3f} s")
+    print(f"{'consulta':<20} {'apply (ms)':>11} {'índice (ms)':>12} {'filas':>7}  iguales")
+    for consulta in CONSULTAS:
+        t_apply, viejo = medir(lambda: escaneo_apply(df, consulta), 1)
+        t_indice, nuevo = medir(lambda: indice.mascara(consulta), 200)
+        iguales = "sí" if np.array_equal(viejo, nuevo) else "NO"
+        print(f"{consulta:<20} {t_apply * 1000:>11.1f} {t_indice * 1000:>12.3f} {int(nuevo.sum()):>7}  {iguales}")
+    # Sólo el índice ignora acentos
+    print(f"'citroen' → {int(indice.mascara('citroen').sum())} filas, 'Citroën' → {int(indice.mascara('Citroën').sum())} filas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Arranque en frío: descarga + procesamiento completo vs. instantánea mapeada desde disco.
+
+Uso: python benchmarks/bench_cache_disco.py [--filas 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.cache_disco import CacheDisco, FuentePersistente  # noqa: E402
+from tablero.ingesta import IngestaIncremental  # noqa: E402
+from tablero.refresco import Refrescador  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+from servidor_csv import ServidorCSV  # noqa: E402
+
+
+def primera_instantanea(url, ruta):
+    t0 = time.perf_counter()
+    refrescador = Refrescador(FuentePersistente(IngestaIncremental(url), CacheDisco(ruta, url)), intervalo=3600).iniciar()
+    snap = refrescador.instantanea(espera=600)
+    return time.perf_counter() - t0, snap.df, refrescador
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with ServidorCSV(generar_hoja(args.filas).to_csv(index=False).encode()) as srv, tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "instantanea.feather")
+        t_sin, df_sin, _ = primera_instantanea(srv.url, ruta)
+        # Se espera a que el hilo termine de persistir la instantánea
+        while not os.path.exists(ruta): time.sleep(0.05)
+        t_con, df_con, refrescador = primera_instantanea(srv.url, ruta)
+        time.sleep(0.5)
+        reconciliacion = refrescador.fuente.ingesta.ultimo_resultado
+        tamano = os.path.getsize(ruta) / 2**20
+
+    pd.testing.assert_frame_equal(df_sin, df_con, check_dtype=False)
+    print(f"filas: {args.filas}  archivo: {tamano:.1f} MiB")
+    print(f"arranque sin caché       {t_sin:8.3f} s")
+    print(f"arranque desde disco     {t_con:8.3f} s  (reconciliación en segundo plano: {reconciliacion})")
+
+
+if __name__ == "__main__":
+    main()
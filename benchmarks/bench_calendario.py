@@ -0,0 +1,46 @@
+"""Eventos del calendario: toda la historia en cada render vs. sólo la ventana visible.
+
+Uso: python benchmarks/bench_calendario.py [--filas 300000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.agenda import IndiceAgenda, ventana_calendario  # noqa: E402
+from tablero.ingesta import procesar_hoja  # noqa: E402
+from tablero.memo import MemoCompartido  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+
+def medir(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - t0, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=300_000)
+    args = parser.parse_args()
+    agenda = IndiceAgenda(procesar_hoja(generar_hoja(args.filas)))
+    print(f"filas: {args.filas}  con fecha de entrega: {len(agenda.fechas)}")
+
+    t, todos = medir(lambda: agenda.eventos(None, None, max_eventos=len(agenda.fechas)))
+    print(f"toda la historia             {t * 1000:8.1f} ms  {len(todos):7d} eventos  {len(json.dumps(todos)) / 2**20:6.1f} MiB de JSON")
+
+    memo = MemoCompartido()
+    for vista in ("Mes", "Semana"):
+        desde, hasta = ventana_calendario(np.datetime64("2024-03-15"), vista)
+        calcular = lambda: agenda.eventos(desde, hasta)  # noqa: E731
+        t, eventos = medir(lambda: memo.obtener(1, "calendario", (str(desde), str(hasta)), calcular))
+        t_cache, _ = medir(lambda: memo.obtener(1, "calendario", (str(desde), str(hasta)), calcular))
+        print(f"ventana {vista:<6} {str(desde)}…  {t * 1000:8.1f} ms  {len(eventos):7d} eventos  {len(json.dumps(eventos)) / 2**10:6.1f} KiB   (en caché: {t_cache * 1e6:.0f} µs)")
+
+
+if __name__ == "__main__":
+    main()
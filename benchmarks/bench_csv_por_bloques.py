@@ -0,0 +1,102 @@
+"""Parseo de la exportación completa: lectura única con tipos inferidos vs. por bloques con tipos declarados.
+
+"Antes" reproduce la carga previa: read_csv de todo el archivo y cuatro
+pd.to_datetime(dayfirst=True) sin formato. Cada variante corre en un proceso
+aparte y se mide el tiempo, el pico de memoria residente por encima del CSV ya
+leído y la memoria del frame final. El pico se mide con el pool de Arrow por
+defecto (mimalloc retiene lo que se libera) y con el del sistema, que refleja
+mejor lo que el código tiene vivo a la vez.
+Uso: python benchmarks/bench_csv_por_bloques.py [--filas 500000]
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.esquema import resolver_esquema  # noqa: E402
+from tablero.ingesta import leer_csv, normalizar_encabezados  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+
+def como_antes(contenido):
+    df = normalizar_encabezados(pd.read_csv(io.BytesIO(contenido)))
+    esq = resolver_esquema(tuple(df.columns))
+    df["FECHA_ENTREGA_DT"] = pd.to_datetime(df[esq.entrega], dayfirst=True, errors='coerce')
+    df["AÑO_ENTREGA"] = df["FECHA_ENTREGA_DT"].dt.year
+    df["MES_ENTREGA"] = df["FECHA_ENTREGA_DT"].dt.month_name()
+    df["N_MES_ENTREGA"] = df["FECHA_ENTREGA_DT"].dt.month
+    df["FECHA_ARRIBO_DT"] = pd.to_datetime(df[esq.arribo], dayfirst=True, errors='coerce')
+    df["AÑO_ARRIBO"] = df["FECHA_ARRIBO_DT"].dt.year
+    df["FECHA_FACTURACION_DT"] = pd.to_datetime(df[esq.facturacion], dayfirst=True, errors='coerce')
+    df["FECHA_PAPELES_DT"] = pd.to_datetime(df[esq.papeles], dayfirst=True, errors='coerce')
+    df["TELEFONO_CLEAN"] = df[esq.telefono]
+    df["CORREO_CLEAN"] = df[esq.correo]
+    return df
+
+
+VARIANTES = {"antes": como_antes, "por bloques": leer_csv}
+
+
+def pico_kib():
+    # VmHWM se reinicia con exec; ru_maxrss puede heredar el pico del proceso padre
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(l.split()[1]) for l in f if l.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def medir(variante, ruta):
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    base = pico_kib()
+    t0 = time.perf_counter()
+    df = VARIANTES[variante](contenido)
+    segundos = time.perf_counter() - t0
+    pico = pico_kib() - base
+    df.to_pickle(ruta + f".{variante.replace(' ', '_')}.pkl")
+    return {"segundos": segundos, "pico_mib": pico / 1024, "frame_mib": df.memory_usage(deep=True).sum() / 2**20}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=500_000)
+    parser.add_argument("--variante")
+    parser.add_argument("--ruta")
+    args = parser.parse_args()
+    if args.variante:
+        print(json.dumps(medir(args.variante, args.ruta)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "hoja.csv")
+        generar_hoja(args.filas).to_csv(ruta, index=False)
+        print(f"filas: {args.filas}  CSV: {os.path.getsize(ruta) / 2**20:.1f} MiB")
+        for variante in VARIANTES:
+            r = {}
+            for pool in ("mimalloc", "system"):
+                entorno = dict(os.environ, ARROW_DEFAULT_MEMORY_POOL=pool)
+                salida = subprocess.run([sys.executable, __file__, "--variante", variante, "--ruta", ruta],
+                                        check=True, capture_output=True, text=True, env=entorno).stdout
+                r[pool] = json.loads(salida)
+            print(f"{variante:<12} {r['mimalloc']['segundos']:7.2f} s   pico +{r['mimalloc']['pico_mib']:7.1f} MiB"
+                  f" (pool del sistema +{r['system']['pico_mib']:6.1f})   frame {r['mimalloc']['frame_mib']:7.1f} MiB")
+        antes = pd.read_pickle(ruta + ".antes.pkl")
+        despues = pd.read_pickle(ruta + ".por_bloques.pkl")
+    categoricas = [c for c in despues.columns if isinstance(despues[c].dtype, pd.CategoricalDtype)]
+    # Por bloques las columnas no categóricas se declaran texto; la lectura única infiere números
+    texto = [c for c in despues.columns if c not in categoricas and despues[c].dtype != antes[c].dtype]
+    pd.testing.assert_frame_equal(antes, despues.astype({c: antes[c].dtype for c in categoricas + texto}))
+    print(f"mismo contenido; columnas categóricas: {', '.join(categoricas)}; leídas como texto: {', '.join(texto) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Indicadores por mes: groupby sobre el frame por fila en cada rerun vs. leer los cubos.
+
+También mide la actualización de los cubos en tres rondas (filas nuevas al final,
+filas editadas y filas borradas: sólo se codifican las que cambiaron y se suman
+o restan de las celdas que ya había) contra reconstruirlos desde cero, y tras
+cada ronda verifica que los tres cubos sean iguales a los reconstruidos.
+Uso: python benchmarks/bench_cubos.py [--filas 300000] [--nuevas 2000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.cubos import CUBOS, Cubos  # noqa: E402
+from tablero.ingesta import IngestaIncremental  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+DIMENSIONES = ("MARCA", "VENDEDOR", "CANAL DE VENTA", "ESTADO")
+
+
+def directo(df, dim):
+    # Lo que haría cada rerun sin cubos: agrupar el frame por fila
+    fechas = df["FECHA_ENTREGA_DT"]
+    return df.groupby([fechas.dt.year, fechas.dt.month, df[dim]], observed=True).size()
+
+
+def desde_cubos(cubos, dim):
+    cubo = cubos.entregas_vendedor if dim == "VENDEDOR" else cubos.entregas
+    return cubo.groupby(["AÑO", "MES", dim], observed=True)["ENTREGAS"].sum()
+
+
+def ordenar(cubo, medidas):
+    # Los diccionarios de códigos crecen en otro orden al actualizar: se compara por valor
+    cubo = cubo.astype({c: str for c in cubo.columns if isinstance(cubo[c].dtype, pd.CategoricalDtype)})
+    return cubo.sort_values([c for c in cubo.columns if c not in medidas]).reset_index(drop=True)
+
+
+def verificar(cubos, df, huellas):
+    nuevos = Cubos()
+    nuevos.actualizar(cubos.version, df, huellas)
+    for atributo, (_, _, nombre, sumar) in CUBOS.items():
+        pd.testing.assert_frame_equal(ordenar(getattr(cubos, atributo), (nombre, sumar)),
+                                      ordenar(getattr(nuevos, atributo), (nombre, sumar)), check_dtype=False)
+
+
+def medir(funcion, repeticiones=5):
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - t0) / repeticiones
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=300_000)
+    parser.add_argument("--nuevas", type=int, default=2_000)
+    args = parser.parse_args()
+
+    hoja = generar_hoja(args.filas)
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "hoja.csv")
+        hoja.to_csv(ruta, index=False)
+        ingesta = IngestaIncremental(ruta)
+        df = ingesta.actualizar()
+        cubos = Cubos()
+        t_inicial = medir(lambda: Cubos().actualizar(1, df, ingesta.huellas()), 1)
+        cubos.actualizar(1, df, ingesta.huellas())
+
+        print(f"filas: {args.filas}")
+        for dim in DIMENSIONES:
+            print(f"  entregas por mes y {dim:<15} groupby {medir(lambda: directo(df, dim)) * 1000:7.1f} ms   cubos {medir(lambda: desde_cubos(cubos, dim)) * 1000:6.1f} ms")
+
+        verificar(cubos, df, ingesta.huellas())
+
+        agregadas = pd.concat([hoja, generar_hoja(args.nuevas, semilla=1)], ignore_index=True)
+        editadas = agregadas.copy()
+        cambiar = editadas.sample(args.nuevas, random_state=2).index
+        editadas.loc[cambiar, "ESTADO"] = "ENTREGADO"
+        editadas.loc[cambiar, "MARCA"] = editadas.loc[cambiar[::-1], "MARCA"].to_numpy()
+        borradas = editadas.drop(editadas.sample(args.nuevas, random_state=3).index)
+        rondas = []
+        for version, (ronda, hoja_ronda) in enumerate([(f"+{args.nuevas} filas", agregadas),
+                                                        (f"{args.nuevas} editadas", editadas),
+                                                        (f"-{args.nuevas} filas", borradas)], start=2):
+            hoja_ronda.to_csv(ruta, index=False)
+            df = ingesta.actualizar()
+            t0 = time.perf_counter()
+            cubos.actualizar(version, df, ingesta.huellas())
+            t_incremental = time.perf_counter() - t0
+            reprocesadas = cubos.reprocesadas
+            t_completo = medir(lambda: Cubos().actualizar(version, df, ingesta.huellas()), 1)
+            verificar(cubos, df, ingesta.huellas())
+            rondas.append((ronda, t_incremental, reprocesadas, t_completo))
+
+    print(f"armar cubos desde cero           {t_inicial * 1000:7.1f} ms")
+    for ronda, t_incremental, reprocesadas, t_completo in rondas:
+        print(f"{ronda + ', incremental':<32} {t_incremental * 1000:7.1f} ms  ({reprocesadas} filas codificadas)")
+        print(f"{ronda + ', desde cero':<32} {t_completo * 1000:7.1f} ms")
+    print("cubos incrementales iguales a los reconstruidos en cada ronda")
+
+
+if __name__ == "__main__":
+    main()
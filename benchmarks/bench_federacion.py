@@ -0,0 +1,64 @@
+"""Varias sucursales: descarga en paralelo vs. una detrás de otra, con una planilla caída y otra colgada.
+
+Uso: python benchmarks/bench_federacion.py [--filas 5000] [--demoras 0.3,0.6,1.0,1.5]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.federacion import COL_SUCURSAL, Federacion  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+from servidor_csv import ServidorCSV  # noqa: E402
+
+
+def ciclo(fuentes, dir_cache, **kwargs):
+    federacion = Federacion.desde_urls(fuentes, dir_cache, timeout=5, **kwargs)
+    t0 = time.perf_counter()
+    df = federacion.actualizar()
+    return time.perf_counter() - t0, df, federacion
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=5000)
+    parser.add_argument("--demoras", default="0.3,0.6,1.0,1.5")
+    args = parser.parse_args()
+    demoras = [float(d) for d in args.demoras.split(",")]
+
+    with contextlib.ExitStack() as pila, tempfile.TemporaryDirectory() as tmp:
+        servidores = [
+            pila.enter_context(ServidorCSV(generar_hoja(args.filas, semilla=i).to_csv(index=False).encode(), demora=d))
+            for i, d in enumerate(demoras)
+        ]
+        fuentes = [(f"Sucursal {i + 1}", s.url) for i, s in enumerate(servidores)]
+        caida = ("Caída", "http://127.0.0.1:9/hoja.csv")
+
+        t_seq, _, _ = ciclo(fuentes, os.path.join(tmp, "seq"), max_conexiones=1)
+        t_par, df, federacion = ciclo(fuentes + [caida], os.path.join(tmp, "par"), max_conexiones=8)
+
+        # Una sucursal que deja de responder no frena el ciclo ni borra sus datos
+        colgada = servidores[0]
+        espera = max(demoras[1:]) + 1.0
+        fed = Federacion.desde_urls(fuentes, os.path.join(tmp, "colgada"), timeout=30, max_conexiones=8, espera=espera)
+        fed.actualizar()
+        colgada.demora = espera + 2
+        colgada.publicar(generar_hoja(args.filas, semilla=99).to_csv(index=False).encode())
+        t0 = time.perf_counter()
+        df_colgada = fed.actualizar()
+        t_colgada = time.perf_counter() - t0
+
+    print(f"sucursales: {len(demoras)} × {args.filas} filas  demoras: {demoras}")
+    print(f"secuencial (1 conexión)          {t_seq:7.2f} s  (suma de demoras {sum(demoras):.2f} s)")
+    print(f"paralelo + 1 sucursal caída      {t_par:7.2f} s  (demora máxima {max(demoras):.2f} s)  filas: {len(df)}")
+    print(f"  por sucursal: {df[COL_SUCURSAL].value_counts(sort=False).to_dict()}")
+    print(f"  error caída: {federacion.errores.get('Caída', '')[:70]}")
+    print(f"ciclo con una sucursal colgada   {t_colgada:7.2f} s  (espera {espera:.1f} s)  filas: {len(df_colgada)}")
+    print(f"  errores: {fed.errores}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Historial de estados: registro de cambios vs. guardar una instantánea por día.
+
+Simula `--dias` refrescos diarios de una flota donde cada día cambia una
+fracción de los estados, entran unidades nuevas y salen algunas. Compara lo que
+ocupa en disco y lo que tardan "estado del VIN X en la fecha D" y "unidades en
+el estado S durante la semana W" contra leer las instantáneas guardadas.
+Uso: python benchmarks/bench_historial.py [--filas 100000] [--dias 180] [--cambios 0.01]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.historial import HistorialEstados  # noqa: E402
+from datos_sinteticos import ESTADOS, ESTADOS_ADMIN, generar_hoja  # noqa: E402
+
+COLUMNAS = ["VIN", "ESTADO", "ESTADO DE ADMINISTRATIVO"]
+INICIO = pd.Timestamp("2025-01-01 08:00")
+
+
+def dias_simulados(filas, dias, cambios, semilla=0):
+    """Genera (momento, frame) por día: cambian estados, entran y salen unidades."""
+    rng = np.random.default_rng(semilla)
+    df = generar_hoja(filas, semilla=semilla)[COLUMNAS]
+    siguiente = filas
+    for d in range(dias):
+        yield INICIO + pd.Timedelta(days=d), df
+        df = df.copy()
+        n = len(df)
+        df.loc[rng.random(n) < cambios, "ESTADO"] = rng.choice(ESTADOS)
+        df.loc[rng.random(n) < cambios / 2, "ESTADO DE ADMINISTRATIVO"] = rng.choice(ESTADOS_ADMIN)
+        bajas = rng.random(n) < 0.001
+        nuevas = int(bajas.sum())
+        altas = pd.DataFrame({"VIN": [f"VF9{i:014d}" for i in range(siguiente, siguiente + nuevas)],
+                              "ESTADO": "SIN PRE ENTREGA", "ESTADO DE ADMINISTRATIVO": ""})
+        siguiente += nuevas
+        df = pd.concat([df[~bajas], altas], ignore_index=True)
+
+
+def tamaño(directorio):
+    return sum(os.path.getsize(os.path.join(directorio, f)) for f in os.listdir(directorio))
+
+
+def medir(funcion, consultas):
+    t0 = time.perf_counter()
+    resultados = [funcion(c) for c in consultas]
+    return (time.perf_counter() - t0) / len(consultas), resultados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--dias", type=int, default=180)
+    parser.add_argument("--cambios", type=float, default=0.01)
+    parser.add_argument("--consultas", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dir_historial, dir_fotos = os.path.join(tmp, "historial"), os.path.join(tmp, "fotos")
+        os.makedirs(dir_fotos)
+        historial = HistorialEstados(dir_historial)
+        t_registro = []
+        for momento, df in dias_simulados(args.filas, args.dias, args.cambios):
+            t0 = time.perf_counter()
+            historial.registrar(df, momento)
+            t_registro.append(time.perf_counter() - t0)
+            df.to_parquet(os.path.join(dir_fotos, f"{momento:%Y%m%d}.parquet"), index=False)
+        vins = df["VIN"].tolist()
+
+        t0 = time.perf_counter()
+        reabierto = HistorialEstados(dir_historial)
+        t_apertura = time.perf_counter() - t0
+
+        rng = np.random.default_rng(1)
+        consultas = [(vins[i], INICIO + pd.Timedelta(days=int(d), hours=12))
+                     for i, d in zip(rng.integers(0, len(vins), args.consultas), rng.integers(0, args.dias, args.consultas))]
+        pocas = consultas[:max(1, args.consultas // 20)]
+
+        def desde_foto(consulta):
+            vin, fecha = consulta
+            foto = pd.read_parquet(os.path.join(dir_fotos, f"{fecha:%Y%m%d}.parquet"))
+            fila = foto.loc[foto["VIN"] == vin, "ESTADO"]
+            return fila.iloc[-1] if len(fila) else None
+
+        semanas = [INICIO.normalize() + pd.Timedelta(weeks=int(w)) for w in rng.integers(0, args.dias // 7, 20)]
+        estado = ESTADOS[0]
+
+        def semana_desde_fotos(lunes):
+            # Una unidad cuenta si en alguno de los días de la semana estaba en `estado`
+            vistos = set()
+            for d in range(7):
+                ruta = os.path.join(dir_fotos, f"{lunes + pd.Timedelta(days=d):%Y%m%d}.parquet")
+                if os.path.exists(ruta):
+                    foto = pd.read_parquet(ruta, columns=["VIN", "ESTADO"])
+                    vistos.update(foto.loc[foto["ESTADO"] == estado, "VIN"])
+            return len(vistos)
+
+        reabierto.contar_en(estado, semanas[0], semanas[0])  # arma el índice
+        t_log, r_log = medir(lambda c: reabierto.estado_en(c[0], c[1]), consultas)
+        t_fotos, r_fotos = medir(desde_foto, pocas)
+        # Las fotos son de las 8:00: la semana va de lunes 8:00 a lunes 8:00 para comparar lo mismo
+        ts_log, rs_log = medir(lambda w: reabierto.contar_en(estado, w + pd.Timedelta(hours=8), w + pd.Timedelta(days=7, hours=8)), semanas)
+        ts_fotos, rs_fotos = medir(semana_desde_fotos, semanas[:3])
+
+        print(f"filas: {args.filas}  días: {args.dias}  cambios registrados: {reabierto.cambios}")
+        print(f"en disco: registro {tamaño(dir_historial) / 2**20:7.1f} MiB   instantáneas diarias {tamaño(dir_fotos) / 2**20:7.1f} MiB")
+        print(f"registrar un día                 {np.median(t_registro[1:]) * 1000:9.1f} ms (mediana; el primero {t_registro[0] * 1000:.0f} ms)")
+        print(f"reabrir el historial             {t_apertura * 1000:9.1f} ms")
+        print(f"estado de X en D, registro       {t_log * 1e6:9.1f} µs")
+        print(f"estado de X en D, instantánea    {t_fotos * 1e6:9.1f} µs   (coinciden: {r_log[:len(pocas)] == r_fotos})")
+        print(f"unidades en S la semana W, reg.  {ts_log * 1e6:9.1f} µs")
+        print(f"unidades en S la semana W, fotos {ts_fotos * 1e6:9.1f} µs   (coinciden: {rs_log[:3] == rs_fotos})")
+
+
+if __name__ == "__main__":
+    main()
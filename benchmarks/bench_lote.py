@@ -0,0 +1,50 @@
+"""Corrida de `python -m tablero.lote` sobre un CSV local: en frío (sin caché) y con la caché en disco de la corrida anterior.
+
+Uso: python benchmarks/bench_lote.py [--filas 300000] [--formato csv]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.lote import cargar, escribir, listas  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+
+def corrida(ruta, dir_cache, salida, formato, hoy):
+    tiempos = {}
+    t0 = time.perf_counter()
+    df = cargar([("Autociel", ruta)], dir_cache)
+    tiempos["carga"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    mantenimiento, documentacion = listas(df, hoy)
+    tiempos["clasificación"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    escribir(mantenimiento, documentacion, salida, formato, hoy)
+    tiempos["escritura"] = time.perf_counter() - t0
+    return tiempos, len(mantenimiento), len(documentacion)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=300_000)
+    parser.add_argument("--formato", choices=("csv", "json", "ambos"), default="csv")
+    args = parser.parse_args()
+
+    hoy = pd.Timestamp("2025-03-05")
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "hoja.csv")
+        generar_hoja(args.filas).to_csv(ruta, index=False)
+        print(f"filas: {args.filas}  formato: {args.formato}")
+        for nombre in ("en frío", "con caché"):
+            tiempos, n_mant, n_doc = corrida(ruta, os.path.join(tmp, "cache"), os.path.join(tmp, "listas"), args.formato, hoy)
+            detalle = "  ".join(f"{k} {v:5.2f} s" for k, v in tiempos.items())
+            print(f"{nombre:<10} total {sum(tiempos.values()):5.2f} s   {detalle}   ({n_mant} tareas, {n_doc} con documentación pendiente)")
+
+
+if __name__ == "__main__":
+    main()
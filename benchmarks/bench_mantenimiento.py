@@ -0,0 +1,85 @@
+"""Compara el motor columnar de vencimientos con el bucle iterrows original.
+
+Uso: python benchmarks/bench_mantenimiento.py [--tamanos 10000 100000 1000000] [--max-legacy N]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.mantenimiento import calcular_vencimientos, columnas_control  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+
+def vencimientos_iterrows(df_mant, cols_control, hoy):
+    # Copia fiel del bucle que tenía la página antes del motor columnar
+    inicio_semana = hoy - timedelta(days=hoy.weekday())
+    fin_semana = inicio_semana + timedelta(days=6)
+    lista_hoy, lista_semana, lista_atrasados = [], [], []
+    for index, row in df_mant.iterrows():
+        if pd.isnull(row["FECHA_ARRIBO_DT"]): continue
+        fecha_arribo = row["FECHA_ARRIBO_DT"]
+        motivos_hoy, motivos_semana, motivos_atrasados = [], [], []
+        for intervalo, columna in cols_control.items():
+            if not columna: continue
+            fecha_vencimiento = fecha_arribo + timedelta(days=intervalo)
+            estado_celda = str(row[columna]).strip().upper()
+            if estado_celda in ["OK", "N/A", "SI"]: continue
+            if fecha_vencimiento == hoy: motivos_hoy.append(f"Control {intervalo} días")
+            if inicio_semana <= fecha_vencimiento <= fin_semana: motivos_semana.append(f"Control {intervalo} días ({fecha_vencimiento.strftime('%d/%m')})")
+            if hoy >= fecha_vencimiento: motivos_atrasados.append(f"Falta {intervalo} días (Venció: {fecha_vencimiento.strftime('%d/%m')})")
+        if motivos_hoy:
+            r = row.copy(); r["TAREA"] = ", ".join(motivos_hoy); lista_hoy.append(r)
+        if motivos_semana:
+            r = row.copy(); r["TAREA"] = ", ".join(motivos_semana); lista_semana.append(r)
+        if motivos_atrasados:
+            r = row.copy(); r["TAREA"] = motivos_atrasados[-1]; lista_atrasados.append(r)
+    return pd.DataFrame(lista_hoy), pd.DataFrame(lista_semana), pd.DataFrame(lista_atrasados)
+
+
+def preparar(n):
+    df = generar_hoja(n)
+    df.columns = df.columns.str.strip().str.upper()
+    df["FECHA_ARRIBO_DT"] = pd.to_datetime(df["FECHA DE ARRIBO"], format="%d/%m/%Y", errors="coerce")
+    return df[df["ESTADO"].astype(str).str.strip().str.upper() != "ENTREGADO"]
+
+
+def mismas_tareas(a, b):
+    if a.empty or b.empty: return a.empty and b.empty
+    return list(a.index) == list(b.index) and list(a["TAREA"]) == list(b["TAREA"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--max-legacy", type=int, default=None, help="no correr el bucle original por encima de N filas")
+    parser.add_argument("--hoy", default="2024-06-12")
+    args = parser.parse_args()
+    hoy = pd.Timestamp(args.hoy).normalize()
+
+    print(f"{'filas':>10} {'columnar (s)':>13} {'iterrows (s)':>13} {'aceleración':>12}  hoy/semana/atrasados  iguales")
+    for n in args.tamanos:
+        df = preparar(n)
+        cols_control = columnas_control(df.columns)
+
+        t0 = time.perf_counter()
+        nuevo = calcular_vencimientos(df, cols_control, hoy)
+        t_nuevo = time.perf_counter() - t0
+        conteos = "/".join(str(len(x)) for x in nuevo)
+
+        if args.max_legacy is not None and n > args.max_legacy:
+            print(f"{n:>10} {t_nuevo:>13.3f} {'-':>13} {'-':>12}  {conteos:<20}  -")
+            continue
+        t0 = time.perf_counter()
+        viejo = vencimientos_iterrows(df, cols_control, hoy)
+        t_viejo = time.perf_counter() - t0
+        iguales = all(mismas_tareas(a, b) for a, b in zip(nuevo, viejo))
+        print(f"{n:>10} {t_nuevo:>13.3f} {t_viejo:>13.3f} {t_viejo / t_nuevo:>11.0f}x  {conteos:<20}  {'sí' if iguales else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Veinte sesiones abren Stock y Mantenimiento con los mismos filtros: cada una calcula vs. caché compartida.
+
+Las sesiones corren en hilos a la vez, como en el servidor de Streamlit.
+Uso: python benchmarks/bench_memo.py [--filas 100000] [--sesiones 20]
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.esquema import esquema_de  # noqa: E402
+from tablero.ingesta import procesar_hoja  # noqa: E402
+from tablero.mantenimiento import calcular_vencimientos  # noqa: E402
+from tablero.memo import MemoCompartido  # noqa: E402
+from tablero.vista import Vista  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+COLS_MANT = ["VIN", "MARCA", "MODELO", "FECHA_ARRIBO_DT", "TAREA", "UBICACION"]
+HOY = pd.Timestamp("2024-06-12")
+
+
+def stock(df, marcas):
+    vista = Vista(df).filtrar(df["MARCA"].isin(marcas))
+    conteo = vista.columna("ESTADO").value_counts()
+    return vista, conteo[conteo > 0]
+
+
+def mantenimiento(df, esquema, marcas):
+    vista = Vista(df).filtrar(df["ESTADO"].astype(str).str.strip().str.upper() != "ENTREGADO")
+    vista = vista.filtrar(vista.columna("MARCA").isin(marcas))
+    cols = COLS_MANT + [c for c in esquema.controles.values() if c]
+    return calcular_vencimientos(vista.materializar(cols), esquema.controles, HOY)
+
+
+def sesion(df, esquema, memo, version):
+    marcas = ("PEUGEOT", "CITROËN")
+    if memo is None:
+        return stock(df, marcas), mantenimiento(df, esquema, marcas)
+    return (memo.obtener(version, "stock", (marcas,), lambda: stock(df, marcas)),
+            memo.obtener(version, "mantenimiento", (marcas, HOY), lambda: mantenimiento(df, esquema, marcas)))
+
+
+def correr(df, esquema, sesiones, memo=None, version=1):
+    t0 = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(sesiones) as pool:
+        list(pool.map(lambda _: sesion(df, esquema, memo, version), range(sesiones)))
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--sesiones", type=int, default=20)
+    args = parser.parse_args()
+    df = procesar_hoja(generar_hoja(args.filas))
+    esquema = esquema_de(df)
+
+    t_sin = correr(df, esquema, args.sesiones)
+    memo = MemoCompartido()
+    t_con = correr(df, esquema, args.sesiones, memo)
+    t_nueva = correr(df, esquema, args.sesiones, memo, version=2)
+    t_repetida = correr(df, esquema, args.sesiones, memo, version=2)
+    e = memo.estadisticas()
+
+    print(f"filas: {args.filas}  sesiones simultáneas: {args.sesiones}")
+    print(f"cada sesión calcula           {t_sin:7.2f} s")
+    print(f"caché compartida              {t_con:7.2f} s")
+    print(f"tras una instantánea nueva    {t_nueva:7.2f} s  (se invalida y se recalcula una vez)")
+    print(f"mismas consultas otra vez     {t_repetida:7.2f} s")
+    for pagina, c in e["paginas"].items():
+        print(f"  {pagina:<14} aciertos {c['aciertos']:3d}  esperas {c['esperas']:3d}  cálculos {c['fallos']:3d}")
+    print(f"  entradas {e['entradas']}  {e['bytes'] / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Tabla completa vs. página: tiempo de ordenar + serializar a Arrow y bytes enviados al navegador.
+
+Usa el mismo serializador que st.dataframe. Casos: historial "Ya Entregados" de
+Agenda (ordenado por fecha y hora) y Stock sin filtros.
+Uso: python benchmarks/bench_paginacion.py [--filas 20000,100000,500000] [--pagina 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.ingesta import procesar_hoja  # noqa: E402
+from tablero.vista import Vista  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+COLS_AGENDA = ["FECHA_ENTREGA_DT", "HS DE ENTREGA AL CLIENTE", "CLIENTE", "ESTADO DE ADMINISTRATIVO", "MARCA", "MODELO", "VIN", "CANAL DE VENTA", "TELEFONO_CLEAN", "CORREO_CLEAN", "VENDEDOR"]
+ORDEN_AGENDA = ["FECHA_ENTREGA_DT", "HS DE ENTREGA AL CLIENTE"]
+COLS_STOCK = ["VIN", "MARCA", "MODELO", "DESCRIPCION COLOR", "FECHA DE FABRICACION", "ANTIGÜEDAD DE STOCK", "UBICACION", "DETALLE DEL ESTADO Y FECHA DE DISPONIBILIDAD DE UNIDAD", "ESTADO"]
+
+
+def medir(f, repeticiones=3):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = f()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor, resultado
+
+
+def completa(vista, cols, orden):
+    tabla = vista.materializar(cols)
+    if orden: tabla = tabla.sort_values(orden)
+    return len(convert_pandas_df_to_arrow_bytes(tabla))
+
+
+def paginada(vista, cols, orden, tam):
+    if orden: vista = vista.ordenar(orden)
+    return len(convert_pandas_df_to_arrow_bytes(vista.pagina(1, tam).materializar(cols)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", default="20000,100000,500000")
+    parser.add_argument("--pagina", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'filas':>8} {'caso':<12} {'completa':>10} {'bytes':>10} {'página':>10} {'bytes':>10}")
+    for n in (int(x) for x in args.filas.split(",")):
+        df = procesar_hoja(generar_hoja(n))
+        hoy = np.datetime64("2024-06-12")
+        casos = {
+            "entregados": (Vista(df).filtrar_global((df["FECHA_ENTREGA_DT"] < hoy).to_numpy()), COLS_AGENDA, ORDEN_AGENDA),
+            "stock": (Vista(df), COLS_STOCK, None),
+        }
+        for nombre, (vista, cols, orden) in casos.items():
+            t_c, b_c = medir(lambda: completa(vista, cols, orden))
+            t_p, b_p = medir(lambda: paginada(vista, cols, orden, args.pagina))
+            print(f"{n:>8} {nombre:<12} {t_c * 1000:8.1f}ms {b_c / 2**20:8.2f}MB {t_p * 1000:8.1f}ms {b_p / 2**10:8.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
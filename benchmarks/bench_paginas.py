@@ -0,0 +1,180 @@
+"""Recorre las páginas de app.py sin navegador (AppTest) con una flota sintética servida por HTTP local.
+
+Para cada tamaño de planilla levanta un ServidorCSV, apunta la app a él y
+ejecuta un guion de interacciones por página. De cada paso informa el tiempo
+de pared del rerun, el pico de memoria de Python/numpy (tracemalloc) y la
+memoria que quedó tomada en el pool de Arrow (donde pandas guarda los textos).
+Uso: python benchmarks/bench_paginas.py [--filas 5000,50000] [--salida base.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pyarrow as pa
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from datos_sinteticos import generar_hoja  # noqa: E402
+from servidor_csv import ServidorCSV  # noqa: E402
+
+APP = os.path.join(RAIZ, "app.py")
+
+
+def _boton(at, texto=None, clave=None):
+    for b in at.button:
+        if (clave and b.key and b.key.startswith(clave)) or (texto and texto in b.label):
+            return b
+    return None
+
+
+def _pagina(nombre):
+    return lambda at: at.sidebar.radio[0].set_value(nombre)
+
+
+def _clic(texto=None, clave=None):
+    def accion(at):
+        boton = _boton(at, texto, clave)
+        if boton is None: return False
+        boton.click()
+    return accion
+
+
+def _segundo_mes(at):
+    meses = [s for s in at.sidebar.selectbox if s.label == "Mes"]
+    if not meses or len(meses[0].options) < 2: return False
+    meses[0].set_value(meses[0].options[1])
+
+
+def _marca(etiqueta):
+    def accion(at):
+        selector = [m for m in at.sidebar.multiselect if m.label == etiqueta]
+        if not selector or not selector[0].options: return False
+        selector[0].set_value(selector[0].options[:1])
+    return accion
+
+
+def _arribo(at):
+    casillas = [c for c in at.sidebar.checkbox if c.label == "Filtrar Arribo"]
+    if not casillas: return False
+    casillas[0].check()
+
+
+def _buscar(texto):
+    def accion(at):
+        at.text_input[0].set_value(texto)
+    return accion
+
+
+def _abrir_por(dimension):
+    def accion(at):
+        selector = [s for s in at.sidebar.selectbox if s.label == "Entregas por"]
+        if not selector: return False
+        selector[0].set_value(dimension)
+    return accion
+
+
+def _pagina_siguiente(clave):
+    def accion(at):
+        entradas = [n for n in at.number_input if n.key == clave]
+        if not entradas: return False
+        entradas[0].set_value(2)
+    return accion
+
+
+GUION = [
+    ("Agenda", "abrir", _pagina("📅 Planificación Entregas")),
+    ("Agenda", "ya entregados", _clic("Ya Entregados")),
+    ("Agenda", "página 2", _pagina_siguiente("pagina_agenda")),
+    ("Agenda", "programados", _clic("Programados")),
+    ("Agenda", "por mes", _clic("Filtrar por Mes")),
+    ("Agenda", "otro mes", _segundo_mes),
+    ("Agenda", "calendario", _clic("Calendario")),
+    ("Agenda", "mes siguiente", _clic("Siguiente")),
+    ("Agenda", "turnos", _clic("Turnos y Capacidad")),
+    ("Stock", "abrir", _pagina("📦 Control de Stock")),
+    ("Stock", "filtrar arribo", _arribo),
+    ("Stock", "estado", _clic(clave="btn_stock_1")),
+    ("Stock", "marca", _marca("Marca")),
+    ("Stock", "página 2", _pagina_siguiente("pagina_stock")),
+    ("Mantenimiento", "abrir", _pagina("🛠️ Control Mantenimiento")),
+    ("Mantenimiento", "vence hoy", _clic("Vence HOY")),
+    ("Mantenimiento", "esta semana", _clic("Esta Semana")),
+    ("Mantenimiento", "marca", _marca("Filtrar Marca")),
+    ("Documentación", "abrir", _pagina("📄 Estado Documentación")),
+    ("Documentación", "buscar", _buscar("sof")),
+    ("Documentación", "ok doc en stock", _clic(clave="btn_est_ok_stock")),
+    ("Documentación", "estado físico", _clic(clave="btn_st_doc_")),
+    ("Indicadores", "abrir", _pagina("📈 Indicadores")),
+    ("Indicadores", "por vendedor", _abrir_por("VENDEDOR")),
+    ("Indicadores", "marca", _marca("Marca")),
+    ("Plano", "abrir", _pagina("🗺️ Plano del Salón")),
+]
+
+
+def medir(at, accion=None):
+    """(ms, pico MiB por encima de lo ya retenido, MiB retenidos en Arrow, errores) de un rerun.
+
+    Los pasos cuyo control no aparece (p. ej. el paginador cuando el resultado entra en una página) se saltean.
+    """
+    if accion is not None and accion(at) is False:
+        return None
+    arrow_antes = pa.total_allocated_bytes()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    t0 = time.perf_counter()
+    at.run()
+    ms = (time.perf_counter() - t0) * 1000
+    _, pico = tracemalloc.get_traced_memory()
+    errores = [str(e.value) for e in at.exception]
+    return ms, (pico - base) / 2**20, (pa.total_allocated_bytes() - arrow_antes) / 2**20, errores
+
+
+def correr(filas, repeticiones):
+    resultados = []
+    with ServidorCSV(generar_hoja(filas).to_csv(index=False).encode()) as srv, tempfile.TemporaryDirectory() as tmp:
+        os.environ["TABLERO_URL_CSV"] = srv.url
+        os.environ["TABLERO_DIR_CACHE"] = tmp
+        os.environ.pop("TABLERO_FUENTES", None)
+        # Cada tamaño arranca con procesos "nuevos": sin refrescador ni índices en caché
+        st.cache_resource.clear()
+        for vuelta in range(repeticiones):
+            at = AppTest.from_file(APP, default_timeout=600)
+            pasos = [("Inicio", "primera carga" if vuelta == 0 else "sesión nueva", None)] + GUION
+            for pagina, paso, accion in pasos:
+                r = medir(at, accion)
+                if r is None: continue
+                ms, pico, arrow, errores = r
+                resultados.append({"filas": filas, "vuelta": vuelta, "pagina": pagina, "paso": paso,
+                                   "ms": round(ms, 1), "pico_mib": round(pico, 2), "arrow_mib": round(arrow, 2), "errores": errores})
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", default="5000,50000")
+    parser.add_argument("--repeticiones", type=int, default=2, help="sesiones seguidas por tamaño (la segunda ya encuentra cachés)")
+    parser.add_argument("--salida", help="guarda los resultados en JSON para comparar contra otra versión")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    resultados = []
+    for filas in (int(x) for x in args.filas.split(",")):
+        resultados.extend(correr(filas, args.repeticiones))
+
+    print(f"{'filas':>7} {'v':>1} {'página':<14} {'paso':<16} {'ms':>9} {'pico MiB':>9} {'arrow MiB':>9}")
+    for r in resultados:
+        marca = "  ⚠ " + r["errores"][0][:60] if r["errores"] else ""
+        print(f"{r['filas']:>7} {r['vuelta']:>1} {r['pagina']:<14} {r['paso']:<16} {r['ms']:9.1f} {r['pico_mib']:9.2f} {r['arrow_mib']:9.2f}{marca}")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
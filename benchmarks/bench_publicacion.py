@@ -0,0 +1,133 @@
+"""Memoria de N procesos de la app: cada uno con su propia carga vs. mapeando lo que publica un cargador.
+
+Levanta N procesos a la vez; cada uno carga la flota (parseando el CSV por su
+cuenta, o con FuentePublicada), lee todos los bytes de todas las columnas (sin
+copiarlas, para que queden residentes) y, cuando todos terminaron, informa su
+memoria según /proc/<pid>/smaps_rollup. Pss reparte las páginas
+compartidas entre quienes las usan, así que la suma de Pss es la memoria real
+del conjunto. También mide publicar una versión nueva y el cambio en un proceso.
+Uso: python benchmarks/bench_publicacion.py [--filas 200000] [--procesos 4]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.ingesta import IngestaIncremental  # noqa: E402
+from tablero.publicacion import FuentePublicada, Publicador  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Corre en cada proceso: carga, recorre todo, avisa y espera a que el resto termine antes de medirse
+PROCESO = r"""
+import json, sys, time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+sys.path.insert(0, sys.argv[1])
+modo, origen = sys.argv[2], sys.argv[3]
+
+def memoria():
+    valores = {}
+    for linea in open("/proc/self/smaps_rollup"):
+        partes = linea.split()
+        if partes[0].rstrip(":") in ("Rss", "Pss", "Private_Clean", "Private_Dirty", "Shared_Clean", "Shared_Dirty"):
+            valores[partes[0].rstrip(":")] = int(partes[1]) / 1024
+    return valores
+
+t0 = time.perf_counter()
+from tablero.ingesta import IngestaIncremental
+from tablero.publicacion import FuentePublicada
+if modo == "propia":
+    df = IngestaIncremental(origen).actualizar()
+elif modo == "publicada":
+    df = FuentePublicada(origen).actualizar()
+else:
+    df = pd.DataFrame()
+carga = time.perf_counter() - t0
+cargada = memoria()
+# Se lee cada byte de cada columna sin armar copias: todo queda residente y se ve qué se comparte
+for col in df.columns:
+    serie = df[col]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        partes = [serie.array.codes]
+    elif isinstance(serie.dtype, np.dtype):
+        partes = [serie.to_numpy()]
+    else:
+        partes = [b for c in pa.chunked_array(pa.array(serie)).chunks for b in c.buffers() if b is not None]
+    for parte in partes:
+        np.frombuffer(parte, dtype=np.uint8).sum()
+print("listo", flush=True)
+sys.stdin.readline()
+print(json.dumps({"carga": carga, "privada_carga": cargada["Private_Clean"] + cargada["Private_Dirty"], **memoria()}), flush=True)
+sys.stdin.readline()
+"""
+
+
+def flota(modo, origen, procesos):
+    hijos = [subprocess.Popen([sys.executable, "-c", PROCESO, RAIZ, modo, origen],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True) for _ in range(procesos)]
+    for h in hijos:
+        assert h.stdout.readline().strip() == "listo"
+    resultados = []
+    for h in hijos:
+        h.stdin.write("\n")
+        h.stdin.flush()
+        resultados.append(json.loads(h.stdout.readline()))
+    # Recién ahora terminan: si uno sale antes, lo que compartía pasa a contar como privado de los demás
+    for h in hijos:
+        h.stdin.close()
+        h.wait()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=200_000)
+    parser.add_argument("--procesos", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "hoja.csv")
+        generar_hoja(args.filas).to_csv(ruta, index=False)
+        ingesta = IngestaIncremental(ruta)
+        df = ingesta.actualizar()
+        publicado = os.path.join(tmp, "publicado")
+        publicador = Publicador(publicado)
+        t0 = time.perf_counter()
+        publicador.publicar(df, ingesta.huellas(), time.time())
+        t_publicar = time.perf_counter() - t0
+
+        print(f"filas: {args.filas}  procesos: {args.procesos}  archivo publicado: {os.path.getsize(os.path.join(publicado, 'instantanea-00000001.feather')) / 2**20:.0f} MiB")
+        print(f"{'':<22} {'carga s':>8} {'privada MiB':>12} {'(tras cargar)':>14} {'compartida MiB':>15} {'Σ Pss MiB':>10}")
+        for modo, origen, nombre in (("vacio", ruta, "sin datos (referencia)"), ("propia", ruta, "cada uno descarga"), ("publicada", publicado, "mapea lo publicado")):
+            r = flota(modo, origen, args.procesos)
+            privada = sum(x["Private_Clean"] + x["Private_Dirty"] for x in r) / len(r)
+            compartida = sum(x["Shared_Clean"] + x["Shared_Dirty"] for x in r) / len(r)
+            privada_carga = sum(x["privada_carga"] for x in r) / len(r)
+            print(f"{nombre:<22} {sum(x['carga'] for x in r) / len(r):8.2f} {privada:12.0f} {privada_carga:14.0f} {compartida:15.0f} {sum(x['Pss'] for x in r):10.0f}")
+
+        # Cambio de versión en un proceso que ya tenía la anterior
+        fuente = FuentePublicada(publicado)
+        fuente.actualizar()
+        t0 = time.perf_counter()
+        publicador.publicar(df, ingesta.huellas(), time.time())
+        t_publicar_2 = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        fuente.actualizar()
+        t_cambio = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        fuente.actualizar()
+        t_sin_cambio = time.perf_counter() - t0
+
+    print(f"publicar una versión             {min(t_publicar, t_publicar_2) * 1000:8.1f} ms (una sola descarga para todos los procesos)")
+    print(f"cambiar a la versión nueva       {t_cambio * 1000:8.1f} ms")
+    print(f"consultar sin versión nueva      {t_sin_cambio * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Un año de turnos densos: "¿está libre?" y "próximos N libres" con el índice vs. recorriendo el frame.
+
+Uso: python benchmarks/bench_turnos.py [--por-franja 18] [--bahias 40] [--vendedores 120] [--consultas 500]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.turnos import APERTURA, CIERRE, FRANJA, HORIZONTE_DIAS, Turnos  # noqa: E402
+
+DURACION = 60
+
+
+def reservas(por_franja, vendedores, semilla=0):
+    """Entregas de 2025 en días hábiles, con un promedio de `por_franja` por franja."""
+    rng = np.random.default_rng(semilla)
+    dias = pd.bdate_range("2025-01-01", "2025-12-31", freq="C", weekmask="Mon Tue Wed Thu Fri Sat")
+    horarios = [f"{m // 60:02d}:{m % 60:02d}" for m in range(APERTURA, CIERRE, FRANJA)]
+    cantidades = rng.poisson(por_franja, len(dias) * len(horarios))
+    n = int(cantidades.sum())
+    return pd.DataFrame({
+        "FECHA_ENTREGA_DT": np.repeat(np.repeat(dias.to_numpy(), len(horarios)), cantidades),
+        "HS DE ENTREGA AL CLIENTE": pd.Categorical(np.repeat(np.tile(horarios, len(dias)), cantidades)),
+        "VENDEDOR": pd.Categorical(rng.choice([f"VENDEDOR {i:03d}" for i in range(vendedores)], n)),
+    })
+
+
+class Recorrido:
+    """Lo mismo sin índice: cada consulta compara contra todas las reservas."""
+
+    def __init__(self, df, bahias):
+        minutos = df["HS DE ENTREGA AL CLIENTE"].astype(str).str[:2].astype(int) * 60 + df["HS DE ENTREGA AL CLIENTE"].astype(str).str[3:].astype(int)
+        self.inicio = (df["FECHA_ENTREGA_DT"] + pd.to_timedelta(minutos, unit="m")).to_numpy()
+        cierre = df["FECHA_ENTREGA_DT"].to_numpy() + np.timedelta64(CIERRE, "m")
+        self.fin = np.minimum(self.inicio + np.timedelta64(DURACION, "m"), cierre)
+        self.vendedor = df["VENDEDOR"].astype(str).to_numpy()
+        self.bahias = bahias
+
+    def libre(self, momento, vendedor=None):
+        momento = pd.Timestamp(momento)
+        minuto = momento.hour * 60 + momento.minute
+        if minuto < APERTURA or minuto + DURACION > CIERRE or momento.dayofweek == 6: return False
+        momento = momento.to_datetime64()
+        for k in range(DURACION // FRANJA):
+            a = momento + np.timedelta64(k * FRANJA, "m")
+            solapa = (self.inicio < a + np.timedelta64(FRANJA, "m")) & (self.fin > a)
+            if solapa.sum() >= self.bahias: return False
+            if vendedor is not None and (solapa & (self.vendedor == vendedor)).any(): return False
+        return True
+
+    def proximos_libres(self, desde, n):
+        libres, momento = [], pd.Timestamp(desde)
+        limite = momento + pd.Timedelta(days=HORIZONTE_DIAS)
+        while len(libres) < n and momento < limite:
+            if self.libre(momento): libres.append(momento.to_pydatetime())
+            momento += pd.Timedelta(minutes=FRANJA)
+            if momento.hour * 60 + momento.minute >= CIERRE:
+                momento = momento.normalize() + pd.Timedelta(days=1, minutes=APERTURA)
+        return libres
+
+
+def medir(funcion, consultas):
+    t0 = time.perf_counter()
+    resultados = [funcion(c) for c in consultas]
+    return (time.perf_counter() - t0) / len(consultas), resultados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--por-franja", type=float, default=18)
+    parser.add_argument("--bahias", type=int, default=40)
+    parser.add_argument("--vendedores", type=int, default=120)
+    parser.add_argument("--consultas", type=int, default=500)
+    args = parser.parse_args()
+
+    df = reservas(args.por_franja, args.vendedores)
+    t0 = time.perf_counter()
+    turnos = Turnos(df, bahias=args.bahias, duracion=DURACION)
+    t_indice = time.perf_counter() - t0
+    recorrido = Recorrido(df, args.bahias)
+
+    rng = np.random.default_rng(1)
+    momentos = [pd.Timestamp("2025-01-01") + pd.Timedelta(days=int(d), minutes=APERTURA + FRANJA * int(f))
+                for d, f in zip(rng.integers(0, 360, args.consultas), rng.integers(0, (CIERRE - APERTURA) // FRANJA, args.consultas))]
+    vendedores = rng.choice(turnos.vendedores, args.consultas)
+    consultas = list(zip(momentos, vendedores))
+    pocas = consultas[:max(1, args.consultas // 10)]
+
+    print(f"reservas: {len(df)}  bahías: {args.bahias}  vendedores: {args.vendedores}  conflictos: {len(turnos.conflictos)}")
+    print(f"armar el índice                  {t_indice * 1000:9.1f} ms")
+    t_i, r_i = medir(lambda c: turnos.libre(c[0], c[1]), consultas)
+    t_r, r_r = medir(lambda c: recorrido.libre(c[0], c[1]), pocas)
+    print(f"¿libre? índice                   {t_i * 1e6:9.1f} µs")
+    print(f"¿libre? recorriendo el frame     {t_r * 1e6:9.1f} µs   (coinciden: {r_i[:len(pocas)] == r_r})")
+    t_i, r_i = medir(lambda c: turnos.proximos_libres(c[0], 5), consultas)
+    t_r, r_r = medir(lambda c: recorrido.proximos_libres(c[0], 5), pocas)
+    print(f"5 próximos libres, índice        {t_i * 1e6:9.1f} µs")
+    print(f"5 próximos libres, recorriendo   {t_r * 1e6:9.1f} µs   (coinciden: {r_i[:len(pocas)] == r_r})")
+
+
+if __name__ == "__main__":
+    main()
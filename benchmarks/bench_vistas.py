@@ -0,0 +1,115 @@
+"""Memoria por sesión: cadenas de filtros con copias (como antes) vs. vistas por posición.
+
+Reproduce el trabajo de datos de Stock, Mantenimiento y Documentación en un rerun
+y mide el pico de memoria asignada por encima del frame compartido: tracemalloc
+(arreglos numpy y objetos Python) más el pool de Arrow, donde pandas guarda los
+textos. Cada variante corre en un proceso aparte para que los picos no se mezclen.
+Uso: python benchmarks/bench_vistas.py [--filas 100000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tracemalloc
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tablero.esquema import esquema_de  # noqa: E402
+from tablero.facetas import Facetas  # noqa: E402
+from tablero.ingesta import procesar_hoja  # noqa: E402
+from tablero.mantenimiento import calcular_vencimientos  # noqa: E402
+from tablero.vista import Vista  # noqa: E402
+from datos_sinteticos import generar_hoja  # noqa: E402
+
+COLS_STOCK = ["VIN", "MARCA", "MODELO", "DESCRIPCION COLOR", "FECHA DE FABRICACION", "ANTIGÜEDAD DE STOCK", "UBICACION", "DETALLE DEL ESTADO Y FECHA DE DISPONIBILIDAD DE UNIDAD", "ESTADO"]
+COLS_MANT = ["VIN", "MARCA", "MODELO", "FECHA_ARRIBO_DT", "TAREA", "UBICACION"]
+COLS_DOC = ["FECHA DE FACTURACION DE LA UNIDAD", "VIN", "CLIENTE", "MARCA", "ESTADO DE ADMINISTRATIVO", "MODELO", "UBICACION", "ESTADO"]
+HOY = pd.Timestamp("2024-06-12")
+
+
+def con_copias(df, esq):
+    # Stock
+    df_stock = df.copy()
+    df_stock = df_stock[df_stock["MARCA"].isin(["PEUGEOT", "CITROËN"])]
+    df_stock["ESTADO"].value_counts()
+    df_stock[COLS_STOCK]
+    # Mantenimiento
+    df_mant = df.copy()
+    df_mant = df_mant[df_mant["ESTADO"].astype(str).str.strip().str.upper() != "ENTREGADO"]
+    calcular_vencimientos(df_mant, esq.controles, HOY)
+    # Documentación: copia de la página + las dos copias para los conteos
+    df_doc = df.copy()
+    df_doc = df_doc[df_doc["MARCA"].isin(["PEUGEOT"])]
+    df_for_admin_counts = df_doc.copy()
+    df_for_stock_counts = df_doc.copy()
+    df_for_admin_counts[esq.admin_doc].astype(str).str.contains("gestor", case=False, regex=False, na=False).sum()
+    df_for_stock_counts["ESTADO"].astype(str).str.upper().value_counts()
+    df_doc[COLS_DOC]
+
+
+def con_vistas(df, esq, facetas):
+    # Stock
+    v = Vista(df)
+    v = v.filtrar(v.columna("MARCA").isin(["PEUGEOT", "CITROËN"]))
+    v.columna("ESTADO").value_counts()
+    v.materializar(COLS_STOCK)
+    # Mantenimiento
+    v = Vista(df)
+    v = v.filtrar(v.columna("ESTADO").astype(str).str.strip().str.upper() != "ENTREGADO")
+    calcular_vencimientos(v.materializar(COLS_MANT + [c for c in esq.controles.values() if c]), esq.controles, HOY)
+    # Documentación
+    v = Vista(df)
+    v = v.filtrar(v.columna("MARCA").isin(["PEUGEOT"]))
+    tabla = facetas.contingencia(v.posiciones())
+    facetas.contar(tabla, "gestor")
+    facetas.conteos_por_estado(tabla)
+    v.materializar(COLS_DOC)
+
+
+def pico(funcion, *args):
+    pool = pa.default_memory_pool()
+    base_arrow = pool.bytes_allocated()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    funcion(*args)
+    _, maximo = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return maximo / 2**20, (pool.max_memory() - base_arrow) / 2**20
+
+
+def medir_variante(variante, filas):
+    df = procesar_hoja(generar_hoja(filas))
+    esq = esquema_de(df)
+    if variante == "copias":
+        python, arrow = pico(con_copias, df, esq)
+    else:
+        facetas = Facetas(df, esq.admin_doc)  # compartida por todas las sesiones
+        python, arrow = pico(con_vistas, df, esq, facetas)
+    print(f"{python} {arrow}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--variante", choices=["copias", "vistas"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.variante:
+        return medir_variante(args.variante, args.filas)
+
+    resultados = {}
+    for variante in ("copias", "vistas"):
+        salida = subprocess.run([sys.executable, __file__, "--variante", variante, "--filas", str(args.filas)],
+                                capture_output=True, text=True, check=True).stdout.split()
+        resultados[variante] = [float(x) for x in salida[-2:]]
+    print(f"filas: {args.filas}")
+    print(f"{'':<22} {'numpy/python':>13} {'arrow':>9} {'total':>9}  (MiB)")
+    for variante, (python, arrow) in resultados.items():
+        print(f"pico por sesión {variante:<6} {python:>13.1f} {arrow:>9.1f} {python + arrow:>9.1f}")
+    antes, despues = sum(resultados["copias"]), sum(resultados["vistas"])
+    print(f"reducción: {antes / despues:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
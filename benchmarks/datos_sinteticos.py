@@ -0,0 +1,76 @@
+"""Generador de flota sintética con el mismo layout de encabezados que la planilla."""
+import numpy as np
+import pandas as pd
+
+ENCABEZADOS = [
+    "VIN", "MARCA", "MODELO", "DESCRIPCION COLOR", "FECHA DE FABRICACION", "FECHA DE ARRIBO",
+    "ANTIGÜEDAD DE STOCK", "UBICACION", "ESTADO", "DETALLE DEL ESTADO Y FECHA DE DISPONIBILIDAD DE UNIDAD",
+    "ESTADO DE ADMINISTRATIVO", "CLIENTE", "VENDEDOR", "CANAL DE VENTA", "TELEFONO", "CORREO",
+    "FECHA DE FACTURACION DE LA UNIDAD", "FECHA CONFIRMACIÓN DE ENTREGA", "HS DE ENTREGA AL CLIENTE",
+    "FECHA DISPONIBILIDAD PAPELES", "FECHA QUE EL GESTOR RETIRA DOC", "FECHA PREVISTA DE ENTREGA", "ACCESORIOS",
+    "CONTROL 30 DIAS REALIZADO", "CONTROL 60 DIAS REALIZADO", "CONTROL 90 DIAS REALIZADO",
+    "CONTROL 180 DIAS REALIZADO", "CONTROL 360 DIAS REALIZADO", "CONTROL 540 DIAS REALIZADO",
+]
+
+MARCAS = {"PEUGEOT": ["208", "2008", "3008", "PARTNER", "EXPERT"], "CITROËN": ["C3", "C4 CACTUS", "BERLINGO", "C5 AIRCROSS"]}
+COLORES = ["BLANCO BANQUISE", "GRIS ARTENSE", "NEGRO PERLA", "ROJO ELIXIR", "AZUL VERTIGO"]
+UBICACIONES = ["SALÓN", "PLAYA 1", "PLAYA 2", "TALLER", "DEPÓSITO SALTA"]
+ESTADOS = ["EN EXHIBICIÓN", "SIN PRE ENTREGA", "CON PRE ENTREGA", "BLOQUEADO", "ENTREGADO", "RESERVADO", "DISPONIBLE"]
+ESTADOS_ADMIN = [
+    "Ok documentación", "Atopatentado sin cliente", "Autopatentado firma 08", "En caso legales",
+    "No retirará la unidad", "Entrega al gestor", "Entrega al Reventa", "Se envía a Salta", "Firma titular", "",
+]
+VENDEDORES = ["GARCÍA", "LÓPEZ", "MARTÍNEZ", "FERNÁNDEZ", "RODRÍGUEZ", "PÉREZ", "GÓMEZ", "DÍAZ"]
+CANALES = ["CONVENCIONAL", "PLAN DE AHORRO", "FLOTA", "REVENTA"]
+NOMBRES = ["JUAN", "MARÍA", "JOSÉ", "ANA", "LUIS", "SOFÍA", "PEDRO", "LUCÍA"]
+APELLIDOS = ["GUARI", "ÁLVAREZ", "SOSA", "ROMERO", "TORRES", "RUIZ", "CASTRO", "ORTIZ"]
+CONTROLES = ["OK", "N/A", "SI", "", "PENDIENTE"]
+HORARIOS = [f"{h:02d}:{m:02d}" for h in range(9, 18) for m in (0, 30)]
+
+
+def _fechas(rng, n, desde, dias, vacias=0.0):
+    # Se formatea cada día una sola vez y se indexa la tabla
+    tabla = pd.date_range(desde, periods=dias, freq="D").strftime("%d/%m/%Y").to_numpy(dtype=object)
+    texto = pd.Series(tabla[rng.integers(0, dias, n)])
+    if vacias:
+        texto[rng.random(n) < vacias] = np.nan
+    return texto
+
+
+def generar_hoja(n, semilla=0, desde="2022-01-01", dias=1800):
+    """Devuelve un DataFrame crudo (fechas como texto dd/mm/aaaa) como el CSV exportado."""
+    rng = np.random.default_rng(semilla)
+    marcas = rng.choice(list(MARCAS), n)
+    modelos = np.empty(n, dtype=object)
+    for marca, opciones in MARCAS.items():
+        m = marcas == marca
+        modelos[m] = rng.choice(opciones, m.sum())
+    df = pd.DataFrame({
+        "VIN": [f"VF3{i:014d}" for i in rng.permutation(n)],
+        "MARCA": marcas,
+        "MODELO": modelos,
+        "DESCRIPCION COLOR": rng.choice(COLORES, n),
+        "FECHA DE FABRICACION": _fechas(rng, n, desde, dias),
+        "FECHA DE ARRIBO": _fechas(rng, n, desde, dias, vacias=0.02),
+        "ANTIGÜEDAD DE STOCK": rng.integers(0, 720, n),
+        "UBICACION": rng.choice(UBICACIONES, n),
+        "ESTADO": rng.choice(ESTADOS, n),
+        "DETALLE DEL ESTADO Y FECHA DE DISPONIBILIDAD DE UNIDAD": rng.choice(["DISPONIBLE", "EN TRÁNSITO", "RETENIDO"], n),
+        "ESTADO DE ADMINISTRATIVO": rng.choice(ESTADOS_ADMIN, n),
+        "CLIENTE": np.char.add(np.char.add(rng.choice(APELLIDOS, n), " "), rng.choice(NOMBRES, n)),
+        "VENDEDOR": rng.choice(VENDEDORES, n),
+        "CANAL DE VENTA": rng.choice(CANALES, n),
+        "TELEFONO": rng.integers(3870000000, 3879999999, n).astype(str),
+        "CORREO": [f"cliente{i}@correo.com" for i in range(n)],
+        "FECHA DE FACTURACION DE LA UNIDAD": _fechas(rng, n, desde, dias, vacias=0.1),
+        "FECHA CONFIRMACIÓN DE ENTREGA": _fechas(rng, n, desde, dias + 365, vacias=0.05),
+        "HS DE ENTREGA AL CLIENTE": rng.choice(HORARIOS, n),
+        "FECHA DISPONIBILIDAD PAPELES": _fechas(rng, n, desde, dias, vacias=0.3),
+        "FECHA QUE EL GESTOR RETIRA DOC": _fechas(rng, n, desde, dias, vacias=0.5),
+        "FECHA PREVISTA DE ENTREGA": _fechas(rng, n, desde, dias, vacias=0.5),
+        "ACCESORIOS": rng.choice(["", "POLARIZADO", "ALARMA", "CUBREALFOMBRAS"], n),
+    })
+    for intervalo in (30, 60, 90, 180, 360, 540):
+        df[f"CONTROL {intervalo} DIAS REALIZADO"] = rng.choice(CONTROLES, n, p=[0.5, 0.1, 0.1, 0.2, 0.1])
+    df = df.replace("", np.nan)
+    return df[ENCABEZADOS]
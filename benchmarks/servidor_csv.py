@@ -0,0 +1,74 @@
+"""Servidor HTTP local que reemplaza a la exportación CSV de Google Sheets.
+
+Responde ETag/Last-Modified y 304 como el export real, para probar la ingesta sin red.
+Uso: python benchmarks/servidor_csv.py hoja.csv [--puerto 8765]
+y luego TABLERO_URL_CSV=http://127.0.0.1:8765/hoja.csv streamlit run app.py
+"""
+import argparse
+import hashlib
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ServidorCSV:
+    def __init__(self, contenido=b"", puerto=0, demora=0.0):
+        self.demora = demora
+        self.pedidos = 0
+        self.respuestas_304 = 0
+        self.publicar(contenido)
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                servidor.pedidos += 1
+                if servidor.demora: time.sleep(servidor.demora)
+                contenido, etag, modificado = servidor._estado
+                if self.headers.get("If-None-Match") == etag:
+                    servidor.respuestas_304 += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv; charset=utf-8")
+                self.send_header("Content-Length", str(len(contenido)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", modificado)
+                self.end_headers()
+                self.wfile.write(contenido)
+
+            def log_message(self, *args):
+                pass
+
+        self._http = ThreadingHTTPServer(("127.0.0.1", puerto), Manejador)
+        self.url = f"http://127.0.0.1:{self._http.server_address[1]}/hoja.csv"
+
+    def publicar(self, contenido):
+        etag = '"' + hashlib.sha1(contenido).hexdigest() + '"'
+        self._estado = (contenido, etag, formatdate(usegmt=True))
+
+    def iniciar(self):
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+        return self
+
+    def detener(self):
+        self._http.shutdown()
+        self._http.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("csv")
+    parser.add_argument("--puerto", type=int, default=8765)
+    args = parser.parse_args()
+    with open(args.csv, "rb") as f:
+        srv = ServidorCSV(f.read(), puerto=args.puerto)
+    print(f"Sirviendo {args.csv} en {srv.url}")
+    srv._http.serve_forever()
@@ -0,0 +1,28 @@
+"""Registro de páginas de la app.
+
+Cada página vive en su propio módulo con una función `mostrar(snap, esquema, memo)`
+y se importa recién la primera vez que alguien la abre: las dependencias pesadas
+(plotly, streamlit-calendar) y los índices de cada página no se cargan en un
+proceso que nunca la usa. Después el módulo queda en sys.modules y el rerun sólo
+paga la búsqueda en el diccionario.
+"""
+import importlib
+
+# (etiqueta en la navegación, módulo), en el orden del menú
+PAGINAS = (
+    ("📅 Planificación Entregas", "paginas.agenda"),
+    ("📦 Control de Stock", "paginas.stock"),
+    ("🛠️ Control Mantenimiento", "paginas.mantenimiento"),
+    ("📄 Estado Documentación", "paginas.documentacion"),
+    ("📈 Indicadores", "paginas.indicadores"),
+    ("🗺️ Plano del Salón", "paginas.plano"),
+)
+_MODULOS = dict(PAGINAS)
+
+
+def etiquetas():
+    return [etiqueta for etiqueta, _ in PAGINAS]
+
+
+def mostrar(etiqueta, snap, esquema, memo):
+    importlib.import_module(_MODULOS[etiqueta]).mostrar(snap, esquema, memo)
@@ -0,0 +1,204 @@
+"""1. Planificación Entregas: agenda por año / mes / día, calendario y capacidad de turnos."""
+import datetime
+
+import numpy as np
+import streamlit as st
+
+from paginas.comun import mostrar_tabla
+from tablero.agenda import MAX_EVENTOS, IndiceAgenda, ventana_calendario
+from tablero.metricas import tramo
+from tablero.turnos import APERTURA, CIERRE, FRANJA, Turnos
+from tablero.vista import Vista
+
+
+@st.cache_resource(max_entries=2)
+def obtener_indice_agenda(version, _df):
+    with tramo("indice.agenda"):
+        return IndiceAgenda(_df)
+
+
+@st.cache_resource(max_entries=4)
+def obtener_turnos(version, bahias, duracion, _df):
+    with tramo("indice.turnos"):
+        return Turnos(_df, bahias, duracion)
+
+
+def mover_calendario(paso):
+    # Callback de ◀ / ▶: corre la fecha ancla una semana o un mes
+    ancla = st.session_state.calendario_ancla
+    if st.session_state.calendario_vista == "Semana":
+        st.session_state.calendario_ancla = ancla + datetime.timedelta(days=7 * paso)
+    else:
+        mes = ancla.month - 1 + paso
+        st.session_state.calendario_ancla = datetime.date(ancla.year + mes // 12, mes % 12 + 1, 1)
+
+
+def mostrar(snap, esquema, memo):
+    df = snap.df
+    if 'modo_vista_agenda' not in st.session_state: st.session_state.modo_vista_agenda = 'mes'
+    st.title("📅 Agenda de Entregas")
+    if not df.empty and "FECHA_ENTREGA_DT" in df.columns:
+        agenda = obtener_indice_agenda(snap.version, df)
+        años = agenda.años()
+        if años:
+            año_sel = st.sidebar.selectbox("Seleccionar Año", options=años, index=len(años)-1)
+            
+            # Rangos del índice por fecha: ya vienen ordenados por fecha y hora
+            hoy = np.datetime64(datetime.date.today())
+            entregados = agenda.año(año_sel, hasta=hoy)
+            programados = agenda.año(año_sel, desde=hoy)
+            
+            c1, c2, c3, c4, c5 = st.columns(5)
+            type_ent = "primary" if st.session_state.modo_vista_agenda == 'entregados' else "secondary"
+            type_prog = "primary" if st.session_state.modo_vista_agenda == 'programados' else "secondary"
+            type_mes = "primary" if st.session_state.modo_vista_agenda == 'mes' else "secondary"
+            type_cal = "primary" if st.session_state.modo_vista_agenda == 'calendario' else "secondary"
+            type_cap = "primary" if st.session_state.modo_vista_agenda == 'capacidad' else "secondary"
+
+            if c1.button(f"✅ Ya Entregados ({len(entregados)})", use_container_width=True, type=type_ent):
+                st.session_state.modo_vista_agenda = 'entregados'
+            if c2.button(f"🚀 Programados ({len(programados)})", use_container_width=True, type=type_prog):
+                st.session_state.modo_vista_agenda = 'programados'
+            if c3.button("📅 Filtrar por Mes / Día", use_container_width=True, type=type_mes):
+                st.session_state.modo_vista_agenda = 'mes'
+            if c4.button("🗓️ Calendario", use_container_width=True, type=type_cal):
+                st.session_state.modo_vista_agenda = 'calendario'
+            if c5.button("🧭 Turnos y Capacidad", use_container_width=True, type=type_cap):
+                st.session_state.modo_vista_agenda = 'capacidad'
+            st.divider()
+
+            df_final = Vista(df, np.array([], dtype=int))
+            titulo = ""
+            
+            if st.session_state.modo_vista_agenda == 'entregados':
+                st.info(f"Historial de entregas {año_sel}.")
+                df_final = entregados
+                titulo = f"Historial Entregado - {año_sel}"
+            elif st.session_state.modo_vista_agenda == 'programados':
+                st.info(f"Próximas entregas a partir de hoy.")
+                df_final = programados
+                titulo = f"Agenda Pendiente - {año_sel}"
+            elif st.session_state.modo_vista_agenda == 'calendario':
+                # Al cambiar de año el calendario salta a ese año (o a hoy, si es el año en curso)
+                if st.session_state.get("calendario_año") != año_sel:
+                    st.session_state.calendario_año = año_sel
+                    hoy_d = datetime.date.today()
+                    st.session_state.calendario_ancla = hoy_d if hoy_d.year == año_sel else datetime.date(año_sel, 1, 1)
+                vista_cal = st.sidebar.radio("Vista del calendario", ["Mes", "Semana"], horizontal=True, key="calendario_vista")
+                c_ant, c_fecha, c_sig = st.columns([1, 2, 1])
+                c_ant.button("◀ Anterior", use_container_width=True, on_click=mover_calendario, args=(-1,))
+                c_fecha.date_input("Ir a la fecha", key="calendario_ancla", format="DD/MM/YYYY", label_visibility="collapsed")
+                c_sig.button("Siguiente ▶", use_container_width=True, on_click=mover_calendario, args=(1,))
+
+                # Sólo la ventana visible: rango del índice y eventos en la caché compartida por ventana
+                desde, hasta = ventana_calendario(st.session_state.calendario_ancla, vista_cal)
+                cantidad = len(agenda.rango(desde, hasta))
+                eventos = memo.obtener(snap.version, "calendario", (str(desde), str(hasta)), lambda: agenda.eventos(desde, hasta))
+                resumen_dias = " (totales por día)" if cantidad > MAX_EVENTOS else ""
+                st.caption(f"{cantidad} entregas entre el {desde.astype(datetime.date):%d/%m/%Y} y el {(hasta - 1).astype(datetime.date):%d/%m/%Y}{resumen_dias}. Tocá un día para ver su cronograma.")
+                # streamlit-calendar se importa recién cuando alguien abre el calendario
+                from streamlit_calendar import calendar
+                with tramo("agenda.calendario"):
+                    estado_cal = calendar(
+                        events=eventos,
+                        options={
+                            "initialView": "timeGridWeek" if vista_cal == "Semana" else "dayGridMonth",
+                            "initialDate": str(st.session_state.calendario_ancla),
+                            # Sin navegación propia: la ventana la decide el servidor
+                            "headerToolbar": {"left": "", "center": "title", "right": ""},
+                            "locale": "es",
+                            "firstDay": 1,
+                            "dayMaxEvents": 4,
+                            "slotMinTime": "07:00:00",
+                            "slotMaxTime": "21:00:00",
+                            "defaultTimedEventDuration": "00:30:00",
+                        },
+                        callbacks=["dateClick", "eventClick"],
+                        key=f"calendario_{vista_cal}_{desde}",
+                    )
+                if estado_cal.get("eventClick"):
+                    props = estado_cal["eventClick"]["event"].get("extendedProps", {})
+                    if props.get("vin"):
+                        st.info(f"{estado_cal['eventClick']['event']['title']} — VIN {props['vin']} · Vendedor: {props.get('vendedor') or '-'}")
+                if estado_cal.get("dateClick"):
+                    dia_cal = datetime.date.fromisoformat(estado_cal["dateClick"]["date"][:10])
+                    df_final = agenda.dia(dia_cal)
+                    titulo = f"Cronograma del {dia_cal.strftime('%d/%m/%Y')} ({len(df_final)})"
+            elif st.session_state.modo_vista_agenda == 'capacidad':
+                st.sidebar.header("Capacidad")
+                bahias = st.sidebar.number_input("Bahías de entrega", min_value=1, max_value=20, value=2, step=1)
+                duracion = st.sidebar.selectbox("Duración de cada entrega", [30, 60, 90, 120], index=1, format_func=lambda m: f"{m} min")
+                turnos = obtener_turnos(snap.version, bahias, duracion, df)
+                conflictos = turnos.conflictos_desde(hoy)
+                k1, k2, k3 = st.columns(3)
+                k1.metric("Franjas con más entregas que bahías", int((conflictos["RECURSO"] == "Bahías de entrega").sum()))
+                k2.metric("Vendedores con entregas superpuestas", int((conflictos["RECURSO"] != "Bahías de entrega").sum()))
+                k3.metric("Entregas sin horario válido", turnos.sin_horario + turnos.fuera_de_grilla)
+                st.caption(f"Grilla de {FRANJA} min de {APERTURA // 60:02d}:00 a {CIERRE // 60:02d}:00, lunes a sábado. Conflictos desde hoy.")
+                if len(conflictos):
+                    mostrar_tabla(Vista(conflictos), list(conflictos.columns), "pagina_conflictos",
+                                  column_config={"FECHA": st.column_config.DateColumn("Fecha", format="DD/MM/YYYY")})
+                else:
+                    st.success("No hay conflictos de aquí en adelante.")
+
+                st.subheader("🔎 Buscar turno")
+                b1, b2, b3 = st.columns(3)
+                fecha_turno = b1.date_input("Fecha", value=datetime.date.today(), format="DD/MM/YYYY")
+                horarios = [f"{m // 60:02d}:{m % 60:02d}" for m in range(APERTURA, CIERRE, FRANJA)]
+                hora_turno = b2.selectbox("Hora", horarios)
+                vendedor_turno = b3.selectbox("Vendedor", ["(cualquiera)"] + sorted(turnos.vendedores))
+                vendedor_turno = None if vendedor_turno == "(cualquiera)" else vendedor_turno
+                momento = datetime.datetime.combine(fecha_turno, datetime.time.fromisoformat(hora_turno))
+                ocupadas = turnos.ocupacion(momento)
+                if turnos.libre(momento, vendedor_turno):
+                    st.success(f"✅ Libre: {ocupadas} de {bahias} bahías ocupadas a esa hora.")
+                else:
+                    st.error(f"⛔ No disponible ({ocupadas} de {bahias} bahías ocupadas, vendedor ocupado o fuera de horario).")
+                proximos = turnos.proximos_libres(momento, 5, vendedor_turno)
+                if proximos:
+                    dias_semana = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+                    st.write("Próximos turnos libres: " + " · ".join(f"{dias_semana[p.weekday()]} {p:%d/%m %H:%M}" for p in proximos))
+            else:
+                st.sidebar.header("Filtrar Mes")
+                mapa_meses = dict(agenda.meses(año_sel))
+                if mapa_meses:
+                    mes_sel = st.sidebar.selectbox("Mes", options=list(mapa_meses))
+                    df_mes = agenda.mes(año_sel, mapa_meses[mes_sel])
+                    primera, ultima = agenda.extremos(df_mes)
+                    col_filtro, col_vacio = st.columns([1, 3])
+                    with col_filtro:
+                        dia_filtro = st.date_input("📅 Filtrar día", value=None, min_value=primera, max_value=ultima)
+                    if dia_filtro:
+                        df_final = agenda.dia(dia_filtro)
+                        titulo = f"Cronograma del {dia_filtro.strftime('%d/%m/%Y')} ({len(df_final)})"
+                    else:
+                        df_final = df_mes
+                        titulo = f"Cronograma Mensual - {mes_sel} ({len(df_final)})"
+                else:
+                    st.warning("No hay datos mensuales.")
+
+            if not df_final.empty:
+                st.subheader(f"📋 {titulo}")
+                
+                # --- DETECCIÓN Y VISUALIZACIÓN DE COLUMNA ADMIN ---
+                col_admin = esquema.admin
+                
+                cols_agenda = ["FECHA_ENTREGA_DT", "HS DE ENTREGA AL CLIENTE", "CLIENTE"]
+                if col_admin:
+                    cols_agenda.append(col_admin)
+                
+                cols_agenda.extend(["MARCA", "MODELO", "VIN", "CANAL DE VENTA", "TELEFONO_CLEAN", "CORREO_CLEAN", "VENDEDOR"])
+                
+                mostrar_tabla(
+                    df_final, cols_agenda, "pagina_agenda",
+                    column_config={
+                        "FECHA_ENTREGA_DT": st.column_config.DateColumn("Fecha", format="DD/MM/YYYY"),
+                        col_admin: st.column_config.TextColumn("Estado Admin") if col_admin else None
+                    }
+                )
+            else:
+                if st.session_state.modo_vista_agenda not in ('mes', 'calendario', 'capacidad'): st.info("No hay vehículos aquí.")
+        else:
+            st.warning("No se encontraron años en los datos.")
+    else:
+        st.error("No se pudo cargar la fecha de entrega o los datos están vacíos.")
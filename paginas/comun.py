@@ -0,0 +1,90 @@
+"""Lo que comparten todas las páginas: datos, cachés del proceso, tabla paginada y archivos estáticos."""
+import functools
+import os
+
+import pandas as pd
+import streamlit as st
+
+from tablero.federacion import Federacion, fuentes_de_entorno
+from tablero.historial import HistorialEstados
+from tablero.memo import MemoCompartido
+from tablero.metricas import tramo
+from tablero.publicacion import FuentePublicada
+from tablero.refresco import Instantanea, Refrescador
+
+# --- CARGA DE DATOS ---
+DIR_CACHE = os.environ.get("TABLERO_DIR_CACHE", ".cache")
+# Una planilla por sucursal; sin TABLERO_FUENTES se usa sólo la de Autociel
+FUENTES = fuentes_de_entorno()
+# Con varios procesos detrás de un balanceador: carpeta donde publica el cargador (tablero.publicacion)
+PUBLICACION = os.environ.get("TABLERO_PUBLICACION")
+FILAS_POR_PAGINA = 200
+
+
+@st.cache_resource
+def obtener_historial():
+    # Registro de cambios de estado en disco; lo alimenta el hilo de refresco
+    return HistorialEstados(os.path.join(DIR_CACHE, "historial"))
+
+
+@st.cache_resource
+def obtener_refrescador():
+    # Un único hilo por proceso, compartido por todas las sesiones
+    historial = obtener_historial()
+    if PUBLICACION:
+        # Sólo el cargador descarga y escribe el historial; acá se mapea cada versión y se relee el historial
+        return Refrescador(FuentePublicada(PUBLICACION), intervalo=5, al_publicar=lambda _: historial.recargar()).iniciar()
+    fuente = Federacion.desde_urls(FUENTES, DIR_CACHE)
+    return Refrescador(fuente, intervalo=60, al_publicar=historial.registrar_instantanea).iniciar()
+
+
+def load_data():
+    # Nunca descarga dentro de la ejecución del script: devuelve la última instantánea buena
+    refrescador = obtener_refrescador()
+    with tramo("carga.instantanea"):
+        snap = refrescador.instantanea(espera=120)
+    if snap is None:
+        st.error(f"Error cargando datos: {refrescador.ultimo_error}")
+        return Instantanea(pd.DataFrame(), 0, None)
+    return snap
+
+
+@st.cache_resource
+def obtener_memo():
+    # Resultados por (versión, página, filtros) compartidos por todas las sesiones
+    return MemoCompartido()
+
+
+# --- ARCHIVOS ESTÁTICOS ---
+@functools.lru_cache(maxsize=None)
+def imagen(*candidatos):
+    """Bytes del primer archivo que exista (None si ninguno); se busca y se lee una vez por proceso."""
+    for ruta in candidatos:
+        if os.path.exists(ruta):
+            with open(ruta, "rb") as f:
+                return f.read()
+    return None
+
+
+def logo():
+    return imagen("logo.png.png", "logo.png", "logo.jpg")
+
+
+# --- TABLAS ---
+def mostrar_tabla(vista, columnas, clave, orden=None, **kwargs):
+    # Sólo se ordena por las columnas clave y sólo viaja al navegador la página visible
+    columnas = [c for c in columnas if c in vista.columns]
+    if orden:
+        with tramo("tabla.ordenar"): vista = vista.ordenar(orden)
+    paginas = vista.paginas(FILAS_POR_PAGINA)
+    numero = 1
+    if paginas > 1:
+        if st.session_state.get(clave, 1) > paginas: st.session_state[clave] = 1
+        c_pag, c_info = st.columns([1, 3])
+        numero = c_pag.number_input("Página", min_value=1, max_value=paginas, step=1, key=clave)
+        desde = (numero - 1) * FILAS_POR_PAGINA
+        c_info.caption(f"Página {numero} de {paginas} · filas {desde + 1}–{min(desde + FILAS_POR_PAGINA, len(vista))} de {len(vista)}")
+    with tramo("tabla.materializar"):
+        pagina = vista.pagina(numero, FILAS_POR_PAGINA).materializar(columnas)
+    with tramo("tabla.serializar"):
+        st.dataframe(pagina, use_container_width=True, hide_index=True, **kwargs)
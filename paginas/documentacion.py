@@ -0,0 +1,193 @@
+"""4. Estado Documentación: estado administrativo × estado físico, con búsqueda por VIN o cliente."""
+import streamlit as st
+
+from paginas.comun import mostrar_tabla
+from tablero.busqueda import IndiceBusqueda, columnas_texto
+from tablero.facetas import ESTADOS_ADMIN, FILTRO_OK_ENTREGADO, FILTRO_OK_STOCK, Facetas
+from tablero.metricas import tramo
+from tablero.vista import Vista
+
+
+@st.cache_resource(max_entries=2)
+def obtener_facetas(version, col_admin, _df):
+    with tramo("indice.facetas"):
+        return Facetas(_df, col_admin)
+
+
+@st.cache_resource(max_entries=2)
+def obtener_indice_busqueda(version, _df):
+    # Se construye una vez por instantánea y lo comparten todas las sesiones
+    with tramo("indice.busqueda"):
+        return IndiceBusqueda(_df)
+
+
+def mostrar(snap, esquema, memo):
+    df = snap.df
+    if 'filtro_estado_admin' not in st.session_state: st.session_state.filtro_estado_admin = None
+    if 'filtro_doc_stock' not in st.session_state: st.session_state.filtro_doc_stock = None
+    st.title("📄 Estado de Documentación")
+    
+    df_doc = Vista(df)
+    
+    if not df_doc.empty:
+        # --- FILTROS LATERALES ---
+        st.sidebar.header("Filtros Documentación")
+        marca_filter = []
+        if "MARCA" in df_doc.columns:
+            marca_filter = st.sidebar.multiselect("Filtrar Marca", df["MARCA"].unique())
+
+        col_busq, col_ambito = st.columns([3, 1])
+        search = col_busq.text_input("🔎 Buscar por VIN o CLIENTE", placeholder="Escribe para buscar...")
+        ambito = col_ambito.selectbox("Buscar en", ["Todas las columnas"] + columnas_texto(df))
+
+        # COLUMNA ADMINISTRATIVA (resuelta una vez por firma de encabezados)
+        col_target_admin = esquema.admin_doc
+
+        # Clasificación precalculada por instantánea: los conteos salen de una tabla de contingencia
+        facetas = obtener_facetas(snap.version, col_target_admin, df)
+
+        def filtrar_doc():
+            vista = df_doc
+            if marca_filter: vista = vista.filtrar(vista.columna("MARCA").isin(marca_filter))
+            if search:
+                # Índice de trigramas: sin distinguir mayúsculas ni acentos ("Citroën" = "CITROEN")
+                indice = obtener_indice_busqueda(snap.version, df)
+                coincide = indice.mascara(search, None if ambito == "Todas las columnas" else [ambito])
+                vista = vista.filtrar_global(coincide)
+            return vista, facetas.contingencia(None if vista.es_completa() else vista.posiciones())
+        df_doc, tabla = memo.obtener(snap.version, "documentacion", (tuple(marca_filter), search, ambito, col_target_admin), filtrar_doc)
+        
+        st.markdown("---")
+        filtro_admin = st.session_state.filtro_estado_admin if col_target_admin else None
+        filtro_stock = st.session_state.filtro_doc_stock if "ESTADO" in df_doc.columns else None
+
+        # ----------------------------------------------------
+        # NIVEL 1: ESTADO ADMINISTRATIVO (AHORA ARRIBA)
+        # ----------------------------------------------------
+        st.subheader("📂 1. Estado Administrativo")
+
+        # Los conteos respetan el filtro de stock si existe
+        total_admin = facetas.contar(tabla, None, filtro_stock)
+        admin_buttons = []
+        
+        # 1. Botón Reset (Todos)
+        admin_buttons.append({
+            "label": f"📋 Ver Todos ({total_admin})",
+            "key": "btn_doc_reset_admin",
+            "filter_val": None,
+            "count": total_admin
+        })
+
+        if col_target_admin:
+            # 2. Lógica Especial: DIVIDIR OK DOCUMENTACIÓN (En Stock / Entregados)
+            if "ESTADO" in df_doc.columns:
+                cant_ok_stock = facetas.contar(tabla, FILTRO_OK_STOCK, filtro_stock)
+                cant_ok_entregados = facetas.contar(tabla, FILTRO_OK_ENTREGADO, filtro_stock)
+
+                if cant_ok_stock > 0:
+                    admin_buttons.append({
+                        "label": f"✅ Ok Doc (En Stock) ({cant_ok_stock})",
+                        "key": "btn_est_ok_stock",
+                        "filter_val": FILTRO_OK_STOCK,
+                        "count": cant_ok_stock
+                    })
+                if cant_ok_entregados > 0:
+                    admin_buttons.append({
+                        "label": f"✅📜 Ok Doc (Entregados) ({cant_ok_entregados})",
+                        "key": "btn_est_ok_entregado",
+                        "filter_val": FILTRO_OK_ENTREGADO,
+                        "count": cant_ok_entregados
+                    })
+
+            # 3. Lógica Estándar (Resto de estados)
+            for label_btn, icono, keyword in ESTADOS_ADMIN:
+                cant = facetas.contar(tabla, keyword, filtro_stock)
+                if cant > 0: 
+                    admin_buttons.append({
+                        "label": f"{icono} {label_btn} ({cant})",
+                        "key": f"btn_est_{keyword}",
+                        "filter_val": keyword,
+                        "count": cant
+                    })
+
+        # Renderizar Botones Admin
+        if admin_buttons:
+            cols_a = st.columns(3)
+            for idx, btn_data in enumerate(admin_buttons):
+                col_to_use = cols_a[idx % 3]
+                with col_to_use:
+                    is_active = (st.session_state.filtro_estado_admin == btn_data["filter_val"])
+                    btn_type = "primary" if is_active else "secondary"
+                    if st.button(btn_data["label"], use_container_width=True, key=btn_data["key"], type=btn_type):
+                        st.session_state.filtro_estado_admin = btn_data["filter_val"]
+
+        st.markdown("<br>", unsafe_allow_html=True)
+
+        # ----------------------------------------------------
+        # NIVEL 2: ESTADO FÍSICO (AHORA ABAJO)
+        # ----------------------------------------------------
+        st.subheader("📦 2. Estado Físico (Stock)")
+        
+        # Los conteos respetan el filtro administrativo activo (incluido un clic de esta ejecución)
+        filtro_admin = st.session_state.filtro_estado_admin if col_target_admin else None
+        total_stock = facetas.contar(tabla, filtro_admin, None)
+        stock_buttons = []
+        stock_buttons.append({
+            "label": f"♾️ Cualquiera ({total_stock})",
+            "key": "btn_stock_reset_doc",
+            "filter_val": None,
+            "count": total_stock
+        })
+
+        if "ESTADO" in df_doc.columns:
+            iconos_stock = {
+                "EN EXHIBICIÓN": "🏢", "EN EXHIBICION": "🏢", "SIN PRE ENTREGA": "🛠️", 
+                "CON PRE ENTREGA": "✨", "BLOQUEADO": "🔒", "ENTREGADO": "✅", 
+                "RESERVADO": "🔖", "DISPONIBLE": "🟢"
+            }
+
+            for estado, cant in facetas.conteos_por_estado(tabla, filtro_admin).items():
+                if cant > 0:
+                    icon = iconos_stock.get(estado, "🚗")
+                    stock_buttons.append({
+                        "label": f"{icon} {estado.title()} ({cant})",
+                        "key": f"btn_st_doc_{estado}",
+                        "filter_val": estado,
+                        "count": cant
+                    })
+
+        if stock_buttons:
+            cols_s = st.columns(4)
+            for idx, btn_data in enumerate(stock_buttons):
+                col_to_use = cols_s[idx % 4]
+                with col_to_use:
+                    is_active = False
+                    if st.session_state.filtro_doc_stock is None and btn_data["filter_val"] is None: is_active = True
+                    elif st.session_state.filtro_doc_stock and btn_data["filter_val"]:
+                        if str(st.session_state.filtro_doc_stock).upper() == str(btn_data["filter_val"]).upper(): is_active = True
+                    
+                    btn_type = "primary" if is_active else "secondary"
+                    if st.button(btn_data["label"], use_container_width=True, key=btn_data["key"], type=btn_type):
+                        st.session_state.filtro_doc_stock = btn_data["filter_val"]
+
+        # --- APLICACIÓN FINAL DE FILTROS A LA TABLA ---
+        st.divider()
+        # Los botones pueden haber cambiado los filtros en esta misma ejecución
+        filtro_stock = st.session_state.filtro_doc_stock if "ESTADO" in df_doc.columns else None
+        if filtro_admin == FILTRO_OK_STOCK:
+            st.info("Filtro: **Ok Documentación (Unidades en Stock/Pendientes)**")
+        elif filtro_admin == FILTRO_OK_ENTREGADO:
+            st.info("Filtro: **Ok Documentación (Unidades ya Entregadas)**")
+        if filtro_admin or filtro_stock:
+            df_doc = df_doc.filtrar_global(facetas.mascara(filtro_admin, filtro_stock))
+
+        # TABLA RESULTANTE
+        st.markdown(f"### 🔍 Resultados: {len(df_doc)} vehículos")
+        
+        cols_solicitadas = ["FECHA DE FACTURACION DE LA UNIDAD", "VIN", "CLIENTE", "MARCA", "ESTADO DE ADMINISTRATIVO", "ESTADO ADMINISTRATIVO", "MODELO", "UBICACION", "ESTADO", "DETALLE DEL ESTADO Y FECHA DE DISPONIBILIDAD DE UNIDAD", "ACCESORIOS", "FECHA QUE EL GESTOR RETIRA DOC", "FECHA PREVISTA DE ENTREGA", "FECHA DISPONIBILIDAD PAPELES"]
+        cols_reales = [c for c in cols_solicitadas if c in df_doc.columns]
+        
+        if not df_doc.empty:
+            mostrar_tabla(df_doc, cols_reales, "pagina_doc", column_config={"FECHA DE FACTURACION DE LA UNIDAD": st.column_config.DateColumn("F. Factura", format="DD/MM/YYYY")})
+        else:
+            st.warning("No hay vehículos que cumplan con AMBOS criterios.")
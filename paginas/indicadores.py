@@ -0,0 +1,102 @@
+"""5. Indicadores: entregas y antigüedad del stock desde los cubos agregados, e historial de estados."""
+import datetime
+
+import plotly.express as px
+import streamlit as st
+
+from paginas.comun import obtener_historial
+from tablero.cubos import SIN_DATO, TRAMOS_ANTIGUEDAD, Cubos
+from tablero.metricas import tramo
+
+
+@st.cache_resource
+def obtener_cubos():
+    # Un solo juego de cubos por proceso; se actualiza con cada instantánea nueva
+    return Cubos()
+
+
+def mostrar(snap, esquema, memo):
+    df = snap.df
+    st.title("📈 Indicadores de Entregas y Stock")
+    with tramo("indice.cubos"):
+        cubos = obtener_cubos().actualizar(snap.version, df, snap.huellas)
+    if df.empty or (cubos.entregas.empty and cubos.antiguedad.empty):
+        st.info("No hay fechas de entrega ni de arribo para graficar.")
+    else:
+        años = sorted(set(cubos.entregas["AÑO"]) | set(cubos.antiguedad["AÑO"]))
+        if len(años) > 1:
+            año_desde, año_hasta = st.sidebar.select_slider("Años", options=años, value=(años[max(0, len(años) - 2)], años[-1]))
+        else:
+            año_desde = año_hasta = años[0]
+        marcas = st.sidebar.multiselect("Marca", sorted(set(cubos.entregas["MARCA"].astype(str)) | set(cubos.antiguedad["MARCA"].astype(str))))
+        abrir_por = st.sidebar.selectbox("Entregas por", ["MARCA", "VENDEDOR", "CANAL DE VENTA", "ESTADO"])
+
+        def recortar(cubo):
+            cubo = cubo[(cubo["AÑO"] >= año_desde) & (cubo["AÑO"] <= año_hasta)]
+            if marcas: cubo = cubo[cubo["MARCA"].isin(marcas)]
+            return cubo
+
+        def graficos():
+            entregas = recortar(cubos.entregas_vendedor if abrir_por == "VENDEDOR" else cubos.entregas)
+            stock = recortar(cubos.antiguedad)
+            stock = stock[stock["ESTADO"] != "ENTREGADO"]
+            con_dias = stock[stock["TRAMO"] != SIN_DATO]
+            totales = (int(entregas["ENTREGAS"].sum()), int(stock["UNIDADES"].sum()),
+                       con_dias["DIAS"].sum() / con_dias["UNIDADES"].sum() if con_dias["UNIDADES"].sum() else None)
+
+            mensual = entregas.groupby(["AÑO", "MES", abrir_por], observed=True)["ENTREGAS"].sum().reset_index()
+            mensual["PERÍODO"] = mensual["AÑO"].astype(str) + "-" + mensual["MES"].astype(str).str.zfill(2)
+            orden_tramos = {"TRAMO": list(TRAMOS_ANTIGUEDAD)}
+            por_arribo = stock.groupby(["AÑO", "MES", "TRAMO"], observed=True)["UNIDADES"].sum().reset_index()
+            por_arribo["ARRIBO"] = por_arribo["AÑO"].astype(str) + "-" + por_arribo["MES"].astype(str).str.zfill(2)
+            por_marca = stock.groupby(["MARCA", "TRAMO"], observed=True)["UNIDADES"].sum().reset_index()
+            # Como dict: la misma figura la dibujan todas las sesiones sin poder modificarla
+            figuras = (
+                px.bar(mensual, x="PERÍODO", y="ENTREGAS", color=abrir_por).to_dict(),
+                px.bar(por_arribo, x="ARRIBO", y="UNIDADES", color="TRAMO", category_orders=orden_tramos).to_dict(),
+                px.bar(por_marca, x="MARCA", y="UNIDADES", color="TRAMO", category_orders=orden_tramos).to_dict(),
+            )
+            return totales, figuras
+
+        with tramo("indicadores.graficos"):
+            (total_entregas, total_stock, promedio_dias), (fig_mensual, fig_arribo, fig_marca) = memo.obtener(
+                cubos.version, "indicadores", (año_desde, año_hasta, tuple(marcas), abrir_por), graficos)
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Entregas en el período", f"{total_entregas:,}".replace(",", "."))
+        m2.metric("Unidades en stock (arribadas en el período)", f"{total_stock:,}".replace(",", "."))
+        if promedio_dias is not None: m3.metric("Antigüedad promedio", f"{promedio_dias:.0f} días")
+        st.subheader(f"🚚 Entregas por mes y {abrir_por.lower()}")
+        st.plotly_chart(fig_mensual, use_container_width=True)
+        st.subheader("⏳ Antigüedad del stock por mes de arribo")
+        st.plotly_chart(fig_arribo, use_container_width=True)
+        st.subheader("🏷️ Antigüedad del stock por marca")
+        st.plotly_chart(fig_marca, use_container_width=True)
+        st.caption(f"Cubos de la versión {cubos.version}: {cubos.reprocesadas} de {cubos.filas} filas recodificadas en la última actualización.")
+
+    # --- Historial de estados: sólo los cambios entre instantáneas, no las instantáneas ---
+    historial = obtener_historial()
+    st.divider()
+    st.subheader("🕓 Historial de estados")
+    if not historial.cambios:
+        st.info("Todavía no hay cambios de estado registrados.")
+    else:
+        campo = st.radio("Campo", ["ESTADO", "ADMINISTRATIVO"], horizontal=True, key="historial_campo")
+        with tramo("historial.permanencias"):
+            permanencias = memo.obtener(snap.version, "historial", (historial.cambios, campo), lambda: historial.permanencias(campo))
+        st.markdown("**⏱️ Días en cada estado** (sólo los ya cerrados)")
+        st.dataframe(permanencias, use_container_width=True, hide_index=True)
+
+        h1, h2 = st.columns(2)
+        with h1:
+            estado = st.selectbox("Unidades en el estado", historial.estados(campo), key="historial_estado")
+            semana = st.date_input("Durante la semana del", datetime.date.today(), key="historial_semana")
+            lunes = semana - datetime.timedelta(days=semana.weekday())
+            if estado:
+                st.metric(f"En {estado} ({lunes:%d/%m} al {lunes + datetime.timedelta(days=6):%d/%m})",
+                          historial.contar_en(estado, lunes, lunes + datetime.timedelta(days=7), campo))
+        with h2:
+            vin = st.text_input("Historia de un VIN", key="historial_vin")
+            if vin:
+                pasos = historial.historia(vin, campo)
+                if pasos.empty: st.warning("Ese VIN no figura en el historial.")
+                else: st.dataframe(pasos, use_container_width=True, hide_index=True)
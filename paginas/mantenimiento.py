@@ -0,0 +1,53 @@
+"""3. Control Mantenimiento: controles de 30 a 540 días que vencen hoy, esta semana o están atrasados."""
+import pandas as pd
+import streamlit as st
+
+from paginas.comun import mostrar_tabla
+from tablero.mantenimiento import calcular_vencimientos, no_entregados
+from tablero.vista import Vista
+
+
+def mostrar(snap, esquema, memo):
+    df = snap.df
+    if 'filtro_mantenimiento' not in st.session_state: st.session_state.filtro_mantenimiento = 'todos'
+    st.title("🛠️ Planificación de Taller")
+    if not df.empty and "FECHA_ARRIBO_DT" in df.columns:
+        st.sidebar.header("Filtros")
+        marcas = st.sidebar.multiselect("Filtrar Marca", df["MARCA"].unique())
+        hoy = pd.Timestamp.now().normalize()
+        cols_base = ["VIN", "MARCA", "MODELO", "FECHA_ARRIBO_DT", "TAREA", "UBICACION"]
+        def vencimientos():
+            df_mant = Vista(df).filtrar_global(no_entregados(df))
+            if marcas:
+                df_mant = df_mant.filtrar(df_mant.columna("MARCA").isin(marcas))
+            # Sólo se materializan las columnas que usa el motor y las que se muestran
+            cols_motor = cols_base + [c for c in esquema.controles.values() if c]
+            return calcular_vencimientos(df_mant.materializar(cols_motor), esquema.controles, hoy)
+        df_hoy, df_semana, df_atrasados = memo.obtener(snap.version, "mantenimiento", (tuple(marcas), hoy), vencimientos)
+        
+        c1, c2, c3 = st.columns(3)
+        t_hoy = "primary" if st.session_state.filtro_mantenimiento == 'hoy' else "secondary"
+        t_sem = "primary" if st.session_state.filtro_mantenimiento == 'semana' else "secondary"
+        t_tod = "primary" if st.session_state.filtro_mantenimiento == 'todos' else "secondary"
+
+        if c1.button(f"📅 Vence HOY ({len(df_hoy)})", use_container_width=True, type=t_hoy): st.session_state.filtro_mantenimiento = 'hoy'
+        if c2.button(f"📆 Vence Esta Semana ({len(df_semana)})", use_container_width=True, type=t_sem): st.session_state.filtro_mantenimiento = 'semana'
+        if c3.button(f"🚨 Todo Pendiente ({len(df_atrasados)})", use_container_width=True, type=t_tod): st.session_state.filtro_mantenimiento = 'todos'
+        st.divider()
+        
+        df_final = pd.DataFrame()
+        if st.session_state.filtro_mantenimiento == 'hoy':
+            df_final = df_hoy; titulo = "🚗 Vehículos que vencen HOY"
+        elif st.session_state.filtro_mantenimiento == 'semana':
+            df_final = df_semana; titulo = "🗓️ Planificación Semanal"
+        else:
+            df_final = df_atrasados; titulo = "⚠️ Listado de Atrasados / Pendientes"
+        
+        if not df_final.empty:
+            st.subheader(titulo)
+            mostrar_tabla(Vista(df_final), cols_base, "pagina_mantenimiento", column_config={"FECHA_ARRIBO_DT": st.column_config.DateColumn("Fecha Arribo", format="DD/MM/YYYY")})
+        else:
+            if st.session_state.filtro_mantenimiento != 'todos': st.success("✅ ¡Nada pendiente!")
+            else: st.success("✅ ¡Felicitaciones! No hay mantenimientos atrasados.")
+    else:
+        st.warning("No se encontraron datos.")
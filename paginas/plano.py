@@ -0,0 +1,18 @@
+"""6. Plano del Salón."""
+import streamlit as st
+
+from paginas.comun import imagen
+
+
+def mostrar(snap, esquema, memo):
+    st.title("🗺️ Distribución del Salón")
+    tab_peugeot, tab_citroen = st.tabs(["🦁 Peugeot", "🔴 Citroën"])
+    # Los mapas se buscan y se leen una vez por proceso
+    with tab_peugeot:
+        mapa = imagen("mapa_peugeot.jpg", "Peugeot (2).jpeg")
+        if mapa is not None: st.image(mapa, use_container_width=True)
+        else: st.warning("Sube 'mapa_peugeot.jpg'")
+    with tab_citroen:
+        mapa = imagen("mapa_citroen.jpg", "Citroen.jpeg")
+        if mapa is not None: st.image(mapa, use_container_width=True)
+        else: st.warning("Sube 'mapa_citroen.jpg'")
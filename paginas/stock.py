@@ -0,0 +1,55 @@
+"""2. Control de Stock: inventario por estado, año de arribo y marca."""
+import streamlit as st
+
+from paginas.comun import mostrar_tabla
+from tablero.vista import Vista
+
+
+def mostrar(snap, esquema, memo):
+    df = snap.df
+    if 'filtro_estado_stock' not in st.session_state: st.session_state.filtro_estado_stock = None
+    st.title("📦 Tablero de Stock")
+    df_stock = Vista(df)
+    if not df_stock.empty:
+        st.sidebar.header("Filtros Stock")
+        año_sel = None
+        if "AÑO_ARRIBO" in df_stock.columns:
+            if st.sidebar.checkbox("Filtrar Arribo"):
+                años_arr = memo.obtener(snap.version, "stock", ("años",), lambda: sorted(df["AÑO_ARRIBO"].dropna().unique().astype(int)))
+                if años_arr:
+                    año_sel = st.sidebar.selectbox("Año Arribo", años_arr, index=len(años_arr)-1)
+                    df_stock = memo.obtener(snap.version, "stock", ("arribo", año_sel), lambda: df_stock.filtrar(df_stock.columna("AÑO_ARRIBO") == año_sel))
+        if "MARCA" in df_stock.columns:
+            marcas_stock = memo.obtener(snap.version, "stock", ("marcas", año_sel), lambda: df_stock.columna("MARCA").unique())
+            marcas = st.sidebar.multiselect("Marca", marcas_stock, default=marcas_stock)
+            df_stock = memo.obtener(snap.version, "stock", ("arribo_marca", año_sel, tuple(marcas)), lambda: df_stock.filtrar(df_stock.columna("MARCA").isin(marcas)))
+
+        st.markdown("### 🔍 Estado del Inventario")
+        if "ESTADO" in df_stock.columns:
+            def contar_estados():
+                conteo = df_stock.columna("ESTADO").value_counts()
+                return conteo[conteo > 0]  # las categorías sin filas también aparecen
+            conteo = memo.obtener(snap.version, "stock", ("conteo", año_sel, tuple(marcas) if "MARCA" in df.columns else None), contar_estados)
+            iconos = {"EN EXHIBICIÓN": "🏢", "EN EXHIBICION": "🏢", "SIN PRE ENTREGA": "🛠️", "CON PRE ENTREGA": "✨", "BLOQUEADO": "🔒", "ENTREGADO": "✅", "RESERVADO": "🔖"}
+            cols = st.columns(len(conteo) + 1)
+            with cols[0]:
+                type_todos = "primary" if st.session_state.filtro_estado_stock is None else "secondary"
+                if st.button(f"📋 Todos ({len(df_stock)})", use_container_width=True, key="btn_stock_todos", type=type_todos):
+                    st.session_state.filtro_estado_stock = None
+            for i, (estado, cantidad) in enumerate(conteo.items()):
+                icono = iconos.get(str(estado).upper(), "🚗")
+                col_destino = cols[i+1] if (i+1) < len(cols) else cols[-1]
+                with col_destino:
+                    type_btn = "primary" if st.session_state.filtro_estado_stock == estado else "secondary"
+                    if st.button(f"{icono} {estado} ({cantidad})", use_container_width=True, key=f"btn_stock_{i}", type=type_btn):
+                        st.session_state.filtro_estado_stock = estado
+            if st.session_state.filtro_estado_stock:
+                df_mostrar = df_stock.filtrar(df_stock.columna("ESTADO") == st.session_state.filtro_estado_stock)
+                st.info(f"Filtro activo: **{st.session_state.filtro_estado_stock}**")
+            else:
+                df_mostrar = df_stock
+        else:
+            df_mostrar = df_stock
+        st.markdown("---")
+        cols_stock = ["VIN", "MARCA", "MODELO", "DESCRIPCION COLOR", "FECHA DE FABRICACION", "ANTIGUEDAD DE STOCK", "ANTIGÜEDAD DE STOCK", "UBICACION", "DETALLE DEL ESTADO Y FECHA DE DISPONIBILIDAD DE UNIDAD", "ESTADO"]
+        mostrar_tabla(df_mostrar, cols_stock, "pagina_stock")
@@ -0,0 +1 @@
+"""Lógica de datos del tablero de entregas, independiente de la interfaz Streamlit."""
@@ -0,0 +1,157 @@
+"""Índice por fecha de entrega para "Planificación Entregas".
+
+Las filas con fecha se ordenan una vez por instantánea por (fecha, hora de
+entrega), en el mismo orden que daba `sort_values`. Año, mes, día y "desde hoy"
+son rangos contiguos de ese orden que se encuentran con `searchsorted`, así que
+las vistas que devuelve ya salen ordenadas. El calendario pide sólo la
+ventana visible (mes o semana) y arma los eventos de esas filas.
+"""
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from tablero.vista import Vista
+
+COL_FECHA = "FECHA_ENTREGA_DT"
+COL_HORA = "HS DE ENTREGA AL CLIENTE"
+# Con más entregas que esto en la ventana, el calendario muestra un total por día
+MAX_EVENTOS = 1500
+COLORES_MARCA = ("#1f77b4", "#d62728", "#2ca02c", "#ff7f0e", "#9467bd", "#8c564b", "#e377c2", "#17becf")
+
+
+def _hora_minuto(valor):
+    """(hora, minuto) a partir de "10:30", "9.30", "10 hs"...; None si no hay una hora válida."""
+    m = re.search(r"(\d{1,2})(?:\s*[:.]\s*(\d{2}))?", str(valor))
+    if not m: return None
+    hora, minuto = int(m.group(1)), int(m.group(2) or 0)
+    return (hora, minuto) if hora < 24 and minuto < 60 else None
+
+
+def _hora(valor):
+    hm = _hora_minuto(valor)
+    return f"{hm[0]:02d}:{hm[1]:02d}:00" if hm else None
+
+
+def minutos_del_dia(serie):
+    """Minutos desde medianoche de cada hora de entrega (NaN si no se reconoce); se interpreta cada valor distinto una vez."""
+    codigos, unicos = pd.factorize(serie)
+    por_valor = np.array([h * 60 + m if (h, m) != (-1, -1) else np.nan
+                          for h, m in ((_hora_minuto(v) or (-1, -1)) for v in unicos)] + [np.nan])
+    return por_valor[codigos]
+
+
+def _color(marca):
+    # Estable entre ventanas y procesos (hash() cambia con cada proceso)
+    return COLORES_MARCA[zlib.crc32(str(marca).encode()) % len(COLORES_MARCA)]
+
+
+def _texto(valor):
+    return "" if pd.isna(valor) else str(valor)
+
+
+def ventana_calendario(fecha, vista):
+    """[desde, hasta) visible en el calendario: la semana de `fecha` o la grilla de 6 semanas de su mes (de lunes)."""
+    dia = np.datetime64(fecha, "D")
+    if vista == "Semana":
+        inicio, dias = dia, 7
+    else:
+        inicio, dias = dia.astype("datetime64[M]").astype("datetime64[D]"), 42
+    # 1970-01-01 fue jueves: corrimiento hasta el lunes anterior
+    inicio = inicio - (inicio.astype(np.int64) + 3) % 7
+    return inicio, inicio + dias
+
+
+class IndiceAgenda:
+    def __init__(self, df):
+        self.df = df
+        self.filas = np.array([], dtype=np.intp)
+        self.fechas = np.array([], dtype="datetime64[ns]")
+        if COL_FECHA in df.columns:
+            por = [COL_FECHA] + ([COL_HORA] if COL_HORA in df.columns else [])
+            claves = df[por].reset_index(drop=True)
+            claves = claves[claves[COL_FECHA].notna()]
+            self.filas = claves.sort_values(por, kind="stable").index.to_numpy()
+            self.fechas = df[COL_FECHA].to_numpy(dtype="datetime64[ns]")[self.filas]
+
+    def _rango(self, *limites):
+        """(i, j) en el orden por fecha para [desde, hasta) de cada par de límites (None = abierto)."""
+        i, j = 0, len(self.fechas)
+        for desde, hasta in zip(limites[::2], limites[1::2]):
+            if desde is not None: i = max(i, int(np.searchsorted(self.fechas, np.datetime64(desde, "ns"))))
+            if hasta is not None: j = min(j, int(np.searchsorted(self.fechas, np.datetime64(hasta, "ns"))))
+        return i, max(i, j)
+
+    def _vista(self, i, j):
+        return Vista(self.df, self.filas[i:j])
+
+    def _limites_año(self, año):
+        return np.datetime64(f"{año:04d}", "Y"), np.datetime64(f"{año + 1:04d}", "Y")
+
+    def años(self):
+        return (np.unique(self.fechas.astype("datetime64[Y]")).astype(int) + 1970).tolist()
+
+    def año(self, año, desde=None, hasta=None):
+        """Entregas del año; `desde`/`hasta` recortan además el rango (p. ej. a partir de hoy)."""
+        return self._vista(*self._rango(*self._limites_año(año), desde, hasta))
+
+    def meses(self, año):
+        """[(nombre, número)] de los meses con entregas en el año, en orden."""
+        i, j = self._rango(*self._limites_año(año))
+        meses = self.fechas[i:j].astype("datetime64[M]")
+        if not len(meses): return []
+        cambios = i + np.flatnonzero(np.r_[True, meses[1:] != meses[:-1]])
+        numeros = (meses[cambios - i].astype(int) % 12 + 1).tolist()
+        if "MES_ENTREGA" not in self.df.columns: return [(n, n) for n in numeros]
+        return list(zip(self.df["MES_ENTREGA"].iloc[self.filas[cambios]], numeros))
+
+    def mes(self, año, mes):
+        inicio = np.datetime64(f"{año:04d}-{mes:02d}", "M")
+        return self._vista(*self._rango(inicio, inicio + 1))
+
+    def dia(self, fecha):
+        inicio = np.datetime64(fecha, "D")
+        return self._vista(*self._rango(inicio, inicio + 1))
+
+    def rango(self, desde, hasta):
+        """Entregas con fecha en [desde, hasta), ya ordenadas por fecha y hora."""
+        return self._vista(*self._rango(desde, hasta))
+
+    def eventos(self, desde, hasta, max_eventos=MAX_EVENTOS):
+        """Eventos de FullCalendar (streamlit-calendar) para la ventana [desde, hasta).
+
+        Con más de `max_eventos` entregas en la ventana se devuelve un evento por
+        día con la cantidad, para no mandar miles de eventos al navegador.
+        """
+        i, j = self._rango(desde, hasta)
+        dias = np.datetime_as_string(self.fechas[i:j], unit="D")
+        if j - i > max_eventos:
+            unicos, cantidades = np.unique(dias, return_counts=True)
+            return [{"title": f"{c} entregas", "start": d, "allDay": True} for d, c in zip(unicos.tolist(), cantidades.tolist())]
+
+        filas = self._vista(i, j).materializar([COL_HORA, "CLIENTE", "MARCA", "MODELO", "VIN", "VENDEDOR"])
+        def col(nombre):
+            return filas[nombre].tolist() if nombre in filas.columns else [None] * len(filas)
+        horas = [None] * len(filas)
+        if COL_HORA in filas.columns:
+            # La hora se interpreta una vez por valor distinto (hay pocas); -1 (vacío) cae en el None final
+            codigos, unicos = pd.factorize(filas[COL_HORA])
+            por_valor = [_hora(v) for v in unicos] + [None]
+            horas = [por_valor[c] for c in codigos.tolist()]
+        eventos = []
+        for dia, hora, cliente, marca, modelo, vin, vendedor in zip(
+                dias.tolist(), horas, col("CLIENTE"), col("MARCA"), col("MODELO"), col("VIN"), col("VENDEDOR")):
+            eventos.append({
+                "title": " · ".join(t for t in (_texto(cliente), f"{_texto(marca)} {_texto(modelo)}".strip()) if t) or _texto(vin),
+                "start": f"{dia}T{hora}" if hora else dia,
+                "allDay": hora is None,
+                "color": _color(marca),
+                "extendedProps": {"vin": _texto(vin), "vendedor": _texto(vendedor)},
+            })
+        return eventos
+
+    def extremos(self, vista):
+        """(primera, última) fecha de una vista no vacía que salió de este índice."""
+        fechas = self.df[COL_FECHA].iloc[vista.posiciones()[[0, -1]]]
+        return fechas.iloc[0], fechas.iloc[1]
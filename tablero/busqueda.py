@@ -0,0 +1,144 @@
+"""Índice invertido de trigramas para el buscador de "Estado Documentación".
+
+Se construye una vez por instantánea sobre los valores distintos de cada columna
+de texto (normalizados sin acentos y en mayúsculas), de modo que cada consulta
+sólo toca las listas de trigramas y un puñado de candidatos.
+"""
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from tablero.esquema import COLUMNAS_DERIVADAS
+
+
+def normalizar(texto):
+    texto = str(texto)
+    if not texto.isascii():
+        texto = "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+    return texto.upper()
+
+
+def columnas_texto(df):
+    return [c for c in df.columns if c not in COLUMNAS_DERIVADAS and not pd.api.types.is_datetime64_any_dtype(df[c])]
+
+
+def _clave(a, b, c):
+    # Tres code points (< 2**21) empaquetados en un entero de 63 bits
+    return (a.astype(np.uint64) << np.uint64(42)) | (b.astype(np.uint64) << np.uint64(21)) | c.astype(np.uint64)
+
+
+def _trigramas(texto):
+    cp = np.frombuffer(texto.encode("utf-32-le"), dtype=np.uint32)
+    return np.unique(_clave(cp[:-2], cp[1:-1], cp[2:]))
+
+
+# Con más candidatos que esto conviene marcar filas columna por columna en vez de recorrer valores
+_UMBRAL_VECTORIAL = 2000
+# Cantidad de candidatos a partir de la cual ya no vale la pena seguir intersectando trigramas
+_UMBRAL_VERIFICACION = 64
+
+
+class IndiceBusqueda:
+    def __init__(self, df, columnas=None):
+        self.columnas = list(columnas) if columnas is not None else columnas_texto(df)
+        self.n_filas = len(df)
+
+        # Vocabulario: valores distintos de todas las columnas, con su columna de origen
+        textos, col_de_valor, bases = [], [], [0]
+        self._codigos, self._filas_por_valor = [], []
+        for i, col in enumerate(self.columnas):
+            codigos, unicos = pd.factorize(df[col])
+            textos.extend(normalizar(v) for v in np.asarray(unicos, dtype=object))
+            col_de_valor.append(np.full(len(unicos), i))
+            bases.append(bases[-1] + len(unicos))
+            # Código global de valor por fila (-1 = vacío) y filas de cada valor en formato CSR
+            self._codigos.append(np.where(codigos >= 0, codigos + bases[-2], -1).astype(np.int32))
+            orden = np.argsort(codigos, kind="stable")
+            inicio = np.searchsorted(codigos[orden], np.arange(len(unicos) + 1))
+            self._filas_por_valor.append((orden, inicio))
+        self._textos = np.array(textos, dtype=object)
+        self._col_de_valor = np.concatenate(col_de_valor) if col_de_valor else np.array([], dtype=int)
+        self._base_col = np.array(bases)
+        self._construir_trigramas(textos)
+
+    def _construir_trigramas(self, textos):
+        # Cada valor termina en dos centinelas \x01 para que toda subcadena de 1 o 2
+        # caracteres sea el comienzo de algún trigrama; \x00 separa valores.
+        largos = np.fromiter((len(t) for t in textos), dtype=np.int64, count=len(textos))
+        cp = np.frombuffer("".join(t + "\x01\x01\x00" for t in textos).encode("utf-32-le"), dtype=np.uint32)
+        duenio = np.repeat(np.arange(len(textos)), largos + 3)
+        validas = (cp[:-2] != 0) & (cp[1:-1] != 0) & (cp[2:] != 0)
+        claves = _clave(cp[:-2], cp[1:-1], cp[2:])[validas]
+        duenio = duenio[:-2][validas]
+        # duenio ya viene creciente: un orden estable por clave deja cada posteo ordenado
+        orden = np.argsort(claves, kind="stable")
+        claves, duenio = claves[orden], duenio[orden]
+        unico = np.ones(len(claves), dtype=bool)
+        unico[1:] = (claves[1:] != claves[:-1]) | (duenio[1:] != duenio[:-1])
+        claves, duenio = claves[unico], duenio[unico]
+        cambios = np.flatnonzero(np.r_[True, claves[1:] != claves[:-1]])
+        self._claves = claves[cambios]
+        self._inicio_posteo = np.r_[cambios, len(claves)]
+        self._posteos = duenio
+
+    def _candidatos(self, consulta):
+        """Valores del vocabulario que pueden contener la consulta y si el resultado ya es exacto."""
+        cp = np.frombuffer(consulta.encode("utf-32-le"), dtype=np.uint32)
+        if len(cp) < 3:
+            # Todos los trigramas que empiezan con la consulta forman un rango contiguo de claves
+            desde = _clave(cp[:1], cp[1:2] if len(cp) == 2 else np.zeros(1, np.uint32), np.zeros(1, np.uint32))[0]
+            hasta = desde + (np.uint64(1) << np.uint64(21 if len(cp) == 2 else 42))
+            i, j = np.searchsorted(self._claves, [desde, hasta])
+            marcados = np.zeros(len(self._textos), dtype=bool)
+            marcados[self._posteos[self._inicio_posteo[i]:self._inicio_posteo[j]]] = True
+            return np.flatnonzero(marcados), True
+
+        posteos = []
+        for clave in _trigramas(consulta):
+            i = np.searchsorted(self._claves, clave)
+            if i == len(self._claves) or self._claves[i] != clave:
+                return np.array([], dtype=int), True
+            posteos.append(self._posteos[self._inicio_posteo[i]:self._inicio_posteo[i + 1]])
+        posteos.sort(key=len)
+        resultado = posteos[0]
+        for posteo in posteos[1:]:
+            if len(resultado) <= _UMBRAL_VERIFICACION: break
+            resultado = np.intersect1d(resultado, posteo, assume_unique=True)
+        return resultado, len(cp) == 3
+
+    def buscar(self, consulta, columnas=None, prefijo=False):
+        """Posiciones de fila (ordenadas) cuyo valor en alguna columna contiene `consulta`.
+
+        Con `prefijo=True` el valor debe empezar por la consulta en alguna de sus palabras.
+        """
+        return np.flatnonzero(self.mascara(consulta, columnas, prefijo))
+
+    def mascara(self, consulta, columnas=None, prefijo=False):
+        consulta = normalizar(consulta).strip()
+        if not consulta:
+            return np.ones(self.n_filas, dtype=bool)
+        candidatos, exacto = self._candidatos(consulta)
+        if columnas is not None:
+            permitidas = [self.columnas.index(c) for c in columnas if c in self.columnas]
+            candidatos = candidatos[np.isin(self._col_de_valor[candidatos], permitidas)]
+        if prefijo:
+            con_espacio = " " + consulta
+            ok = [t.startswith(consulta) or con_espacio in t for t in self._textos[candidatos]]
+            candidatos = candidatos[np.array(ok, dtype=bool)]
+        elif not exacto:
+            candidatos = candidatos[np.array([consulta in t for t in self._textos[candidatos]], dtype=bool)]
+
+        m = np.zeros(self.n_filas, dtype=bool)
+        if len(candidatos) > _UMBRAL_VECTORIAL:
+            coincide = np.zeros(len(self._textos) + 1, dtype=bool)
+            coincide[candidatos] = True  # la última posición (índice -1) queda False para celdas vacías
+            for col in np.unique(self._col_de_valor[candidatos]):
+                m |= coincide[self._codigos[col]]
+        else:
+            for v in candidatos:
+                col = self._col_de_valor[v]
+                orden, inicio = self._filas_por_valor[col]
+                local = v - self._base_col[col]
+                m[orden[inicio[local]:inicio[local + 1]]] = True
+        return m
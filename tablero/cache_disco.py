@@ -0,0 +1,106 @@
+"""Instantánea procesada persistida en disco (Arrow IPC/Feather sin compresión).
+
+Permite que un proceso nuevo sirva datos en milisegundos mapeando el archivo
+en memoria, mientras el refresco reconcilia con la planilla en segundo plano.
+"""
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from tablero.metricas import tramo
+
+# Subir este número cuando cambien las columnas derivadas o sus tipos
+VERSION_ESQUEMA = 3
+
+log = logging.getLogger(__name__)
+
+_CLAVE_META = b"tablero"
+_COL_HASH = "__HASH_FILA__"
+
+
+def _sin_nulos(valores):
+    """Columna numérica o de fechas con NaN/NaT guardados como valores en lugar de nulos de Arrow.
+
+    Con nulos, to_pandas tiene que copiar la columna para rellenarlos; sin ellos la
+    columna de pandas es una vista sobre el archivo mapeado y los procesos que lo
+    leen comparten esas páginas en lugar de tener una copia cada uno.
+    """
+    tipo = pa.from_numpy_dtype(valores.dtype)
+    if valores.dtype.kind == "f": return pa.array(valores, type=tipo, from_pandas=False)
+    return pa.Array.from_buffers(tipo, len(valores), [None, pa.py_buffer(np.ascontiguousarray(valores).view("i8"))])
+
+
+class CacheDisco:
+    def __init__(self, ruta, origen):
+        self.ruta = ruta
+        self.origen = origen
+
+    def guardar(self, df, estado):
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+        for i, col in enumerate(df.columns):
+            if tabla.column(i).null_count and isinstance(df[col].dtype, np.dtype) and df[col].dtype.kind in "fmM":
+                tabla = tabla.set_column(i, tabla.field(i), _sin_nulos(df[col].to_numpy()))
+        if estado.get("hashes") is not None:
+            tabla = tabla.append_column(_COL_HASH, pa.array(estado["hashes"]))
+        meta = {k: v for k, v in estado.items() if k != "hashes"}
+        meta.update(version_esquema=VERSION_ESQUEMA, origen=self.origen)
+        tabla = tabla.replace_schema_metadata({**(tabla.schema.metadata or {}), _CLAVE_META: json.dumps(meta)})
+
+        # Escritura atómica: los lectores ven el archivo viejo o el nuevo, nunca uno a medias
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+        temporal = f"{self.ruta}.{os.getpid()}.tmp"
+        # Un solo lote de filas: con varios, cada columna se concatena (se copia) al leerla
+        feather.write_feather(tabla.combine_chunks(), temporal, compression="uncompressed", chunksize=max(len(df), 1))
+        os.replace(temporal, self.ruta)
+
+    def cargar(self):
+        """Devuelve (df, estado) o None si no hay caché válida para este origen y esquema."""
+        if not os.path.exists(self.ruta):
+            return None
+        tabla = feather.read_table(self.ruta, memory_map=True)
+        meta = json.loads((tabla.schema.metadata or {}).get(_CLAVE_META, b"{}"))
+        if meta.get("version_esquema") != VERSION_ESQUEMA or meta.get("origen") != self.origen:
+            return None
+        estado = dict(meta, hashes=None)
+        if _COL_HASH in tabla.column_names:
+            estado["hashes"] = tabla.column(_COL_HASH).to_numpy()
+            tabla = tabla.drop_columns([_COL_HASH])
+        # Sin nulos de Arrow, números y fechas quedan como vistas sobre el archivo mapeado (ver _sin_nulos);
+        # el texto también, porque con pandas >= 3 las columnas str siguen siendo arrays de Arrow
+        return tabla.to_pandas(split_blocks=True), estado
+
+
+class FuentePersistente:
+    """Envuelve una IngestaIncremental: la restaura desde disco y guarda cada frame nuevo."""
+
+    def __init__(self, ingesta, cache):
+        self.ingesta = ingesta
+        self.cache = cache
+
+    def cargar_cache(self):
+        """(df, momento en que se guardó) o None."""
+        with tramo("cache.cargar"):
+            guardado = self.cache.cargar()
+        if guardado is None: return None
+        df, estado = guardado
+        self.ingesta.restaurar(df, estado)
+        return df, estado.get("guardado")
+
+    def huellas(self):
+        return self.ingesta.huellas()
+
+    def actualizar(self):
+        previo = self.ingesta.df
+        df = self.ingesta.actualizar()
+        if df is not None and df is not previo:
+            try:
+                with tramo("cache.guardar"):
+                    self.cache.guardar(df, dict(self.ingesta.estado(), guardado=time.time()))
+            except Exception:
+                log.warning("No se pudo guardar la caché en disco", exc_info=True)
+        return df
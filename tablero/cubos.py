@@ -0,0 +1,216 @@
+"""Cubos de indicadores: entregas por mes y antigüedad del stock, ya agregados.
+
+Cada fila se codifica una sola vez (año/mes, marca, canal, vendedor, estado,
+tramo de antigüedad) y los cubos salen de agrupar esos códigos enteros. Cuando
+llega una instantánea nueva, las filas cuya huella (hash de la línea del CSV, ver
+tablero.ingesta) ya estaba reutilizan sus códigos y sólo se codifican las nuevas
+o modificadas; a las celdas de cada cubo se les restan las filas que ya no están
+y se les suman las nuevas, sin volver a recorrer el resto. Los gráficos leen sólo
+los cubos, nunca el frame por fila.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from tablero.metricas import tramo
+
+SIN_DATO = "(sin dato)"
+DIMENSIONES = ("MARCA", "CANAL DE VENTA", "VENDEDOR", "ESTADO")
+COLS_ANTIGUEDAD = ("ANTIGÜEDAD DE STOCK", "ANTIGUEDAD DE STOCK")
+# Límite superior (en días) de cada tramo; lo que pasa del último cae en "+360"
+BORDES_ANTIGUEDAD = (30, 60, 90, 180, 360)
+TRAMOS_ANTIGUEDAD = ("0-30", "31-60", "61-90", "91-180", "181-360", "+360", SIN_DATO)
+# Atributo -> (período, dimensiones, nombre de la cantidad, columna a sumar)
+CUBOS = {
+    "entregas": ("ENTREGA", ("MARCA", "CANAL DE VENTA", "ESTADO"), "ENTREGAS", None),
+    "entregas_vendedor": ("ENTREGA", ("MARCA", "VENDEDOR"), "ENTREGAS", None),
+    "antiguedad": ("ARRIBO", ("MARCA", "ESTADO", "TRAMO"), "UNIDADES", "DIAS"),
+}
+
+
+class _Diccionario:
+    """Valor -> código entero estable entre actualizaciones (sólo crece)."""
+
+    def __init__(self):
+        self.valores = [SIN_DATO]
+        self._codigos = {SIN_DATO: 0}
+
+    def codificar(self, serie, normalizar=None):
+        codigos, unicos = pd.factorize(serie)
+        globales = np.empty(len(unicos) + 1, dtype=np.int32)
+        globales[-1] = 0  # código -1 de factorize (vacío) -> SIN_DATO
+        for i, v in enumerate(unicos):
+            v = str(v).strip()
+            if normalizar: v = normalizar(v)
+            if not v: v = SIN_DATO
+            if v not in self._codigos:
+                self._codigos[v] = len(self.valores)
+                self.valores.append(v)
+            globales[i] = self._codigos[v]
+        return globales[codigos]
+
+    def etiquetas(self, codigos):
+        return pd.Categorical.from_codes(codigos, categories=self.valores)
+
+
+def _periodo(fechas):
+    """año * 12 + mes - 1 como int32; -1 si no hay fecha."""
+    valores = fechas.to_numpy(dtype="datetime64[M]")
+    periodo = valores.astype(np.int64) + 1970 * 12
+    return np.where(np.isnat(valores), -1, periodo).astype(np.int32)
+
+
+def _dias(serie):
+    # Suele venir como número, pero a veces como texto ("120 días")
+    dias = pd.to_numeric(serie, errors="coerce")
+    if dias.isna().all() and serie.notna().any():
+        dias = pd.to_numeric(serie.astype(str).str.extract(r"(-?\d+)", expand=False), errors="coerce")
+    return dias.to_numpy(dtype=float)
+
+
+class Cubos:
+    """Cubos compartidos por proceso; `actualizar()` es idempotente por versión de instantánea."""
+
+    def __init__(self):
+        self.version = None
+        self.filas = 0
+        self.reprocesadas = 0
+        self.entregas = None
+        self.entregas_vendedor = None
+        self.antiguedad = None
+        self._dics = {d: _Diccionario() for d in DIMENSIONES}
+        self._columnas = None
+        self._huellas = None
+        self._codigos = None
+        # Por cubo: (ejes en códigos (período, *dims), cantidades, sumas) de las celdas no vacías
+        self._celdas = {}
+        self._lock = threading.Lock()
+
+    def actualizar(self, version, df, huellas=None):
+        with self._lock:
+            if self.version is not None and version <= self.version: return self
+            with tramo("cubos.codificar"):
+                codigos, agregadas, quitadas = self._recodificar(df, huellas)
+            with tramo("cubos.agrupar"):
+                for nombre, definicion in CUBOS.items():
+                    ejes, cantidades, sumas = _filas(codigos, agregadas, *definicion)
+                    if quitadas is not None:
+                        # Celdas previas + filas que entraron - filas que salieron: el costo va con
+                        # la cantidad de celdas y de filas cambiadas, no con el total de filas
+                        previas = self._celdas[nombre]
+                        q_ejes, q_cantidades, q_sumas = _filas(self._codigos, quitadas, *definicion)
+                        ejes = [np.concatenate(t) for t in zip(previas[0], ejes, q_ejes)]
+                        cantidades = np.concatenate([previas[1], cantidades, -q_cantidades])
+                        if sumas is not None: sumas = np.concatenate([previas[2], sumas, -q_sumas])
+                    self._celdas[nombre] = _agregar(ejes, cantidades, sumas)
+                    setattr(self, nombre, self._etiquetar(self._celdas[nombre], *definicion))
+            self._codigos = codigos
+            self.version = version
+            self.filas = len(df)
+            self._columnas = tuple(df.columns)
+            self._huellas = huellas
+        return self
+
+    def _recodificar(self, df, huellas):
+        """(códigos de todas las filas, filas a sumar, filas previas a restar); (códigos, None, None) = armar desde cero."""
+        n = len(df)
+        posiciones = np.full(n, -1)
+        if (huellas is not None and len(huellas) == n and self._huellas is not None
+                and self._columnas == tuple(df.columns)):
+            # Los códigos dependen sólo del contenido de la fila: una fila sin pareja
+            # se vuelve a codificar, así que emparejar es sólo un ahorro.
+            # Caso común (ediciones en el lugar y filas agregadas al final): misma posición
+            previas = self._huellas
+            m = min(n, len(previas))
+            iguales = np.flatnonzero(huellas[:m] == previas[:m])
+            posiciones[iguales] = iguales
+            resto = np.flatnonzero(posiciones < 0)
+            if len(resto) > n // 20:
+                # Filas corridas (p. ej. se borró una en el medio): se buscan por huella
+                unicas = np.flatnonzero(~pd.Index(previas).duplicated())
+                encontrados = pd.Index(previas[unicas]).get_indexer(huellas[resto])
+                posiciones[resto] = np.where(encontrados >= 0, unicas[encontrados.clip(0)], -1)
+
+        nuevas = np.flatnonzero(posiciones < 0)
+        self.reprocesadas = len(nuevas)
+        if len(nuevas) == n: return self._codificar(df), None, None
+        viejas = np.flatnonzero(posiciones >= 0)
+        codigos_nuevos = self._codificar(df[[c for c in _COLUMNAS if c in df.columns]].iloc[nuevas]) if len(nuevas) else None
+        origen = posiciones.clip(0)
+        codigos = {}
+        for clave, previo in self._codigos.items():
+            arr = previo[origen]
+            if codigos_nuevos is not None: arr[nuevas] = codigos_nuevos[clave]
+            codigos[clave] = arr
+
+        # Una fila previa se conserva si exactamente una fila nueva la reutiliza (con
+        # líneas duplicadas puede haber más de una): esa no se toca en los cubos
+        usos = np.bincount(posiciones[viejas], minlength=len(self._huellas))
+        conservadas = posiciones >= 0
+        conservadas[viejas] = usos[posiciones[viejas]] == 1
+        return codigos, np.flatnonzero(~conservadas), np.flatnonzero(usos != 1)
+
+    def _codificar(self, df):
+        n = len(df)
+        codigos = {
+            "ENTREGA": _periodo(df["FECHA_ENTREGA_DT"]) if "FECHA_ENTREGA_DT" in df.columns else np.full(n, -1, dtype=np.int32),
+            "ARRIBO": _periodo(df["FECHA_ARRIBO_DT"]) if "FECHA_ARRIBO_DT" in df.columns else np.full(n, -1, dtype=np.int32),
+        }
+        for dim in DIMENSIONES:
+            codigos[dim] = (self._dics[dim].codificar(df[dim], str.upper if dim == "ESTADO" else None)
+                            if dim in df.columns else np.zeros(n, dtype=np.int32))
+        col_dias = next((c for c in COLS_ANTIGUEDAD if c in df.columns), None)
+        dias = _dias(df[col_dias]) if col_dias else np.full(n, np.nan)
+        tramos = np.searchsorted(np.array(BORDES_ANTIGUEDAD), dias, side="left").astype(np.int8)
+        tramos[np.isnan(dias)] = len(TRAMOS_ANTIGUEDAD) - 1
+        codigos["TRAMO"] = tramos
+        codigos["DIAS"] = np.nan_to_num(dias)
+        return codigos
+
+    def _etiquetar(self, celdas, periodo, dims, nombre, sumar):
+        """Cubo (AÑO, MES, *dims) -> cantidad de filas (y suma de `sumar`) a partir de las celdas en códigos."""
+        ejes, cantidades, sumas = celdas
+        cubo = pd.DataFrame({"AÑO": ejes[0] // 12, "MES": ejes[0] % 12 + 1})
+        for d, cod in zip(dims, ejes[1:]):
+            cubo[d] = (pd.Categorical.from_codes(cod, categories=TRAMOS_ANTIGUEDAD) if d == "TRAMO"
+                       else self._dics[d].etiquetas(cod))
+        cubo[nombre] = cantidades
+        if sumar: cubo[sumar] = sumas
+        return cubo
+
+
+# Columnas que lee _codificar: al recodificar unas pocas filas no se copian las demás
+_COLUMNAS = ("FECHA_ENTREGA_DT", "FECHA_ARRIBO_DT") + DIMENSIONES + COLS_ANTIGUEDAD
+
+
+def _filas(codigos, filas, periodo, dims, nombre, sumar):
+    """Ejes (período, *dims), cantidad 1 y valor a sumar de las `filas` (None: todas) que tienen período."""
+    validas = np.flatnonzero(codigos[periodo] >= 0) if filas is None else filas[codigos[periodo][filas] >= 0]
+    ejes = [codigos[periodo][validas].astype(np.int64)] + [codigos[d][validas].astype(np.int64) for d in dims]
+    return ejes, np.ones(len(validas), dtype=np.int64), codigos[sumar][validas] if sumar else None
+
+
+def _agregar(ejes, cantidades, sumas):
+    """Suma `cantidades` (y `sumas`) por celda; devuelve sólo las celdas con cantidad > 0, en orden."""
+    ejes = list(ejes)
+    base = int(ejes[0].min()) if len(ejes[0]) else 0
+    ejes[0] = ejes[0] - base
+    tamanos = [int(e.max()) + 1 if len(e) else 1 for e in ejes]
+    # Una clave entera por celda: el cubo es un bincount (o un unique si el espacio es muy ralo)
+    clave = np.ravel_multi_index(ejes, tamanos)
+    if np.prod(tamanos) <= 4_000_000:
+        totales = np.bincount(clave, cantidades, minlength=np.prod(tamanos))
+        celdas = np.flatnonzero(totales > 0)
+        totales = totales[celdas]
+        sumas = np.bincount(clave, sumas, minlength=np.prod(tamanos))[celdas] if sumas is not None else None
+    else:
+        celdas, inversa = np.unique(clave, return_inverse=True)
+        totales = np.bincount(inversa, cantidades)
+        sumas = np.bincount(inversa, sumas) if sumas is not None else None
+        no_vacias = totales > 0
+        celdas, totales = celdas[no_vacias], totales[no_vacias]
+        if sumas is not None: sumas = sumas[no_vacias]
+    coords = list(np.unravel_index(celdas, tamanos))
+    coords[0] = coords[0] + base
+    return coords, np.rint(totales).astype(np.int64), sumas
@@ -0,0 +1,56 @@
+"""Resolución de roles de columna a partir de los encabezados de la planilla.
+
+Las heurísticas (`"ARRIBO" in c`, `"30" in c and "REALIZADO" in c`, ...) se
+evalúan una vez por firma de encabezados y el resultado queda en caché.
+"""
+import functools
+
+INTERVALOS = (30, 60, 90, 180, 360, 540)
+
+# Columnas que agrega la ingesta; se excluyen para que no confundan a las heurísticas
+COLUMNAS_DERIVADAS = (
+    "FECHA_ENTREGA_DT", "AÑO_ENTREGA", "MES_ENTREGA", "N_MES_ENTREGA", "FECHA_ARRIBO_DT", "AÑO_ARRIBO",
+    "FECHA_FACTURACION_DT", "FECHA_PAPELES_DT", "TELEFONO_CLEAN", "CORREO_CLEAN",
+)
+
+_ADMIN_DOC = ("ESTADO DE ADMINISTRATIVO", "ESTADO ADMINISTRATIVO", "DETALLE DEL ESTADO Y FECHA DE DISPONIBILIDAD DE UNIDAD")
+_REQUERIDAS = {
+    "entrega": "fecha de entrega",
+    "arribo": "fecha de arribo",
+    "estado": "ESTADO",
+    "marca": "MARCA",
+    "vin": "VIN",
+}
+
+
+class Esquema:
+    """Nombre real de la columna para cada rol (None si la planilla no la tiene)."""
+
+    def __init__(self, columnas):
+        self.columnas = columnas
+        self.entrega = next((c for c in columnas if "CONFIRMACI" in c and "ENTREGA" in c), None)
+        if not self.entrega: self.entrega = next((c for c in columnas if "FECHA" in c and "FACT" not in c), None)
+        self.arribo = next((c for c in columnas if "ARRIBO" in c), None)
+        self.facturacion = "FECHA DE FACTURACION DE LA UNIDAD" if "FECHA DE FACTURACION DE LA UNIDAD" in columnas else None
+        self.papeles = "FECHA DISPONIBILIDAD PAPELES" if "FECHA DISPONIBILIDAD PAPELES" in columnas else None
+        self.telefono = next((c for c in columnas if "TELEFONO" in c or "CELULAR" in c or "TEL" in c), None)
+        self.correo = next((c for c in columnas if "CORREO" in c or "MAIL" in c), None)
+        self.admin = next((c for c in columnas if "ESTADO" in c and "ADMIN" in c), None)
+        self.admin_doc = next((c for c in _ADMIN_DOC if c in columnas), None)
+        self.estado = "ESTADO" if "ESTADO" in columnas else None
+        self.marca = "MARCA" if "MARCA" in columnas else None
+        self.vin = "VIN" if "VIN" in columnas else None
+        self.controles = {i: next((c for c in columnas if str(i) in c and "REALIZADO" in c), None) for i in INTERVALOS}
+        self.advertencias = [f"No se encontró la columna de {nombre}" for rol, nombre in _REQUERIDAS.items() if getattr(self, rol) is None]
+        repetidas = [c for c in set(columnas) if columnas.count(c) > 1]
+        if repetidas:
+            self.advertencias.append(f"Encabezados repetidos: {', '.join(sorted(repetidas))}")
+
+
+@functools.lru_cache(maxsize=16)
+def resolver_esquema(columnas):
+    return Esquema(tuple(c for c in columnas if c not in COLUMNAS_DERIVADAS))
+
+
+def esquema_de(df):
+    return resolver_esquema(tuple(df.columns))
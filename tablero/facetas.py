@@ -0,0 +1,111 @@
+"""Facetas de "Estado Documentación": estado administrativo × estado físico.
+
+Cada fila se clasifica una sola vez por instantánea en una máscara de bits
+administrativa (las palabras clave no son excluyentes: "Firma titular" también
+contiene "firma") y un código de ESTADO. Los conteos cruzados salen de una
+tabla de contingencia bits × estado y los filtros de comparaciones enteras.
+"""
+import numpy as np
+import pandas as pd
+
+OK_DOC = "Ok doc"
+FILTRO_OK_STOCK = "SPECIAL_OK_STOCK"
+FILTRO_OK_ENTREGADO = "SPECIAL_OK_ENTREGADO"
+
+# (etiqueta del botón, ícono, palabra clave buscada en la columna administrativa)
+ESTADOS_ADMIN = [
+    ("Atopatentado sin cliente", "⚫", "Atopatentado sin"),
+    ("Autopatentado firma 08", "✍️", "firma"),
+    ("En caso legales", "⚖️", "legales"),
+    ("No retirará la unidad", "🚫", "retirará"),
+    ("Entrega al gestor", "📂", "gestor"),
+    ("Entrega al Reventa", "🤝", "Reventa"),
+    ("Se envía a Salta", "🚚", "Salta"),
+    ("Firma titular", "📝", "titular"),
+]
+ESTADOS_STOCK = ["EN EXHIBICIÓN", "SIN PRE ENTREGA", "CON PRE ENTREGA", "BLOQUEADO", "ENTREGADO", "RESERVADO", "DISPONIBLE"]
+
+# Bit 0: "Ok doc"; bit i + 1: palabra clave i de ESTADOS_ADMIN
+_PALABRAS = [OK_DOC] + [kw for _, _, kw in ESTADOS_ADMIN]
+_BIT_OK = 1
+
+
+def _bit(palabra):
+    return 1 << _PALABRAS.index(palabra) if palabra in _PALABRAS else 0
+
+
+class Facetas:
+    def __init__(self, df, col_admin):
+        n = len(df)
+        self.bits = np.zeros(n, dtype=np.uint16)
+        if col_admin and col_admin in df.columns:
+            codigos, unicos = pd.factorize(df[col_admin])
+            bits_unicos = np.array([
+                sum(1 << i for i, p in enumerate(_PALABRAS) if p.upper() in str(v).upper()) for v in unicos
+            ], dtype=np.uint16)
+            self.bits = np.where(codigos >= 0, bits_unicos[codigos.clip(0)] if len(unicos) else 0, 0).astype(np.uint16)
+
+        # Código de ESTADO en mayúsculas; las celdas vacías quedan en la columna 0 de la tabla
+        self.estados = list(ESTADOS_STOCK)
+        self.codigo_estado = np.zeros(n, dtype=np.int16)
+        if "ESTADO" in df.columns:
+            codigos, unicos = pd.factorize(df["ESTADO"])
+            for u in (str(v).upper() for v in unicos):
+                if u not in self.estados: self.estados.append(u)
+            posicion = np.array([self.estados.index(str(v).upper()) + 1 for v in unicos], dtype=np.int16)
+            self.codigo_estado = np.where(codigos >= 0, posicion[codigos.clip(0)] if len(unicos) else 0, 0).astype(np.int16)
+        self._n_estados = len(self.estados) + 1
+        self._tabla = None
+        self._tabla = self.contingencia()
+
+    def contingencia(self, filas=None):
+        """Tabla [bits, estado] con la cantidad de filas; `filas` restringe a esas posiciones."""
+        if filas is None and self._tabla is not None:
+            return self._tabla
+        bits, estado = (self.bits, self.codigo_estado) if filas is None else (self.bits[filas], self.codigo_estado[filas])
+        combinado = bits.astype(np.int64) * self._n_estados + estado
+        tabla = np.bincount(combinado, minlength=(1 << len(_PALABRAS)) * self._n_estados)
+        return tabla.reshape(1 << len(_PALABRAS), self._n_estados)
+
+    def _seleccion(self, filtro_admin=None, filtro_stock=None):
+        """(valores de bits, columnas de estado) que cumplen ambos filtros, como máscaras booleanas."""
+        valores = np.arange(1 << len(_PALABRAS))
+        filas = np.ones(len(valores), dtype=bool)
+        cols = np.ones(self._n_estados, dtype=bool)
+        entregado = self.estados.index("ENTREGADO") + 1
+        if filtro_admin == FILTRO_OK_STOCK:
+            filas = (valores & _BIT_OK) != 0
+            cols[entregado] = False
+        elif filtro_admin == FILTRO_OK_ENTREGADO:
+            filas = (valores & _BIT_OK) != 0
+            cols[:] = False
+            cols[entregado] = True
+        elif filtro_admin:
+            filas = (valores & _bit(filtro_admin)) != 0
+        if filtro_stock:
+            estado = str(filtro_stock).upper()
+            solo = np.zeros(self._n_estados, dtype=bool)
+            if estado in self.estados: solo[self.estados.index(estado) + 1] = True
+            cols &= solo
+        return filas, cols
+
+    def contar(self, tabla, filtro_admin=None, filtro_stock=None):
+        filas, cols = self._seleccion(filtro_admin, filtro_stock)
+        return int(tabla[filas][:, cols].sum())
+
+    def conteos_por_estado(self, tabla, filtro_admin=None):
+        """Cantidad por estado físico (en el orden de self.estados) bajo un filtro administrativo."""
+        filas, cols = self._seleccion(filtro_admin)
+        por_estado = np.where(cols, tabla[filas].sum(axis=0), 0)
+        return dict(zip(self.estados, por_estado[1:].tolist()))
+
+    def pendientes_admin(self):
+        """Por fila, las etiquetas de ESTADOS_ADMIN que le corresponden separadas por ", " ("" si ninguna)."""
+        # Se arma el texto una vez por combinación de bits presente, no por fila
+        valores, codigos = np.unique(self.bits, return_inverse=True)
+        textos = np.array([", ".join(etiqueta for etiqueta, _, kw in ESTADOS_ADMIN if v & _bit(kw)) for v in valores.tolist()], dtype=object)
+        return textos[codigos] if len(valores) else np.array([], dtype=object)
+
+    def mascara(self, filtro_admin=None, filtro_stock=None):
+        filas, cols = self._seleccion(filtro_admin, filtro_stock)
+        return filas[self.bits] & cols[self.codigo_estado]
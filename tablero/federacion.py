@@ -0,0 +1,150 @@
+"""Varias planillas (una por sucursal) descargadas en paralelo y unidas en un solo frame.
+
+Cada sucursal tiene su propia ingesta y su propia caché en disco: si una planilla
+tarda o falla se sigue sirviendo su último frame bueno y las demás no se enteran.
+"""
+import concurrent.futures
+import contextvars
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from tablero.busqueda import normalizar
+from tablero.cache_disco import CacheDisco, FuentePersistente
+from tablero.ingesta import IngestaIncremental, unir_categorias
+from tablero.metricas import tramo
+
+COL_SUCURSAL = "SUCURSAL"
+# Planilla de Autociel: la que se usa si no se configura otra
+SHEET_ID = "15hIQ6WBxh1Ymhh9dxerKvEnoXJ_osH6a9BH-1TW9ZU8"
+GID = "1504374770"
+
+
+def url_hoja(sheet_id, gid):
+    return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
+
+
+def cargar_fuentes(ruta):
+    """Lista [(sucursal, url)] desde un JSON con objetos {"sucursal", "url"} o {"sucursal", "sheet_id", "gid"}."""
+    with open(ruta, encoding="utf-8") as f:
+        entradas = json.load(f)
+    return [(e["sucursal"], e.get("url") or url_hoja(e["sheet_id"], e["gid"])) for e in entradas]
+
+
+def fuentes_de_entorno():
+    """[(sucursal, url)] según TABLERO_FUENTES o TABLERO_URL_CSV; sin ninguna, sólo la planilla de Autociel."""
+    if os.environ.get("TABLERO_FUENTES"):
+        return cargar_fuentes(os.environ["TABLERO_FUENTES"])
+    return [("Autociel", os.environ.get("TABLERO_URL_CSV", url_hoja(SHEET_ID, GID)))]
+
+
+def _consultar(fuente):
+    # En el hilo de la sucursal: el frame y sus huellas salen del mismo ciclo
+    df = fuente.actualizar()
+    return df, fuente.huellas() if hasattr(fuente, "huellas") else None
+
+
+def slug(nombre):
+    return re.sub(r"[^A-Z0-9]+", "-", normalizar(nombre)).strip("-").lower() or "fuente"
+
+
+class Federacion:
+    """Fuente compuesta para el Refrescador: `actualizar()` consulta todas las sucursales a la vez.
+
+    Un ciclo espera como mucho `espera` segundos; una sucursal que no respondió
+    sigue corriendo en su hilo (no se vuelve a pedir hasta que termine) y mientras
+    tanto aporta su último frame bueno.
+    """
+
+    def __init__(self, fuentes, max_conexiones=4, espera=60):
+        self.fuentes = dict(fuentes)
+        self.espera = espera
+        self.errores = {}
+        self._dfs = {}
+        self._huellas = {}
+        self._en_curso = {}
+        self._combinado = None
+        self._huellas_combinadas = None
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(len(self.fuentes), max_conexiones)), thread_name_prefix="fuente")
+
+    @classmethod
+    def desde_urls(cls, fuentes, dir_cache, timeout=30, **kwargs):
+        """Una IngestaIncremental con caché propia (`instantanea-<sucursal>.feather`) por cada (sucursal, url)."""
+        return cls([
+            (nombre, FuentePersistente(IngestaIncremental(url, timeout=timeout),
+                                       CacheDisco(os.path.join(dir_cache, f"instantanea-{slug(nombre)}.feather"), url)))
+            for nombre, url in fuentes
+        ], **kwargs)
+
+    def cargar_cache(self):
+        """Frame combinado con lo que haya en disco de cada sucursal (o None si no hay nada)."""
+        momentos = []
+        errores = dict(self.errores)
+        for nombre, fuente in self.fuentes.items():
+            if not hasattr(fuente, "cargar_cache"): continue
+            try:
+                guardado = fuente.cargar_cache()
+            except Exception as e:
+                errores[nombre] = f"caché ilegible: {e}"
+                continue
+            if guardado is None: continue
+            self._dfs[nombre], momento = guardado
+            self._huellas[nombre] = fuente.huellas() if hasattr(fuente, "huellas") else None
+            if momento is not None: momentos.append(momento)
+        self.errores = errores
+        if not self._dfs: return None
+        self._combinado, self._huellas_combinadas = self._combinar()
+        return self._combinado, min(momentos) if momentos else None
+
+    def actualizar(self):
+        for nombre, fuente in self.fuentes.items():
+            if nombre not in self._en_curso:
+                # Con el contexto del ciclo, para que los tramos de cada sucursal cuenten en él
+                self._en_curso[nombre] = self._pool.submit(contextvars.copy_context().run, _consultar, fuente)
+        listos, _ = concurrent.futures.wait(list(self._en_curso.values()), timeout=self.espera)
+
+        cambio = False
+        # Se arma aparte y se reemplaza entero: la barra lateral lo recorre desde otro hilo
+        errores = dict(self.errores)
+        for nombre, futuro in list(self._en_curso.items()):
+            if futuro not in listos:
+                errores[nombre] = f"sin respuesta tras {self.espera} s"
+                continue
+            del self._en_curso[nombre]
+            try:
+                df, huellas = futuro.result()
+            except Exception as e:
+                errores[nombre] = str(e)
+                continue
+            errores.pop(nombre, None)
+            if df is not None and df is not self._dfs.get(nombre):
+                self._dfs[nombre] = df
+                self._huellas[nombre] = huellas
+                cambio = True
+        self.errores = errores
+
+        if not self._dfs:
+            raise RuntimeError("; ".join(f"{n}: {e}" for n, e in self.errores.items()) or "sin datos")
+        if cambio or self._combinado is None:
+            with tramo("federacion.combinar"):
+                self._combinado, self._huellas_combinadas = self._combinar()
+        return self._combinado
+
+    def huellas(self):
+        """Huellas de las filas del último frame combinado (None si alguna sucursal no las tiene)."""
+        return self._huellas_combinadas
+
+    def _combinar(self):
+        # Mismo orden que la configuración, sin importar qué sucursal respondió primero
+        nombres = [n for n in self.fuentes if n in self._dfs]
+        partes = [self._dfs[n].assign(**{COL_SUCURSAL: n}) for n in nombres]
+        # Sin categorías comunes concat deja MARCA, ESTADO, etc. como texto
+        df = pd.concat(unir_categorias(partes), ignore_index=True) if len(partes) > 1 else partes[0].reset_index(drop=True)
+        huellas = [self._huellas.get(n) for n in nombres]
+        if any(h is None or len(h) != len(self._dfs[n]) for h, n in zip(huellas, nombres)):
+            return df, None
+        return df, np.concatenate(huellas)
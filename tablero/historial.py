@@ -0,0 +1,258 @@
+"""Historial de estados por VIN: sólo se guardan los cambios entre instantáneas.
+
+En disco hay un registro de sólo agregado (`cambios.bin`, registros de tamaño
+fijo: momento, vin, campo, código) y dos diccionarios de sólo agregado
+(`vins.txt`, `estados.txt`: el código es el número de línea). Al abrirse se
+reconstruye el último estado conocido de cada VIN leyendo sólo los cambios,
+nunca instantáneas completas. Para las consultas, cada cambio es un intervalo
+[desde, hasta el siguiente cambio del mismo VIN): "estado de X en la fecha D"
+es una búsqueda binaria en los intervalos del VIN y "unidades en S durante la
+semana W" recorre sólo los intervalos de S que empezaron antes del fin de la semana.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from tablero.esquema import esquema_de
+from tablero.metricas import tramo
+
+CAMPOS = ("ESTADO", "ADMINISTRATIVO")
+VACIO = ""
+BAJA = "(baja)"  # el VIN dejó de estar en la planilla
+REGISTRO = np.dtype([("momento", "<i8"), ("vin", "<i4"), ("campo", "u1"), ("codigo", "<i4")])
+_FIN = np.iinfo(np.int64).max
+
+
+def _leer_lineas(ruta):
+    if not os.path.exists(ruta): return []
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    # Una última línea sin "\n" es una escritura cortada: se descarta
+    return [l.decode("utf-8") for l in contenido.split(b"\n")[:-1]]
+
+
+def _segundos(fecha):
+    """Segundos desde 1970 de un epoch (time.time()) o de una fecha."""
+    if isinstance(fecha, (int, float)): return int(fecha)
+    return int(pd.Timestamp(fecha).timestamp())
+
+
+class _Indice:
+    """Intervalos de un campo: por VIN (para estado_en) y por código (para contar/listar)."""
+
+    def __init__(self, registros):
+        orden = np.lexsort((registros["momento"], registros["vin"]))
+        self.vin = registros["vin"][orden]
+        self.desde = registros["momento"][orden]
+        self.codigo = registros["codigo"][orden]
+        mismo_vin = np.r_[self.vin[1:] == self.vin[:-1], False]
+        self.hasta = np.where(mismo_vin, np.r_[self.desde[1:], 0], _FIN)
+
+        # Por código: los intervalos ordenados por comienzo (se arman la primera vez que se consulta cada código)
+        self._por_codigo = np.argsort(self.codigo, kind="stable")
+        self._codigos = self.codigo[self._por_codigo]
+        self._ordenados = {}
+
+    def tramo_vin(self, vin):
+        return np.searchsorted(self.vin, vin), np.searchsorted(self.vin, vin, side="right")
+
+    def ordenados(self, codigo):
+        """Filas de los intervalos con `codigo` ordenadas por comienzo, y esos comienzos."""
+        if codigo not in self._ordenados:
+            i, j = np.searchsorted(self._codigos, codigo), np.searchsorted(self._codigos, codigo, side="right")
+            filas = self._por_codigo[i:j]
+            filas = filas[np.argsort(self.desde[filas], kind="stable")]
+            self._ordenados[codigo] = (filas, self.desde[filas])
+        return self._ordenados[codigo]
+
+
+class HistorialEstados:
+    def __init__(self, directorio):
+        self.directorio = directorio
+        self._lock = threading.Lock()
+        self._cargar()
+
+    def _cargar(self):
+        self._vins = _leer_lineas(self._ruta("vins.txt"))
+        self._estados = _leer_lineas(self._ruta("estados.txt")) or [VACIO, BAJA]
+        self._codigo_estado = {e: i for i, e in enumerate(self._estados)}
+        self._indice_vins = pd.Index(self._vins)
+        self._registros = self._leer_registros()
+        self._ultimo = np.full((len(CAMPOS), len(self._vins)), -1, dtype=np.int32)
+        if len(self._registros):
+            # Último cambio por (campo, vin): los registros ya están en orden de llegada
+            r = self._registros[::-1]
+            _, primeros = np.unique(r["campo"].astype(np.int64) * (1 << 32) + r["vin"], return_index=True)
+            self._ultimo[r["campo"][primeros], r["vin"][primeros]] = r["codigo"][primeros]
+        self._indices = {}
+
+    def recargar(self):
+        """Vuelve a leer lo que agregó otro proceso (ver tablero.publicacion: sólo el cargador escribe)."""
+        with self._lock:
+            self._cargar()
+
+    def _ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def _leer_registros(self):
+        ruta = self._ruta("cambios.bin")
+        if not os.path.exists(ruta): return np.empty(0, dtype=REGISTRO)
+        with open(ruta, "rb") as f:
+            datos = f.read()
+        registros = np.frombuffer(datos[:len(datos) - len(datos) % REGISTRO.itemsize], dtype=REGISTRO)
+        # Sólo lo que referencia diccionarios completos (los diccionarios se escriben antes)
+        validos = (registros["vin"] < len(self._vins)) & (registros["codigo"] < len(self._estados))
+        return registros[:int(np.argmin(validos)) if not validos.all() else len(registros)].copy()
+
+    @property
+    def cambios(self):
+        return len(self._registros)
+
+    # --- escritura ---
+
+    def registrar_instantanea(self, instantanea):
+        """Para `Refrescador(al_publicar=...)`: agrega los cambios de la instantánea."""
+        return self.registrar(instantanea.df, instantanea.creada or time.time())
+
+    def registrar(self, df, momento):
+        """Agrega los VIN cuyo estado cambió respecto del último conocido (y las bajas); devuelve cuántos cambios."""
+        esquema = esquema_de(df)
+        if df.empty or not esquema.vin: return 0
+        with self._lock, tramo("historial.registrar"):
+            vins = df[esquema.vin].astype(str).str.strip()
+            presentes = (vins != "") & df[esquema.vin].notna()
+            # Un VIN repetido vale por su última fila
+            presentes &= ~vins.duplicated(keep="last")
+            vins = vins[presentes]
+            columnas = {"ESTADO": esquema.estado, "ADMINISTRATIVO": esquema.admin_doc or esquema.admin}
+
+            nuevos_vins = vins[self._indice_vins.get_indexer(vins) < 0].tolist()
+            codigos_estado = {}
+            nuevos_estados = []
+            for campo, col in columnas.items():
+                valores = df.loc[presentes, col] if col else pd.Series(VACIO, index=vins.index)
+                codigos, unicos = pd.factorize(valores)
+                globales = []
+                for v in unicos:
+                    v = " ".join(str(v).split())
+                    if v not in self._codigo_estado:
+                        self._codigo_estado[v] = len(self._estados) + len(nuevos_estados)
+                        nuevos_estados.append(v)
+                    globales.append(self._codigo_estado[v])
+                codigos_estado[campo] = np.array(globales + [self._codigo_estado[VACIO]], dtype=np.int32)[codigos]
+
+            # Diccionarios primero: un registro nunca apunta a un código que no está en disco
+            os.makedirs(self.directorio, exist_ok=True)
+            if not os.path.exists(self._ruta("estados.txt")):
+                self._agregar_lineas("estados.txt", self._estados)
+            self._agregar_lineas("estados.txt", nuevos_estados)
+            self._estados.extend(nuevos_estados)
+            self._agregar_lineas("vins.txt", nuevos_vins)
+            if nuevos_vins:
+                self._vins.extend(nuevos_vins)
+                self._indice_vins = pd.Index(self._vins)
+                self._ultimo = np.pad(self._ultimo, ((0, 0), (0, len(nuevos_vins))), constant_values=-1)
+
+            ids = self._indice_vins.get_indexer(vins)
+            en_planilla = np.zeros(len(self._vins), dtype=bool)
+            en_planilla[ids] = True
+            segundos = _segundos(momento)
+            partes = []
+            for c, campo in enumerate(CAMPOS):
+                ultimo = self._ultimo[c]
+                cambiados = ultimo[ids] != codigos_estado[campo]
+                bajas = np.flatnonzero(~en_planilla & (ultimo >= 0) & (ultimo != self._codigo_estado[BAJA]))
+                vin_ids = np.concatenate([ids[cambiados], bajas])
+                codigos = np.concatenate([codigos_estado[campo][cambiados], np.full(len(bajas), self._codigo_estado[BAJA], dtype=np.int32)])
+                parte = np.empty(len(vin_ids), dtype=REGISTRO)
+                parte["momento"], parte["vin"], parte["campo"], parte["codigo"] = segundos, vin_ids, c, codigos
+                partes.append(parte)
+                ultimo[vin_ids] = codigos
+            nuevos = np.concatenate(partes)
+            if len(nuevos):
+                with open(self._ruta("cambios.bin"), "ab") as f:
+                    f.write(nuevos.tobytes())
+                self._registros = np.concatenate([self._registros, nuevos])
+                self._indices = {}
+            return len(nuevos)
+
+    def _agregar_lineas(self, nombre, lineas):
+        if not lineas: return
+        with open(self._ruta(nombre), "ab") as f:
+            f.write("".join(l + "\n" for l in lineas).encode("utf-8"))
+
+    # --- consultas ---
+
+    def _indice(self, campo):
+        c = CAMPOS.index(campo)
+        with self._lock:
+            if c not in self._indices:
+                self._indices[c] = _Indice(self._registros[self._registros["campo"] == c])
+            return self._indices[c]
+
+    def _vin(self, vin):
+        try:
+            return self._indice_vins.get_loc(str(vin).strip())
+        except KeyError:
+            return -1
+
+    def estado_en(self, vin, fecha, campo="ESTADO"):
+        """Estado que tenía `vin` en `fecha` (None si todavía no figuraba)."""
+        i = self._vin(vin)
+        if i < 0: return None
+        indice = self._indice(campo)
+        a, b = indice.tramo_vin(i)
+        k = a + np.searchsorted(indice.desde[a:b], _segundos(fecha), side="right") - 1
+        return self._estados[indice.codigo[k]] if k >= a else None
+
+    def historia(self, vin, campo="ESTADO"):
+        """DataFrame DESDE/HASTA/ESTADO con los cambios de un VIN."""
+        i = self._vin(vin)
+        indice = self._indice(campo)
+        a, b = indice.tramo_vin(i) if i >= 0 else (0, 0)
+        hasta = pd.Series(indice.hasta[a:b])
+        return pd.DataFrame({
+            "DESDE": pd.to_datetime(indice.desde[a:b], unit="s"),
+            "HASTA": pd.to_datetime(hasta.where(hasta != _FIN), unit="s"),  # NaT: sigue en ese estado
+            campo: [self._estados[c] for c in indice.codigo[a:b]],
+        })
+
+    def _vins_en(self, estado, desde, hasta, campo):
+        indice = self._indice(campo)
+        codigo = self._codigo_estado.get(estado)
+        if codigo is None: return np.array([], dtype=np.int32)
+        filas, comienzos = indice.ordenados(codigo)
+        # Empezaron antes de `hasta` y todavía seguían en `desde`; un VIN puede
+        # haber entrado y salido más de una vez del estado en el período
+        filas = filas[:np.searchsorted(comienzos, _segundos(hasta))]
+        return np.unique(indice.vin[filas[indice.hasta[filas] > _segundos(desde)]])
+
+    def contar_en(self, estado, desde, hasta, campo="ESTADO"):
+        """Unidades que estuvieron en `estado` en algún momento de [desde, hasta)."""
+        return len(self._vins_en(estado, desde, hasta, campo))
+
+    def unidades_en(self, estado, desde, hasta, campo="ESTADO"):
+        """VINs que estuvieron en `estado` en algún momento de [desde, hasta)."""
+        return [self._vins[v] for v in self._vins_en(estado, desde, hasta, campo)]
+
+    def permanencias(self, campo="ESTADO"):
+        """Días en cada estado (intervalos ya cerrados): cantidad, mediana y percentil 90 por estado."""
+        indice = self._indice(campo)
+        cerrados = (indice.hasta != _FIN) & (indice.codigo != self._codigo_estado[BAJA])
+        if not cerrados.any():
+            return pd.DataFrame(columns=[campo, "CAMBIOS", "MEDIANA_DIAS", "P90_DIAS"])
+        dias = pd.DataFrame({
+            campo: [self._estados[c] for c in indice.codigo[cerrados]],
+            "DIAS": (indice.hasta[cerrados] - indice.desde[cerrados]) / 86400,
+        })
+        grupos = dias.groupby(campo)["DIAS"]
+        return pd.DataFrame({
+            "CAMBIOS": grupos.size(), "MEDIANA_DIAS": grupos.median().round(1), "P90_DIAS": grupos.quantile(0.9).round(1),
+        }).reset_index().sort_values("CAMBIOS", ascending=False, ignore_index=True)
+
+    def estados(self, campo="ESTADO"):
+        indice = self._indice(campo)
+        return sorted({self._estados[c] for c in np.unique(indice.codigo)} - {VACIO, BAJA})
@@ -0,0 +1,281 @@
+"""Ingesta incremental de la planilla exportada como CSV.
+
+El CSV se parsea por bloques de filas con tipos declarados (categorías para
+las columnas de pocos valores distintos, texto para el resto) y las columnas
+derivadas se calculan por bloque, así el pico de memoria no crece con el tamaño
+de la exportación.
+"""
+import hashlib
+import io
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from tablero.esquema import resolver_esquema
+from tablero.metricas import tramo
+
+FILAS_POR_BLOQUE = 50_000
+# Columnas de pocos valores distintos que se guardan como categorías
+CATEGORICAS = (
+    "MARCA", "MODELO", "ESTADO", "UBICACION", "DESCRIPCION COLOR", "CANAL DE VENTA", "VENDEDOR",
+    "HS DE ENTREGA AL CLIENTE", "ESTADO DE ADMINISTRATIVO", "ESTADO ADMINISTRATIVO",
+)
+# Formatos que usa la planilla; lo que no encaje se parsea valor por valor
+FORMATOS_FECHA = ("%d/%m/%Y", "%d/%m/%Y %H:%M:%S", "%Y-%m-%d")
+# Resolución con que parsea esta versión de pandas: la usa también un bloque sin fechas
+_TIPO_FECHA = pd.to_datetime(pd.Series(["01/01/2000"]), format=FORMATOS_FECHA[0]).dtype
+
+
+def normalizar_encabezados(df):
+    df.columns = df.columns.str.strip().str.upper()
+    return df
+
+
+def a_fecha(serie):
+    """Como pd.to_datetime(dayfirst=True, errors='coerce'), con formato explícito como camino rápido.
+
+    Las fechas se repiten mucho, así que se parsea cada valor distinto una sola vez.
+    """
+    codigos, unicos = pd.factorize(serie)
+    unicos = pd.Series(np.asarray(unicos, dtype=object))
+    fechas = pd.to_datetime(unicos, format=FORMATOS_FECHA[0], errors="coerce")
+    for formato in FORMATOS_FECHA[1:]:
+        faltan = fechas.isna()
+        if not faltan.any(): break
+        fechas[faltan] = pd.to_datetime(unicos[faltan], format=formato, errors="coerce")
+    faltan = fechas.isna()
+    if faltan.any():
+        fechas[faltan] = pd.to_datetime(unicos[faltan], dayfirst=True, format="mixed", errors="coerce")
+    valores = fechas.to_numpy()
+    resultado = np.full(len(serie), np.datetime64("NaT"), dtype=valores.dtype if len(valores) else _TIPO_FECHA)
+    validos = codigos >= 0
+    resultado[validos] = valores[codigos[validos]]
+    return pd.Series(resultado, index=serie.index, name=serie.name)
+
+
+def agregar_derivadas(df):
+    # Todas las columnas derivadas dependen sólo de la propia fila, así que
+    # pueden calcularse sobre un subconjunto de filas y fusionarse después.
+    esq = resolver_esquema(tuple(df.columns))
+    if esq.entrega:
+        df["FECHA_ENTREGA_DT"] = a_fecha(df[esq.entrega])
+        df["AÑO_ENTREGA"] = df["FECHA_ENTREGA_DT"].dt.year
+        df["MES_ENTREGA"] = df["FECHA_ENTREGA_DT"].dt.month_name()
+        df["N_MES_ENTREGA"] = df["FECHA_ENTREGA_DT"].dt.month
+
+    if esq.arribo:
+        df["FECHA_ARRIBO_DT"] = a_fecha(df[esq.arribo])
+        df["AÑO_ARRIBO"] = df["FECHA_ARRIBO_DT"].dt.year
+
+    if esq.facturacion:
+        df["FECHA_FACTURACION_DT"] = a_fecha(df[esq.facturacion])
+
+    if esq.papeles:
+        df["FECHA_PAPELES_DT"] = a_fecha(df[esq.papeles])
+
+    if esq.telefono: df["TELEFONO_CLEAN"] = df[esq.telefono]
+    if esq.correo: df["CORREO_CLEAN"] = df[esq.correo]
+    return df
+
+
+def procesar_hoja(df):
+    return agregar_derivadas(normalizar_encabezados(df))
+
+
+def separar_filas(contenido):
+    """Devuelve (encabezado, filas) como líneas crudas, o None si hay celdas con saltos de línea."""
+    lineas = contenido.replace(b"\r\n", b"\n").split(b"\n")
+    if b'"' in contenido and any(l.count(b'"') % 2 for l in lineas):
+        return None
+    return lineas[0], [l for l in lineas[1:] if l]
+
+
+def hash_filas(filas):
+    # Hash estable entre procesos (a diferencia de hash()) para poder persistirlo
+    return np.frombuffer(b"".join([hashlib.blake2b(l, digest_size=8).digest() for l in filas]), dtype=np.uint64)
+
+
+def leer_csv(contenido, filas_por_bloque=FILAS_POR_BLOQUE):
+    """DataFrame procesado (encabezados normalizados y derivadas) leyendo el CSV por bloques."""
+    with tramo("ingesta.parseo"):
+        return _leer_bloques(contenido, filas_por_bloque)
+
+
+def _leer_bloques(contenido, filas_por_bloque):
+    # Todas las columnas con tipo declarado (categoría o texto): cada bloque sale con
+    # los mismos dtypes que leería una sola pasada y no hace falta releer nada.
+    crudos = pd.read_csv(io.BytesIO(contenido), nrows=0).columns
+    tipos = {c: "category" if c.strip().upper() in CATEGORICAS else "str" for c in crudos}
+    columnas = {}
+    for bloque in pd.read_csv(io.BytesIO(contenido), dtype=tipos, chunksize=filas_por_bloque):
+        for col, serie in procesar_hoja(bloque).items():
+            columnas.setdefault(col, []).append(serie)
+        del bloque, serie
+    if not columnas: return procesar_hoja(pd.read_csv(io.BytesIO(contenido), dtype=tipos))
+
+    # Se arma columna por columna soltando sus partes enseguida: el pico queda en el
+    # frame final más una columna, no en dos copias del frame como con un solo concat.
+    df = pd.DataFrame(index=pd.RangeIndex(sum(len(s) for s in next(iter(columnas.values())))))
+    for col in list(columnas):
+        partes = columnas.pop(col)
+        df[col] = partes[0] if len(partes) == 1 else pd.concat(_categorias_comunes(partes), ignore_index=True)
+        del partes
+    return df
+
+
+def _categorias_comunes(series):
+    """Si todas las series son categóricas, las lleva a la unión ordenada de sus categorías."""
+    if not all(isinstance(s.dtype, pd.CategoricalDtype) for s in series): return series
+    # Ordenadas, como las deja read_csv: ordenar por la columna sigue siendo lexicográfico
+    con_valores = [s for s in series if len(s.cat.categories)] or series[:1]
+    categorias = pd.api.types.union_categoricals(con_valores, ignore_order=True, sort_categories=True).categories
+    return [s.cat.set_categories(categorias) for s in series]
+
+
+def unir_categorias(partes):
+    """Lleva cada columna categórica a las mismas categorías en todas las partes, para que concat las conserve."""
+    for col in partes[0].columns:
+        if isinstance(partes[0][col].dtype, pd.CategoricalDtype) and all(col in p.columns for p in partes):
+            for p, serie in zip(partes, _categorias_comunes([p[col] for p in partes])):
+                p[col] = serie
+    return partes
+
+
+def _leer_csv(encabezado, filas):
+    return leer_csv(b"\n".join([encabezado] + filas))
+
+
+class IngestaIncremental:
+    """Descarga la planilla sólo si cambió y parsea sólo las filas nuevas o modificadas.
+
+    `origen` puede ser una URL http(s) o una ruta a un CSV local.
+    """
+
+    def __init__(self, origen, timeout=30):
+        self.origen = origen
+        self.timeout = timeout
+        self.etag = None
+        self.last_modified = None
+        self.huella = None
+        self.df = None
+        self.ultimo_resultado = None
+        self._encabezado = None
+        self._hashes = None
+        self._lock = threading.Lock()
+
+    def estado(self):
+        """Lo necesario para retomar la ingesta incremental desde otra instancia o proceso."""
+        return {
+            "encabezado": self._encabezado.decode("utf-8", "surrogateescape") if self._encabezado is not None else None,
+            "hashes": self._hashes,
+            "huella": self.huella,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+    def huellas(self):
+        """Hash de cada línea del CSV, alineado con las filas de `df` (None con celdas multilínea)."""
+        return self._hashes
+
+    def restaurar(self, df, estado):
+        with self._lock:
+            self.df = df
+            self._encabezado = estado["encabezado"].encode("utf-8", "surrogateescape") if estado.get("encabezado") is not None else None
+            self._hashes = estado.get("hashes")
+            self.huella = estado.get("huella")
+            self.etag = estado.get("etag")
+            self.last_modified = estado.get("last_modified")
+
+    def _descargar(self):
+        """(contenido, etag, last_modified); contenido None si el servidor respondió 304."""
+        if not self.origen.startswith(("http://", "https://")):
+            with open(self.origen, "rb") as f:
+                return f.read(), None, None
+        pedido = urllib.request.Request(self.origen)
+        if self.df is not None:
+            if self.etag: pedido.add_header("If-None-Match", self.etag)
+            if self.last_modified: pedido.add_header("If-Modified-Since", self.last_modified)
+        try:
+            with urllib.request.urlopen(pedido, timeout=self.timeout) as resp:
+                return resp.read(), resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        except urllib.error.HTTPError as e:
+            if e.code == 304: return None, self.etag, self.last_modified
+            raise
+
+    def actualizar(self):
+        with self._lock:
+            with tramo("ingesta.descarga"):
+                contenido, etag, last_modified = self._descargar()
+            if contenido is None:
+                self.ultimo_resultado = "sin cambios (304)"
+                return self.df
+            huella = hashlib.sha256(contenido).hexdigest()
+            if huella == self.huella and self.df is not None:
+                self.ultimo_resultado = "sin cambios (hash)"
+            else:
+                with tramo("ingesta.fusion"):
+                    self.df = self._fusionar(contenido)
+                self.huella = huella
+            # Recién con el frame al día: si el parseo falla, el próximo pedido no manda
+            # estos validadores y vuelve a bajar la planilla en lugar de recibir un 304
+            self.etag, self.last_modified = etag, last_modified
+            return self.df
+
+    def _fusionar(self, contenido):
+        partes = separar_filas(contenido)
+        if partes is None:
+            # Celdas multilínea: no se puede comparar por línea, se procesa todo
+            df = leer_csv(contenido)
+            self.ultimo_resultado = f"{len(df)} de {len(df)} filas reprocesadas"
+            self._encabezado, self._hashes = None, None
+            return df
+
+        encabezado, filas = partes
+        with tramo("ingesta.hash_filas"):
+            hashes = hash_filas(filas)
+        n = len(filas)
+        if self.df is None or encabezado != self._encabezado:
+            # Primera carga o cambio de encabezados: se procesa todo
+            posiciones = np.full(n, -1)
+        else:
+            previos = pd.Index(self._hashes)
+            primeros = np.flatnonzero(~previos.duplicated())
+            encontrados = pd.Index(self._hashes[primeros]).get_indexer(hashes)
+            posiciones = np.where(encontrados >= 0, primeros[encontrados.clip(0)], -1)
+
+        nuevas = posiciones < 0
+        if nuevas.all():
+            df = _leer_csv(encabezado, filas)
+        else:
+            reutilizadas = self.df.iloc[posiciones[~nuevas]]
+            df = reutilizadas.reset_index(drop=True)
+            if nuevas.any():
+                procesadas = _leer_csv(encabezado, [f for f, m in zip(filas, nuevas) if m])
+                procesadas = _alinear_tipos(procesadas, reutilizadas)
+                orden = np.concatenate([np.flatnonzero(~nuevas), np.flatnonzero(nuevas)])
+                df = pd.concat(unir_categorias([reutilizadas.reset_index(drop=True), procesadas]), ignore_index=True)
+                df = df.iloc[np.argsort(orden, kind="stable")].reset_index(drop=True)
+
+        self.ultimo_resultado = f"{int(nuevas.sum())} de {n} filas reprocesadas"
+        self._encabezado = encabezado
+        self._hashes = hashes
+        return df
+
+
+def _alinear_tipos(parcial, referencia):
+    # Un subconjunto chico puede inferir otro dtype (p. ej. una columna toda vacía
+    # queda float); se intenta llevarlo al dtype del resto del frame.
+    for col in parcial.columns:
+        if col in referencia.columns and isinstance(referencia[col].dtype, pd.CategoricalDtype):
+            # Las categorías se unifican al concatenar; astype perdería los valores nuevos
+            if not isinstance(parcial[col].dtype, pd.CategoricalDtype):
+                parcial[col] = parcial[col].astype("category")
+        elif col in referencia.columns and parcial[col].dtype != referencia[col].dtype:
+            try:
+                parcial[col] = parcial[col].astype(referencia[col].dtype)
+            except (TypeError, ValueError):
+                pass
+    return parcial
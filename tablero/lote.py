@@ -0,0 +1,167 @@
+"""Listas de trabajo para el taller sin abrir la app (para cron).
+
+Carga las planillas con la misma ingesta y caché en disco que la app, calcula
+de una vez para toda la flota los controles de mantenimiento (30 a 540 días)
+y la documentación pendiente, y escribe una lista por ubicación y marca:
+
+    <salida>/<fecha>/mantenimiento/<ubicación>/<marca>.csv
+    <salida>/<fecha>/documentacion/<ubicación>/<marca>.csv
+    <salida>/<fecha>/resumen.json
+
+Uso: python -m tablero.lote --salida listas [--origen hoja.csv] [--fecha 2025-03-01] [--formato csv|json|ambos]
+Sin --origen usa TABLERO_FUENTES / TABLERO_URL_CSV como la app.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from tablero.esquema import esquema_de
+from tablero.facetas import Facetas
+from tablero.federacion import COL_SUCURSAL, Federacion, fuentes_de_entorno, slug
+from tablero.mantenimiento import calcular_vencimientos, no_entregados
+from tablero.metricas import tramo
+
+COL_UBICACION = "UBICACION"
+SIN_UBICACION = "sin ubicación"
+LISTAS_MANTENIMIENTO = (("Vence hoy", 0), ("Esta semana", 1), ("Atrasado", 2))
+COLUMNAS_MANTENIMIENTO = ["VIN", "MARCA", "MODELO", "FECHA_ARRIBO_DT", "UBICACION"]
+COLUMNAS_DOCUMENTACION = ["VIN", "CLIENTE", "MARCA", "MODELO", "UBICACION", "ESTADO", "FECHA DE FACTURACION DE LA UNIDAD", "FECHA DISPONIBILIDAD PAPELES"]
+
+
+def cargar(fuentes, dir_cache):
+    """Frame combinado de todas las fuentes; con caché en disco sólo se reprocesan las filas que cambiaron."""
+    federacion = Federacion.desde_urls(fuentes, dir_cache)
+    with tramo("lote.carga"):
+        federacion.cargar_cache()
+        df = federacion.actualizar()
+    for nombre, error in federacion.errores.items():
+        print(f"aviso: {nombre}: {error}", file=sys.stderr)
+    return df
+
+
+def _columnas(df, nombres):
+    return [c for c in dict.fromkeys(([COL_SUCURSAL] if COL_SUCURSAL in df.columns else []) + nombres) if c in df.columns]
+
+
+def listas(df, hoy):
+    """(mantenimiento, documentacion): una fila por tarea / por unidad con documentación pendiente."""
+    esquema = esquema_de(df)
+    with tramo("lote.mantenimiento"):
+        partes = []
+        if "FECHA_ARRIBO_DT" in df.columns:
+            base = df[no_entregados(df)]
+            motor = base[_columnas(base, COLUMNAS_MANTENIMIENTO + [c for c in esquema.controles.values() if c])]
+            resultados = calcular_vencimientos(motor, esquema.controles, hoy)
+            columnas = ["TAREA"] + _columnas(base, COLUMNAS_MANTENIMIENTO)
+            for lista, i in LISTAS_MANTENIMIENTO:
+                partes.append(resultados[i][columnas].assign(LISTA=lista))
+        mantenimiento = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=["TAREA", "LISTA"])
+        # LISTA primero: es lo que el taller ordena y filtra
+        mantenimiento = mantenimiento[["LISTA"] + [c for c in mantenimiento.columns if c != "LISTA"]]
+
+    with tramo("lote.documentacion"):
+        pendiente = Facetas(df, esquema.admin_doc).pendientes_admin()
+        con_pendiente = pendiente != ""
+        columnas = _columnas(df, COLUMNAS_DOCUMENTACION + ([esquema.admin_doc] if esquema.admin_doc else []))
+        documentacion = df.loc[con_pendiente, columnas].assign(PENDIENTE=pendiente[con_pendiente])
+    return mantenimiento, documentacion.reset_index(drop=True)
+
+
+def _grupos(df):
+    """(ruta relativa, frame) por sucursal/ubicación/marca."""
+    if df.empty: return
+    claves = [c for c in (COL_SUCURSAL, COL_UBICACION, "MARCA") if c in df.columns]
+    if not claves:
+        yield "todas", df
+        return
+    etiquetas = {c: df[c].astype(object).where(df[c].notna(), SIN_UBICACION if c == COL_UBICACION else "sin dato") for c in claves}
+    for valores, grupo in df.groupby([etiquetas[c] for c in claves], sort=True):
+        valores = valores if isinstance(valores, tuple) else (valores,)
+        yield os.path.join(*(slug(str(v)) for v in valores)), grupo
+
+
+def _fechas_como_texto(df):
+    """Copia con las fechas como "dd/mm/aaaa"; cada fecha distinta se formatea una sola vez."""
+    columnas = {}
+    for c in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[c]):
+            codigos, unicos = pd.factorize(df[c])
+            textos = np.array(list(pd.DatetimeIndex(unicos).strftime("%d/%m/%Y")) + [""], dtype=object)
+            columnas[c] = textos[codigos]
+    return df.assign(**columnas) if columnas else df
+
+
+def escribir(mantenimiento, documentacion, directorio, formato="csv", hoy=None):
+    """Escribe las listas en `directorio` (se reemplaza entero al final) y devuelve el resumen."""
+    padre = os.path.dirname(os.path.abspath(directorio))
+    os.makedirs(padre, exist_ok=True)
+    # Se arma en una carpeta temporal al lado: un lector nunca ve la mitad de las listas
+    temporal = tempfile.mkdtemp(prefix=".listas-", dir=padre)
+    resumen = {"fecha": str(pd.Timestamp(hoy).date()) if hoy is not None else None, "listas": {}}
+    try:
+        for nombre, df in (("mantenimiento", mantenimiento), ("documentacion", documentacion)):
+            archivos = {}
+            for ruta, grupo in _grupos(df):
+                destino = os.path.join(temporal, nombre, ruta)
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                if formato in ("csv", "ambos"):
+                    # El escritor de Arrow es un orden de magnitud más rápido que to_csv con columnas de texto
+                    tabla = pa.Table.from_pandas(_fechas_como_texto(grupo), preserve_index=False)
+                    pa_csv.write_csv(tabla, destino + ".csv")
+                if formato in ("json", "ambos"):
+                    grupo.to_json(destino + ".json", orient="records", date_format="iso", force_ascii=False, indent=1)
+                archivos[os.path.join(nombre, ruta)] = len(grupo)
+            resumen["listas"][nombre] = {"filas": len(df), "archivos": archivos}
+        with open(os.path.join(temporal, "resumen.json"), "w", encoding="utf-8") as f:
+            json.dump(resumen, f, ensure_ascii=False, indent=1)
+        if os.path.exists(directorio): shutil.rmtree(directorio)
+        os.replace(temporal, directorio)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    return resumen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tablero.lote", description="Listas de mantenimiento y documentación por ubicación y marca.")
+    parser.add_argument("--salida", required=True, help="carpeta donde se escribe <fecha>/...")
+    parser.add_argument("--origen", help="URL o ruta local de un CSV (por defecto, las planillas configuradas)")
+    parser.add_argument("--fecha", help="día de referencia (por defecto, hoy)")
+    parser.add_argument("--formato", choices=("csv", "json", "ambos"), default="csv")
+    parser.add_argument("--dir-cache", default=os.environ.get("TABLERO_DIR_CACHE", ".cache"))
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    fuentes, dir_cache = fuentes_de_entorno(), args.dir_cache
+    if args.origen:
+        # Caché aparte por origen: un CSV local no pisa la instantánea de la planilla que usa la app
+        fuentes = [("Autociel", args.origen)]
+        dir_cache = os.path.join(dir_cache, "lote", hashlib.sha1(args.origen.encode("utf-8")).hexdigest()[:12])
+    try:
+        df = cargar(fuentes, dir_cache)
+    except Exception as e:
+        print(f"error: no se pudieron cargar los datos: {e}", file=sys.stderr)
+        return 1
+    t_carga = time.perf_counter() - t0
+
+    hoy = pd.Timestamp(args.fecha).normalize() if args.fecha else pd.Timestamp.now().normalize()
+    mantenimiento, documentacion = listas(df, hoy)
+    resumen = escribir(mantenimiento, documentacion, os.path.join(args.salida, f"{hoy:%Y-%m-%d}"), args.formato, hoy)
+    print(f"{len(df)} unidades, carga {t_carga:.1f} s, total {time.perf_counter() - t0:.1f} s")
+    for nombre, datos in resumen["listas"].items():
+        print(f"  {nombre}: {datos['filas']} filas en {len(datos['archivos'])} archivos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Motor columnar de vencimientos para "Control Mantenimiento"."""
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+
+from tablero.esquema import resolver_esquema
+
+ESTADOS_HECHOS = ("OK", "N/A", "SI")
+
+# Tabla "dd/mm" indexada por mes * 32 + día: evita strftime fila por fila
+_DDMM = np.array([f"{d:02d}/{m:02d}" for m in range(13) for d in range(32)], dtype=object)
+
+
+def columnas_control(columnas):
+    return resolver_esquema(tuple(columnas)).controles
+
+
+def _ddmm(fechas):
+    idx = pd.DatetimeIndex(fechas)
+    return _DDMM[idx.month.to_numpy() * 32 + idx.day.to_numpy()]
+
+
+def _pendientes(serie):
+    # Se evalúa str().strip().upper() sólo sobre los valores distintos
+    codigos, unicos = pd.factorize(serie)
+    hecho_unicos = np.array([str(u).strip().upper() in ESTADOS_HECHOS for u in unicos], dtype=bool)
+    hecho = np.zeros(len(serie), dtype=bool)
+    validos = codigos >= 0
+    hecho[validos] = hecho_unicos[codigos[validos]]
+    return ~hecho
+
+
+def no_entregados(df):
+    """Máscara de las unidades que todavía no se entregaron (todas si no hay columna ESTADO)."""
+    if "ESTADO" not in df.columns: return np.ones(len(df), dtype=bool)
+    # Se compara una vez por valor distinto; el vacío (-1 de factorize) no es ENTREGADO
+    codigos, unicos = pd.factorize(df["ESTADO"])
+    entregado = np.array([str(u).strip().upper() == "ENTREGADO" for u in unicos] + [False])
+    return ~entregado[codigos]
+
+
+def calcular_vencimientos(df, cols_control, hoy):
+    """Devuelve (df_hoy, df_semana, df_atrasados), cada uno con la columna TAREA."""
+    hoy = pd.Timestamp(hoy)
+    inicio_semana = hoy - timedelta(days=hoy.weekday())
+    fin_semana = inicio_semana + timedelta(days=6)
+    hoy64, ini64, fin64 = (np.datetime64(t.to_datetime64(), "ns") for t in (hoy, inicio_semana, fin_semana))
+
+    n = len(df)
+    arribo = df["FECHA_ARRIBO_DT"].to_numpy(dtype="datetime64[ns]")
+    con_arribo = ~np.isnat(arribo)
+
+    tarea_hoy = np.full(n, "", dtype=object)
+    tarea_semana = np.full(n, "", dtype=object)
+    tarea_atrasados = np.full(n, "", dtype=object)
+
+    for intervalo, columna in cols_control.items():
+        if not columna: continue
+        vencimiento = arribo + np.timedelta64(intervalo, "D")
+        pendiente = con_arribo & _pendientes(df[columna])
+
+        m = pendiente & (vencimiento == hoy64)
+        if m.any():
+            previo = tarea_hoy[m]
+            etiqueta = f"Control {intervalo} días"
+            tarea_hoy[m] = np.where(previo == "", etiqueta, previo + ", " + etiqueta)
+
+        m = pendiente & (vencimiento >= ini64) & (vencimiento <= fin64)
+        if m.any():
+            previo = tarea_semana[m]
+            etiqueta = f"Control {intervalo} días (" + _ddmm(vencimiento[m]) + ")"
+            tarea_semana[m] = np.where(previo == "", etiqueta, previo + ", " + etiqueta)
+
+        # En atrasados sólo se informa el último intervalo vencido
+        m = pendiente & (vencimiento <= hoy64)
+        if m.any():
+            tarea_atrasados[m] = f"Falta {intervalo} días (Venció: " + _ddmm(vencimiento[m]) + ")"
+
+    resultado = []
+    for tareas in (tarea_hoy, tarea_semana, tarea_atrasados):
+        m = tareas != ""
+        resultado.append(df[m].assign(TAREA=tareas[m]))
+    return tuple(resultado)
@@ -0,0 +1,115 @@
+"""Resultados derivados compartidos entre sesiones.
+
+Una entrada depende sólo de la versión de la instantánea, la página y los
+valores de los filtros, así que veinte sesiones con los mismos filtros la
+calculan una sola vez. Al aparecer una versión nueva se descarta todo lo
+anterior; dentro de una versión se desaloja por LRU, por cantidad y por bytes.
+"""
+import collections
+import concurrent.futures
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from tablero.metricas import tramo
+from tablero.vista import Vista
+
+
+def tamano(valor):
+    """Bytes aproximados de un resultado (frames, arreglos, vistas y tuplas de ellos)."""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=False, deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=False, deep=True))
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, Vista):
+        return 0 if valor.es_completa() else valor.posiciones().nbytes
+    if isinstance(valor, (tuple, list)):
+        return sys.getsizeof(valor) + sum(tamano(v) for v in valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamano(v) for v in valor.values())
+    return sys.getsizeof(valor)
+
+
+class MemoCompartido:
+    def __init__(self, max_entradas=256, max_bytes=256 * 2**20):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.version = None
+        self.bytes = 0
+        self.aciertos = collections.Counter()
+        self.fallos = collections.Counter()
+        self.esperas = collections.Counter()
+        self.desalojos = 0
+        self._entradas = collections.OrderedDict()  # (página, filtros) -> (valor, bytes)
+        self._en_curso = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, version, pagina, filtros, calcular):
+        """Valor de `calcular()` para (version, pagina, filtros); `filtros` debe ser hasheable."""
+        clave = (pagina, filtros)
+        with self._lock:
+            if self.version is None or version > self.version:
+                self._vaciar()
+                self.version = version
+            if version == self.version and clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos[pagina] += 1
+                return self._entradas[clave][0]
+            if version != self.version:
+                # Sesión que todavía muestra una instantánea vieja: se calcula sin guardar
+                propio, futuro = True, None
+            else:
+                futuro = self._en_curso.get((version, clave))
+                propio = futuro is None
+                if propio:
+                    futuro = self._en_curso[(version, clave)] = concurrent.futures.Future()
+            if propio: self.fallos[pagina] += 1
+            else: self.esperas[pagina] += 1
+
+        if not propio:
+            # Otra sesión ya lo está calculando: se espera su resultado
+            return futuro.result()
+        try:
+            with tramo(f"memo.{pagina}"):
+                valor = calcular()
+        except BaseException as e:
+            if futuro is not None:
+                with self._lock: self._en_curso.pop((version, clave), None)
+                futuro.set_exception(e)
+            raise
+        if futuro is not None:
+            with self._lock:
+                self._en_curso.pop((version, clave), None)
+                if version == self.version: self._guardar(clave, valor)
+            futuro.set_result(valor)
+        return valor
+
+    def _guardar(self, clave, valor):
+        bytes_valor = tamano(valor)
+        if bytes_valor > self.max_bytes: return
+        self._entradas[clave] = (valor, bytes_valor)
+        self.bytes += bytes_valor
+        while len(self._entradas) > self.max_entradas or self.bytes > self.max_bytes:
+            _, (_, liberados) = self._entradas.popitem(last=False)
+            self.bytes -= liberados
+            self.desalojos += 1
+
+    def _vaciar(self):
+        self._entradas.clear()
+        self.bytes = 0
+
+    def estadisticas(self):
+        """Aciertos, fallos (cálculos) y esperas a un cálculo en curso, por página, más el estado de la caché."""
+        with self._lock:
+            paginas = sorted(set(self.aciertos) | set(self.fallos) | set(self.esperas))
+            return {
+                "version": self.version,
+                "entradas": len(self._entradas),
+                "bytes": self.bytes,
+                "desalojos": self.desalojos,
+                "paginas": {p: {"aciertos": self.aciertos[p], "esperas": self.esperas[p], "fallos": self.fallos[p]} for p in paginas},
+            }
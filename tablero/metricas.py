@@ -0,0 +1,151 @@
+"""Tramos de tiempo con nombre para las etapas calientes (descarga, parseo, índices, páginas, tablas).
+
+Cada tramo se suma al registro del proceso (compartido por todas las sesiones y
+por el hilo de refresco) y, si hay una ejecución del script en curso en el hilo,
+también a esa ejecución. Con `ruta_jsonl` cada ejecución y cada refresco quedan
+como una línea JSON para comparar después de que crezca la planilla.
+"""
+import collections
+import contextlib
+import contextvars
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+_EJECUCION = contextvars.ContextVar("ejecucion", default=None)
+# tracemalloc es de todo el proceso: lo comparten las ejecuciones con memoria=True en curso
+_LOCK_MEMORIA = threading.Lock()
+_midiendo = 0
+_tracemalloc_propio = False
+
+
+def _empezar_memoria():
+    """Suma una ejecución que mide memoria; True si es la única (entonces el pico es sólo suyo)."""
+    global _midiendo, _tracemalloc_propio
+    with _LOCK_MEMORIA:
+        _midiendo += 1
+        if _midiendo > 1: return False
+        _tracemalloc_propio = not tracemalloc.is_tracing()
+        if _tracemalloc_propio: tracemalloc.start()
+        tracemalloc.reset_peak()
+        return True
+
+
+def _terminar_memoria():
+    global _midiendo
+    with _LOCK_MEMORIA:
+        _midiendo -= 1
+        # Se apaga cuando termina la última, y sólo si lo prendimos nosotros
+        if _midiendo == 0 and _tracemalloc_propio: tracemalloc.stop()
+
+
+def _resumen_memoria(pico_propio):
+    actual, pico = tracemalloc.get_traced_memory()
+    top = tracemalloc.take_snapshot().statistics("lineno")[:15]
+    detalle = "" if pico_propio else " (compartido con otra ejecución en curso)"
+    return f"actual {actual / 2**20:.1f} MiB, pico {pico / 2**20:.1f} MiB{detalle}\n" + "\n".join(str(s) for s in top)
+
+
+class Ejecucion:
+    """Tramos de una ejecución del script (o de un ciclo de refresco)."""
+
+    def __init__(self, nombre, **datos):
+        self.nombre = nombre
+        self.datos = datos
+        self.tramos = collections.defaultdict(float)
+        self.inicio = time.perf_counter()
+        self.duracion = None
+        self.perfil = None
+        self.memoria = None
+
+    def registro(self):
+        return dict(self.datos, momento=time.time(), ejecucion=self.nombre, total_ms=round((self.duracion or 0) * 1000, 3),
+                    tramos_ms={k: round(v * 1000, 3) for k, v in self.tramos.items()})
+
+
+class Metricas:
+    def __init__(self, max_muestras=1000, ruta_jsonl=None):
+        self.ruta_jsonl = ruta_jsonl
+        self._muestras = collections.defaultdict(lambda: collections.deque(maxlen=max_muestras))
+        self._lock = threading.Lock()
+
+    def registrar(self, nombre, segundos):
+        with self._lock:
+            self._muestras[nombre].append(segundos)
+        ejecucion = _EJECUCION.get()
+        if ejecucion is not None: ejecucion.tramos[nombre] += segundos
+
+    @contextlib.contextmanager
+    def tramo(self, nombre):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, time.perf_counter() - t0)
+
+    @contextlib.contextmanager
+    def ejecucion(self, nombre, perfilar=False, memoria=False, **datos):
+        """Agrupa los tramos del bloque; opcionalmente con cProfile y/o tracemalloc (texto en .perfil/.memoria)."""
+        ej = Ejecucion(nombre, **datos)
+        token = _EJECUCION.set(ej)
+        perfil = cProfile.Profile() if perfilar else None
+        pico_propio = _empezar_memoria() if memoria else False
+        if perfil:
+            try:
+                perfil.enable()
+            except ValueError:
+                # Otra sesión ya está perfilando (sólo puede haber un perfilador activo)
+                perfil = None
+        try:
+            yield ej
+        finally:
+            if perfil: perfil.disable()
+            try:
+                if memoria: ej.memoria = _resumen_memoria(pico_propio)
+                if perfil:
+                    salida = io.StringIO()
+                    pstats.Stats(perfil, stream=salida).sort_stats("cumulative").print_stats(25)
+                    ej.perfil = salida.getvalue()
+            except Exception as e:
+                # El diagnóstico nunca tumba la página ni evita que se registre la ejecución
+                ej.memoria = ej.memoria or f"memoria no disponible: {e}"
+            finally:
+                if memoria: _terminar_memoria()
+                _EJECUCION.reset(token)
+                ej.duracion = time.perf_counter() - ej.inicio
+                self.registrar(ej.nombre, ej.duracion)
+                self._escribir(ej)
+
+    def _escribir(self, ej):
+        if not self.ruta_jsonl: return
+        linea = json.dumps(ej.registro(), ensure_ascii=False, default=str)
+        with self._lock, open(self.ruta_jsonl, "a", encoding="utf-8") as f:
+            f.write(linea + "\n")
+
+    def resumen(self):
+        """{tramo: {n, p50_ms, p95_ms, max_ms}} sobre las últimas muestras de cada tramo."""
+        with self._lock:
+            muestras = {k: np.array(v) for k, v in self._muestras.items()}
+        return {
+            k: {"n": len(v), "p50_ms": float(np.percentile(v, 50) * 1000), "p95_ms": float(np.percentile(v, 95) * 1000), "max_ms": float(v.max() * 1000)}
+            for k, v in sorted(muestras.items()) if len(v)
+        }
+
+    def exportar_jsonl(self):
+        """El resumen actual como líneas JSON (una por tramo)."""
+        momento = time.time()
+        return "".join(json.dumps(dict(tramo=k, momento=momento, **v), ensure_ascii=False) + "\n" for k, v in self.resumen().items())
+
+
+# Registro del proceso: lo comparten las sesiones, el refresco y la ingesta
+REGISTRO = Metricas()
+
+
+def tramo(nombre):
+    return REGISTRO.tramo(nombre)
@@ -0,0 +1,198 @@
+"""Un solo proceso cargador publica instantáneas versionadas para varios procesos de la app.
+
+El cargador (`python -m tablero.publicacion`) es el único que descarga las
+planillas y escribe el historial. Cada instantánea nueva se guarda como
+`instantanea-<versión>.feather` (el mismo Arrow IPC sin compresión que la caché
+en disco, con las huellas por fila) y recién después se reemplaza de forma
+atómica el puntero `ACTUAL.json`. Los procesos de la app usan `FuentePublicada`
+como fuente de su Refrescador: miran el puntero cada pocos segundos y, cuando
+cambia, mapean el archivo nuevo en memoria; esas páginas son caché del sistema
+operativo y las comparten todos los procesos en lugar de tener una copia cada uno.
+Aparte, el cargador deja en `ESTADO.json` cuándo refrescó bien por última vez y
+los errores de cada sucursal, para que la barra lateral de cada proceso los muestre.
+
+Uso: python -m tablero.publicacion --dir /srv/tablero/publicado [--intervalo 60]
+y en cada proceso de la app TABLERO_PUBLICACION=/srv/tablero/publicado (con el
+mismo TABLERO_DIR_CACHE que el cargador, para leer su historial).
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+from tablero.cache_disco import CacheDisco
+from tablero.federacion import Federacion, fuentes_de_entorno
+from tablero.historial import HistorialEstados
+from tablero.metricas import tramo
+from tablero.refresco import Refrescador
+
+PUNTERO = "ACTUAL.json"
+ESTADO = "ESTADO.json"
+# Cada cuánto escribe el cargador su estado, y a partir de cuándo se lo da por caído
+INFORMAR_CADA = 5
+SIN_NOTICIAS = 30
+# Versiones que quedan en disco: un proceso que todavía no cambió sigue leyendo la suya
+CONSERVAR = 3
+# Va como `origen` de CacheDisco: un archivo de caché común no se confunde con uno publicado
+ORIGEN = "publicacion"
+
+log = logging.getLogger(__name__)
+
+
+def _archivo(version):
+    return f"instantanea-{version:08d}.feather"
+
+
+def _leer(directorio, nombre):
+    try:
+        with open(os.path.join(directorio, nombre), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _escribir(directorio, nombre, datos):
+    # Se reemplaza de una vez: nadie lee un JSON a medio escribir
+    temporal = os.path.join(directorio, f"{nombre}.{os.getpid()}.tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False)
+    os.replace(temporal, os.path.join(directorio, nombre))
+
+
+def leer_puntero(directorio):
+    """{"version", "archivo", "creada"} de la última publicación, o None si todavía no hay."""
+    return _leer(directorio, PUNTERO)
+
+
+def leer_estado(directorio):
+    """{"verificado", "error", "errores", "escrito"} que dejó el cargador, o None."""
+    return _leer(directorio, ESTADO)
+
+
+class Publicador:
+    def __init__(self, directorio, conservar=CONSERVAR):
+        self.directorio = directorio
+        self.conservar = conservar
+        # Las versiones siguen creciendo aunque el cargador se reinicie
+        self.version = (leer_puntero(directorio) or {}).get("version", 0)
+
+    def publicar(self, df, huellas=None, creada=None):
+        """Escribe la instantánea y la deja como actual; devuelve su versión."""
+        version = self.version + 1
+        archivo = _archivo(version)
+        with tramo("publicacion.escribir"):
+            CacheDisco(os.path.join(self.directorio, archivo), ORIGEN).guardar(df, {"hashes": huellas, "guardado": creada, "version": version})
+        # El puntero se escribe después del archivo: nadie ve una versión a medias
+        _escribir(self.directorio, PUNTERO, {"version": version, "archivo": archivo, "creada": creada})
+        self.version = version
+        self._limpiar()
+        return version
+
+    def publicar_instantanea(self, instantanea):
+        """Para `Refrescador(al_publicar=...)`."""
+        return self.publicar(instantanea.df, instantanea.huellas, instantanea.creada)
+
+    def informar(self, verificado, error=None, errores=None):
+        """Cuándo refrescó bien el cargador por última vez y qué falló (en general y por sucursal)."""
+        _escribir(self.directorio, ESTADO, {"verificado": verificado, "error": error,
+                                            "errores": dict(errores or {}), "escrito": time.time()})
+
+    def _limpiar(self):
+        # En Linux un archivo borrado sigue mapeado para quien ya lo abrió
+        for nombre in os.listdir(self.directorio):
+            m = re.fullmatch(r"instantanea-(\d+)\.feather", nombre)
+            if m and int(m.group(1)) <= self.version - self.conservar:
+                try:
+                    os.remove(os.path.join(self.directorio, nombre))
+                except OSError:
+                    log.warning("No se pudo borrar %s", nombre, exc_info=True)
+
+
+class FuentePublicada:
+    """Fuente para el Refrescador de cada proceso de la app: la última versión publicada, mapeada en memoria."""
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        self.errores = {}  # como Federacion: la barra lateral los muestra (incluye los del cargador)
+        self.version = None
+        self.creada = None
+        # Último refresco bueno del cargador: la antigüedad de los datos sale de acá y no de cada consulta al puntero
+        self.verificado = None
+        self.df = None
+        self._huellas = None
+
+    def actualizar(self):
+        puntero = leer_puntero(self.directorio)
+        if puntero is None:
+            raise RuntimeError(f"Todavía no hay instantáneas publicadas en {self.directorio}")
+        self._leer_estado(puntero)
+        if puntero["version"] == self.version:
+            return self.df
+        # Si justo se borró (quedó vieja entre leer el puntero y abrirla) falla este ciclo y el próximo toma la nueva
+        with tramo("publicacion.mapear"):
+            guardado = CacheDisco(os.path.join(self.directorio, puntero["archivo"]), ORIGEN).cargar()
+        if guardado is None:
+            raise RuntimeError(f"La versión publicada {puntero['version']} no es compatible con este proceso")
+        self.df, estado = guardado
+        self._huellas = estado.get("hashes")
+        self.version, self.creada = puntero["version"], puntero.get("creada")
+        return self.df
+
+    def huellas(self):
+        return self._huellas
+
+    def _leer_estado(self, puntero):
+        estado = leer_estado(self.directorio) or {}
+        self.verificado = estado.get("verificado") or puntero.get("creada")
+        errores = dict(estado.get("errores") or {})
+        if estado.get("error"):
+            errores["Cargador"] = f"último refresco falló: {estado['error']}"
+        if estado and time.time() - estado["escrito"] > SIN_NOTICIAS:
+            errores["Cargador"] = f"sin noticias del cargador desde hace {int(time.time() - estado['escrito'])} s"
+        # Se reemplaza entero: la barra lateral lo recorre desde otro hilo
+        self.errores = errores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tablero.publicacion", description="Cargador único: refresca las planillas y publica cada instantánea.")
+    parser.add_argument("--dir", default=os.environ.get("TABLERO_PUBLICACION"), help="carpeta compartida con los procesos de la app")
+    parser.add_argument("--intervalo", type=float, default=60)
+    parser.add_argument("--dir-cache", default=os.environ.get("TABLERO_DIR_CACHE", ".cache"))
+    args = parser.parse_args(argv)
+    if not args.dir:
+        parser.error("falta --dir (o TABLERO_PUBLICACION)")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    os.makedirs(args.dir, exist_ok=True)
+
+    historial = HistorialEstados(os.path.join(args.dir_cache, "historial"))
+    publicador = Publicador(args.dir)
+
+    def al_publicar(instantanea):
+        # Primero el historial: cuando los procesos vean la versión nueva, sus cambios ya están en disco
+        historial.registrar_instantanea(instantanea)
+        version = publicador.publicar_instantanea(instantanea)
+        log.info("Publicada la versión %s (%s filas)", version, len(instantanea.df))
+
+    fuente = Federacion.desde_urls(fuentes_de_entorno(), args.dir_cache)
+    refrescador = Refrescador(fuente, intervalo=args.intervalo, al_publicar=al_publicar).iniciar()
+    anterior = None
+    try:
+        while True:
+            errores = dict(fuente.errores)
+            publicador.informar(refrescador.ultima_verificacion, refrescador.ultimo_error, errores)
+            if (refrescador.ultimo_error, errores) != anterior:
+                if refrescador.ultimo_error:
+                    log.warning("Último refresco falló: %s", refrescador.ultimo_error)
+                for sucursal, error in errores.items():
+                    log.warning("%s: %s", sucursal, error)
+                anterior = (refrescador.ultimo_error, errores)
+            time.sleep(INFORMAR_CADA)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
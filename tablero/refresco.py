@@ -0,0 +1,115 @@
+"""Refresco en segundo plano: las páginas leen siempre la última instantánea buena."""
+import logging
+import threading
+import time
+
+from tablero.metricas import REGISTRO
+
+log = logging.getLogger(__name__)
+
+
+class Instantanea:
+    """`huellas`: hash por fila si la fuente lo ofrece (ver tablero.cubos), si no None."""
+    __slots__ = ("df", "version", "creada", "huellas")
+
+    def __init__(self, df, version, creada, huellas=None):
+        self.df = df
+        self.version = version
+        self.creada = creada
+        self.huellas = huellas
+
+
+class Refrescador:
+    """Hilo que llama a `fuente.actualizar()` cada `intervalo` segundos.
+
+    La instantánea vigente se reemplaza con una sola asignación de referencia,
+    así que los lectores nunca ven un frame a medio construir ni esperan la red.
+    Si la fuente ofrece `cargar_cache()` (ver tablero.cache_disco.FuentePersistente)
+    arranca desde la última instantánea en disco y la reconcilia en el primer ciclo.
+    `al_publicar(instantanea)` se llama en este mismo hilo con cada instantánea
+    nueva (p. ej. tablero.historial.HistorialEstados.registrar_instantanea).
+    """
+
+    def __init__(self, fuente, intervalo=60, al_publicar=None):
+        self.fuente = fuente
+        self.intervalo = intervalo
+        self.al_publicar = al_publicar
+        self.ultima_verificacion = None
+        self.ultimo_error = None
+        self.momento_error = None
+        self._actual = None
+        self._primera_carga = threading.Event()
+        self._despertar = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        if self._hilo is None:
+            self._cargar_cache()
+            self._hilo = threading.Thread(target=self._bucle, name="refresco-planilla", daemon=True)
+            self._hilo.start()
+        return self
+
+    def _cargar_cache(self):
+        if not hasattr(self.fuente, "cargar_cache"): return
+        try:
+            guardado = self.fuente.cargar_cache()
+        except Exception:
+            log.warning("Caché en disco ilegible, se ignora", exc_info=True)
+            return
+        if guardado is None: return
+        df, self.ultima_verificacion = guardado
+        self._publicar(Instantanea(df, 1, self.ultima_verificacion, self._huellas()))
+        self._primera_carga.set()
+
+    def _bucle(self):
+        while True:
+            self.refrescar()
+            self._despertar.wait(self.intervalo)
+            self._despertar.clear()
+
+    def pedir_refresco(self):
+        self._despertar.set()
+
+    def refrescar(self):
+        try:
+            with REGISTRO.ejecucion("refresco"):
+                df = self.fuente.actualizar()
+        except Exception as e:
+            self.ultimo_error = str(e)
+            self.momento_error = time.time()
+        else:
+            self.ultimo_error = None
+            self.ultima_verificacion = time.time()
+            actual = self._actual
+            if df is not None and (actual is None or df is not actual.df):
+                # Una fuente publicada ya trae cuándo se creó la instantánea en el cargador
+                creada = getattr(self.fuente, "creada", None) or self.ultima_verificacion
+                self._publicar(Instantanea(df, (actual.version + 1) if actual else 1, creada, self._huellas()))
+        finally:
+            self._primera_carga.set()
+
+    def _publicar(self, instantanea):
+        self._actual = instantanea
+        if self.al_publicar is None: return
+        try:
+            self.al_publicar(instantanea)
+        except Exception:
+            # Un observador roto no frena el refresco: la instantánea ya está publicada
+            log.warning("Falló al_publicar para la versión %s", instantanea.version, exc_info=True)
+
+    def _huellas(self):
+        # Se piden en el mismo hilo y justo después de actualizar(): quedan alineadas con el frame
+        return self.fuente.huellas() if hasattr(self.fuente, "huellas") else None
+
+    def instantanea(self, espera=None):
+        """Última instantánea buena; sólo la primera vez espera (hasta `espera` s) a que exista."""
+        if self._actual is None:
+            self._primera_carga.wait(espera)
+        return self._actual
+
+    def antiguedad(self):
+        # Si la fuente la refresca otro proceso (tablero.publicacion.FuentePublicada) cuenta su
+        # último refresco bueno, no la última vez que este proceso la consultó
+        momento = self.fuente.verificado if hasattr(self.fuente, "verificado") else self.ultima_verificacion
+        if momento is None: return None
+        return time.time() - momento
@@ -0,0 +1,178 @@
+"""Turnos de entrega: ocupación de bahías y vendedores en una grilla de franjas fijas.
+
+La jornada se parte en franjas de FRANJA minutos entre APERTURA y CIERRE (de
+lunes a sábado) y cada entrega ocupa `duracion` minutos desde su hora. Por
+recurso se guarda el arreglo ordenado de franjas sin lugar (las bahías se llenan
+con `bahias` entregas, un vendedor con una), así que "¿está libre?" es un
+searchsorted y "los próximos N libres" salta de hueco en hueco sin recorrer el frame.
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from tablero.agenda import COL_FECHA, COL_HORA, minutos_del_dia
+
+COL_VENDEDOR = "VENDEDOR"
+APERTURA = 9 * 60
+CIERRE = 18 * 60
+FRANJA = 30
+POR_DIA = (CIERRE - APERTURA) // FRANJA
+DIAS_HABILES = 6  # lunes a sábado
+# Hasta dónde busca proximos_libres antes de rendirse
+HORIZONTE_DIAS = 366
+
+
+def _dia_semana(dia):
+    # Días desde 1970-01-01 (jueves) -> 0 = lunes
+    return (dia + 3) % 7
+
+
+class Turnos:
+    def __init__(self, df, bahias=2, duracion=60):
+        self.bahias = bahias
+        self.pasos = max(1, -(-duracion // FRANJA))
+        n = len(df)
+        dias = (df[COL_FECHA].to_numpy(dtype="datetime64[D]").astype(np.int64) if COL_FECHA in df.columns
+                else np.zeros(n, dtype=np.int64))
+        con_fecha = (df[COL_FECHA].notna().to_numpy() if COL_FECHA in df.columns else np.zeros(n, dtype=bool))
+        minutos = minutos_del_dia(df[COL_HORA]) if COL_HORA in df.columns else np.full(n, np.nan)
+
+        con_hora = con_fecha & ~np.isnan(minutos)
+        en_grilla = con_hora & (minutos >= APERTURA) & (minutos < CIERRE) & (_dia_semana(dias) < DIAS_HABILES)
+        self.sin_horario = int((con_fecha & ~con_hora).sum())
+        self.fuera_de_grilla = int((con_hora & ~en_grilla).sum())
+
+        # Cada entrega ocupa `pasos` franjas seguidas, sin pasar del cierre
+        filas = np.flatnonzero(en_grilla)
+        inicio = dias[filas] * POR_DIA + (minutos[filas].astype(np.int64) - APERTURA) // FRANJA
+        desplazamiento = np.arange(self.pasos)
+        ocupadas = inicio[:, None] + desplazamiento
+        dentro = (inicio % POR_DIA)[:, None] + desplazamiento < POR_DIA
+        ocupadas = ocupadas[dentro]
+        self.reservas = len(filas)
+
+        # Bahías: cantidad por franja; las que llegan a `bahias` no admiten otra entrega
+        self._franjas, self._cantidades = np.unique(ocupadas, return_counts=True)
+        self._llenas = self._franjas[self._cantidades >= bahias]
+
+        # Vendedores: franjas ordenadas por (vendedor, franja); un tramo contiguo por vendedor
+        if COL_VENDEDOR in df.columns:
+            codigos, nombres = pd.factorize(df[COL_VENDEDOR].iloc[filas])
+        else:
+            codigos, nombres = np.full(len(filas), -1), []
+        codigos = np.broadcast_to(codigos[:, None], dentro.shape)[dentro]
+        validos = codigos >= 0
+        codigos, por_vendedor = codigos[validos], ocupadas[validos]
+        orden = np.lexsort((por_vendedor, codigos))
+        self._codigos_vendedor, self._franjas_vendedor = codigos[orden], por_vendedor[orden]
+        self.vendedores = [str(v) for v in nombres]
+        self._indice_vendedor = {v: i for i, v in enumerate(self.vendedores)}
+        self._limites_vendedor = np.searchsorted(self._codigos_vendedor, np.arange(len(self.vendedores) + 1))
+        self.conflictos = self._conflictos()
+
+    # --- conversión franja <-> fecha y hora ---
+
+    @staticmethod
+    def momento(franja):
+        dia, resto = divmod(int(franja), POR_DIA)
+        return datetime.datetime(1970, 1, 1) + datetime.timedelta(days=dia, minutes=APERTURA + resto * FRANJA)
+
+    @staticmethod
+    def franja(momento):
+        """Franja que contiene `momento`, o None si cae fuera del horario de entregas."""
+        momento = pd.Timestamp(momento)
+        dia = (momento.normalize() - pd.Timestamp("1970-01-01")).days
+        minuto = momento.hour * 60 + momento.minute
+        if not APERTURA <= minuto < CIERRE or _dia_semana(dia) >= DIAS_HABILES: return None
+        return dia * POR_DIA + (minuto - APERTURA) // FRANJA
+
+    def _entra(self, franja):
+        return franja % POR_DIA + self.pasos <= POR_DIA and _dia_semana(franja // POR_DIA) < DIAS_HABILES
+
+    # --- consultas ---
+
+    def _ocupadas(self, vendedor):
+        """Arreglos ordenados de franjas sin lugar que aplican a una entrega de `vendedor`."""
+        arreglos = [self._llenas]
+        i = self._indice_vendedor.get(vendedor) if vendedor is not None else None
+        if i is not None:
+            arreglos.append(self._franjas_vendedor[self._limites_vendedor[i]:self._limites_vendedor[i + 1]])
+        return arreglos
+
+    def _bloqueo(self, arreglos, franja):
+        """Última franja ocupada dentro de [franja, franja + pasos), o None si todo está libre."""
+        bloqueo = None
+        for arr in arreglos:
+            j = np.searchsorted(arr, franja + self.pasos) - 1
+            if j >= 0 and arr[j] >= franja:
+                bloqueo = int(arr[j]) if bloqueo is None else max(bloqueo, int(arr[j]))
+        return bloqueo
+
+    def ocupacion(self, momento):
+        """Entregas que ya ocupan la franja de `momento` (en bahías)."""
+        franja = self.franja(momento)
+        if franja is None: return 0
+        i = np.searchsorted(self._franjas, franja)
+        return int(self._cantidades[i]) if i < len(self._franjas) and self._franjas[i] == franja else 0
+
+    def libre(self, momento, vendedor=None):
+        """¿Entra una entrega de `duracion` a partir de `momento` (con ese vendedor, si se indica)?"""
+        franja = self.franja(momento)
+        return franja is not None and self._entra(franja) and self._bloqueo(self._ocupadas(vendedor), franja) is None
+
+    def proximos_libres(self, desde, n=5, vendedor=None):
+        """Los `n` primeros comienzos libres a partir de `desde` (datetimes)."""
+        momento = pd.Timestamp(desde)
+        dia = (momento.normalize() - pd.Timestamp("1970-01-01")).days
+        minuto = momento.hour * 60 + momento.minute
+        # Primera franja que empieza en o después de `desde`
+        franja = dia * POR_DIA + max(0, -(-(minuto - APERTURA) // FRANJA))
+        if minuto >= CIERRE: franja = (dia + 1) * POR_DIA
+        limite = (dia + HORIZONTE_DIAS) * POR_DIA
+        arreglos = self._ocupadas(vendedor)
+        libres = []
+        while len(libres) < n and franja < limite:
+            if not self._entra(franja):
+                franja = (franja // POR_DIA + 1) * POR_DIA
+                continue
+            bloqueo = self._bloqueo(arreglos, franja)
+            if bloqueo is None:
+                libres.append(self.momento(franja))
+                franja += 1
+            else:
+                franja = bloqueo + 1
+        return libres
+
+    def _conflictos(self):
+        """Franjas con más entregas que bahías y vendedores con dos entregas a la vez."""
+        partes = []
+        excedidas = self._cantidades > self.bahias
+        if excedidas.any():
+            partes.append(pd.DataFrame({
+                "FRANJA": self._franjas[excedidas], "RECURSO": "Bahías de entrega",
+                "RESERVAS": self._cantidades[excedidas], "CAPACIDAD": self.bahias,
+            }))
+        if len(self._franjas_vendedor):
+            # En el orden (vendedor, franja) los repetidos quedan contiguos
+            clave = self._codigos_vendedor.astype(np.int64) * (1 << 40) + self._franjas_vendedor
+            cortes = np.flatnonzero(np.r_[True, clave[1:] != clave[:-1], True])
+            cantidades = np.diff(cortes)
+            dobles = cortes[:-1][cantidades > 1]
+            if len(dobles):
+                partes.append(pd.DataFrame({
+                    "FRANJA": self._franjas_vendedor[dobles],
+                    "RECURSO": [self.vendedores[c] for c in self._codigos_vendedor[dobles]],
+                    "RESERVAS": cantidades[cantidades > 1], "CAPACIDAD": 1,
+                }))
+        if not partes:
+            return pd.DataFrame(columns=["FECHA", "HORA", "RECURSO", "RESERVAS", "CAPACIDAD"])
+        conflictos = pd.concat(partes, ignore_index=True).sort_values(["FRANJA", "RECURSO"], kind="stable")
+        dias, resto = np.divmod(conflictos["FRANJA"].to_numpy(), POR_DIA)
+        conflictos.insert(0, "FECHA", dias.astype("datetime64[D]"))
+        minutos = APERTURA + resto * FRANJA
+        conflictos.insert(1, "HORA", [f"{m // 60:02d}:{m % 60:02d}" for m in minutos])
+        return conflictos.drop(columns="FRANJA").reset_index(drop=True)
+
+    def conflictos_desde(self, fecha):
+        return self.conflictos[self.conflictos["FECHA"] >= pd.Timestamp(fecha)]
@@ -0,0 +1,74 @@
+"""Vistas por posición sobre el frame compartido de la instantánea.
+
+Las páginas encadenan filtros sobre una `Vista` (un arreglo de posiciones de
+fila) en lugar de crear un DataFrame completo por cada paso; sólo se copian
+datos al materializar las columnas que efectivamente se muestran. Las tablas
+grandes se ordenan por posición (leyendo sólo las columnas clave) y se
+materializa únicamente la página visible.
+"""
+import numpy as np
+
+
+class Vista:
+    __slots__ = ("df", "_filas")
+
+    def __init__(self, df, filas=None):
+        self.df = df
+        self._filas = filas
+
+    def __len__(self):
+        return len(self.df) if self._filas is None else len(self._filas)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def columns(self):
+        return self.df.columns
+
+    def posiciones(self):
+        return np.arange(len(self.df)) if self._filas is None else self._filas
+
+    def es_completa(self):
+        return self._filas is None
+
+    def columna(self, col):
+        """La columna restringida a las filas de la vista (sólo se copia esa columna)."""
+        serie = self.df[col]
+        return serie if self._filas is None else serie.iloc[self._filas]
+
+    def filtrar(self, mascara):
+        """Nueva vista con las filas de esta vista donde `mascara` (alineada con la vista) es verdadera."""
+        mascara = np.asarray(mascara, dtype=bool)
+        return Vista(self.df, self.posiciones()[mascara])
+
+    def filtrar_global(self, mascara):
+        """Como `filtrar`, pero con una máscara sobre todas las filas del frame compartido."""
+        mascara = np.asarray(mascara, dtype=bool)
+        if self._filas is None:
+            return Vista(self.df, np.flatnonzero(mascara))
+        return Vista(self.df, self._filas[mascara[self._filas]])
+
+    def materializar(self, columnas=None):
+        """DataFrame con las columnas pedidas (las que existan) y sólo las filas de la vista."""
+        if columnas is not None:
+            columnas = [c for c in columnas if c in self.df.columns]
+        sub = self.df if columnas is None else self.df[columnas]
+        return sub if self._filas is None else sub.iloc[self._filas]
+
+    def ordenar(self, por):
+        """Vista con las mismas filas ordenadas por `por` (orden estable, vacíos al final como sort_values)."""
+        por = [c for c in por if c in self.df.columns]
+        if not por or len(self) < 2: return self
+        claves = self.materializar(por).reset_index(drop=True)
+        orden = claves.sort_values(por, kind="stable").index.to_numpy()
+        return Vista(self.df, self.posiciones()[orden])
+
+    def paginas(self, tam):
+        return max(1, -(-len(self) // tam))
+
+    def pagina(self, numero, tam):
+        """Vista con las filas de la página `numero` (desde 1) de tamaño `tam`."""
+        inicio = (numero - 1) * tam
+        return Vista(self.df, self.posiciones()[inicio:inicio + tam])